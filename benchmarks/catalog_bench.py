@@ -0,0 +1,196 @@
+"""
+Benchmark the console's catalog data paths against StubTabsdataServer.
+
+    python benchmarks/catalog_bench.py --collections 5000 --latency-ms 2
+    python benchmarks/catalog_bench.py --collections 5000 --json bench.json
+
+Run from the repo root with tdconsole installed (`pip install -e .`).
+
+Each benchmark reports throughput (ops/s) and per-op latency percentiles, and
+the JSON output also carries the per-method API metrics recorded by the
+InstrumentedServer wrapper.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tdconsole.core import tabsdata_api
+from tdconsole.core.api_metrics import ApiMetrics, InstrumentedServer
+from tdconsole.core.catalog_cache import CatalogCache
+from tdconsole.core.input_validators import ValidCollectionName
+from tdconsole.core.models import Base, Instance
+from tdconsole.core.stub_server import StubTabsdataServer
+
+
+def summarize(name: str, timings: list[float]) -> dict:
+    ordered = sorted(timings)
+    total = sum(ordered)
+    return {
+        "benchmark": name,
+        "runs": len(ordered),
+        "total_s": round(total, 4),
+        "ops_per_s": round(len(ordered) / total, 2) if total else None,
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def timeit(func, repeat: int) -> list[float]:
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def make_app(server, metrics: ApiMetrics) -> SimpleNamespace:
+    """Minimal stand-in for NestedMenuApp: an in-memory DB, a server and its cache."""
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, future=True)()
+    instance = Instance(name="bench", status="Running", working=True)
+    session.add(instance)
+    session.commit()
+    tabsdata_server = InstrumentedServer(server, metrics)
+    return SimpleNamespace(
+        session=session,
+        tabsdata_server=tabsdata_server,
+        # As app_start does, so validators use the cached name set.
+        catalog_cache=CatalogCache(tabsdata_server),
+        working_instance=instance,
+    )
+
+
+def bench_sync_instance_to_db(app, repeat: int) -> dict:
+    timings = timeit(lambda _: tabsdata_api.sync_instance_to_db(app), repeat)
+    return summarize("sync_instance_to_db", timings)
+
+
+def bench_collection_validator(app, repeat: int) -> dict:
+    validator = ValidCollectionName(app, app.tabsdata_server)
+    names = [c.name for c in app.tabsdata_server.list_collections()]
+
+    def validate(i):
+        # Alternate between taken and free names so both branches are timed.
+        value = names[i % len(names)] if i % 2 == 0 and names else f"free_{i}"
+        validator.validate(value)
+
+    return summarize("ValidCollectionName.validate", timeit(validate, repeat))
+
+
+async def _bench_widgets(server, metrics: ApiMetrics, repeat: int) -> list[dict]:
+    # Imported lazily so the data-path benchmarks run without a terminal.
+    from textual.app import App
+    from textual.containers import Horizontal
+
+    from tdconsole.textual_assets.textual_screens import (
+        CurrentCollectionsWidget,
+        CurrentFunctionsWidget,
+        CurrentTablesWidget,
+    )
+
+    class BenchPanel(Horizontal):
+        selected_collection = None
+
+    class WidgetBenchApp(App):
+        def __init__(self):
+            super().__init__()
+            self.tabsdata_server = InstrumentedServer(server, metrics)
+            self.catalog_cache = CatalogCache(self.tabsdata_server)
+
+        def compose(self):
+            yield BenchPanel(id="panel")
+
+    results = []
+    app = WidgetBenchApp()
+    async with app.run_test(size=(160, 50)) as pilot:
+        panel = app.query_one(BenchPanel)
+        collections = server.list_collections()
+        panel.selected_collection = collections[0] if collections else None
+        for widget_cls in (
+            CurrentCollectionsWidget,
+            CurrentFunctionsWidget,
+            CurrentTablesWidget,
+        ):
+            widget = widget_cls(title=widget_cls.__name__)
+            start = time.perf_counter()
+            await panel.mount(widget)
+            await pilot.pause()
+            timings = [time.perf_counter() - start]
+            for _ in range(repeat - 1):
+                app.catalog_cache.invalidate()
+                start = time.perf_counter()
+                await widget.recompose()
+                await pilot.pause()
+                timings.append(time.perf_counter() - start)
+            results.append(summarize(f"{widget_cls.__name__} compose", timings))
+            await widget.remove()
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--collections", type=int, default=5000)
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-widgets", action="store_true")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+
+    server = StubTabsdataServer(
+        collections=args.collections,
+        functions_per_collection=args.functions,
+        tables_per_collection=args.tables,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=0,
+    )
+    metrics = ApiMetrics()
+    app = make_app(server, metrics)
+
+    results = [
+        bench_sync_instance_to_db(app, args.repeat),
+        bench_collection_validator(app, args.repeat * 20),
+    ]
+    if not args.skip_widgets:
+        results.extend(asyncio.run(_bench_widgets(server, metrics, args.repeat)))
+
+    header = f"{'benchmark':<40}{'runs':>6}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['benchmark']:<40}{r['runs']:>6}{r['ops_per_s'] or 0:>10}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['max_ms']:>10}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(
+                {
+                    "config": vars(args),
+                    "results": results,
+                    "api_metrics": metrics.snapshot(),
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nWrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark task-log rendering against a synthetic high-volume subprocess.
+
+    python benchmarks/log_render_bench.py --lines 200000
+    python benchmarks/log_render_bench.py --lines 200000 --legacy
+
+Run from the repo root with tdconsole installed (`pip install -e .`).
+
+The subprocess prints `--lines` lines of `--width` characters as fast as it
+can. The benchmark runs it through SequentialTasksScreenTemplate's
+run_logged_subprocess inside a headless Textual app and reports wall time,
+lines/s, how many lines were written to the log vs elided, and the worst
+event-loop stall seen by a 10 ms heartbeat. `--legacy` swaps in the old
+readline-and-write-per-line loop for comparison.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from tdconsole.core.task_graph import TaskSpec
+
+
+def producer_args(lines: int, width: int) -> list[str]:
+    code = (
+        "import sys\n"
+        f"line = ('x' * {width}) + '\\n'\n"
+        f"w = sys.stdout.write\n"
+        f"for i in range({lines}):\n"
+        "    w(f'{i:>9} [stage] ' + line)\n"
+    )
+    return [sys.executable, "-c", code]
+
+
+async def legacy_run_logged_subprocess(self, label, *args) -> int:
+    """The pre-coalescing loop: one readline and one RichLog.write per line."""
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    while True:
+        line = await process.stdout.readline()
+        if not line:
+            break
+        self.log_widget.write(f"[{label}]: " + line.decode().rstrip("\n"))
+    return await process.wait()
+
+
+async def run_bench(lines: int, width: int, legacy: bool) -> dict:
+    from textual.app import App
+
+    from tdconsole.textual_assets.textual_screens import (
+        SequentialTasksScreenTemplate,
+    )
+
+    writes = 0
+    stalls = []
+    done = asyncio.Event()
+    result = {}
+
+    class BenchScreen(SequentialTasksScreenTemplate):
+        def __init__(self):
+            super().__init__([TaskSpec("producer", self.produce, name="producer")])
+
+        async def produce(self, label):
+            start = time.perf_counter()
+            if legacy:
+                code = await legacy_run_logged_subprocess(
+                    self, label, *producer_args(lines, width)
+                )
+            else:
+                code = await self.run_logged_subprocess(
+                    label, *producer_args(lines, width)
+                )
+                self.flush_log()
+            result["elapsed"] = time.perf_counter() - start
+            result["code"] = code
+            done.set()
+            return code
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            stalls.append(now - last - 0.01)
+            last = now
+
+    app = App()
+    async with app.run_test(size=(160, 50)):
+        screen = BenchScreen()
+        await app.push_screen(screen)
+        log = screen.query_one("#task-log")
+        original_write = log.write
+
+        def counting_write(*args, **kwargs):
+            nonlocal writes
+            writes += 1
+            return original_write(*args, **kwargs)
+
+        log.write = counting_write
+        beat = asyncio.create_task(heartbeat())
+        await done.wait()
+        await beat
+
+    return {
+        "mode": "legacy" if legacy else "coalesced",
+        "lines": lines,
+        "exit_code": result["code"],
+        "elapsed_s": round(result["elapsed"], 3),
+        "lines_per_s": round(lines / result["elapsed"], 1),
+        "log_writes": writes,
+        "elided": 0 if legacy else screen.log_buffer.total_elided,
+        "max_stall_ms": round(max(stalls, default=0) * 1000, 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--legacy", action="store_true")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_bench(args.lines, args.width, args.legacy))
+    for key, value in result.items():
+        print(f"{key:<14}{value}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"config": vars(args), "result": result}, f, indent=2)
+        print(f"\nWrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
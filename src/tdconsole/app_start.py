@@ -3,18 +3,24 @@ import textual
 from rich.traceback import install
 from sqlalchemy import inspect
 from textual import on
-from textual.app import App
+from textual.app import App, SystemCommand
 from textual.reactive import reactive
 from textual.screen import Screen
 from textual.widgets import Button, ListView
 
 from tdconsole.core import tabsdata_api
+from tdconsole.core.api_metrics import METRICS
+from tdconsole.core.catalog_cache import CatalogCache
+from tdconsole.core.config_index import ConfigIndex
 from tdconsole.core.db import start_session
 from tdconsole.core.find_instances import query_session, resolve_working_instance
 from tdconsole.core.find_instances import (
     sync_filesystem_instances_to_db as sync_filesystem_instances_to_db,
 )
 from tdconsole.core.models import get_model_by_tablename
+from tdconsole.core.run_logs import prune_runs
+from tdconsole.core.task_timing import export_timings
+from tdconsole.core.warm_exec import WARM_EXECUTOR
 from tdconsole.textual_assets.api_processor import process_response
 
 install(
@@ -49,12 +55,43 @@ class NestedMenuApp(App):
         super().__init__(**kwargs)
         self.session = start_session()[0]
         self.session.info["app"] = self
+        self.config_index = ConfigIndex()
         self.working_instance = resolve_working_instance(app=self, session=self.session)
         self.handle_tabsdata_server_connection()
 
     def on_mount(self) -> None:
         # start with a MainMenu instance
         process_response(self, "_mount")
+        # Import td/tdserver in the fork server before the first task needs it.
+        self.run_worker(WARM_EXECUTOR.warm_up, thread=True, group="warm-exec")
+        self.run_worker(self.prune_run_logs, thread=True, group="prune-runs")
+
+    def prune_run_logs(self) -> None:
+        try:
+            prune_runs()
+        except OSError:
+            pass
+
+    def get_system_commands(self, screen: Screen):
+        yield from super().get_system_commands(screen)
+        yield SystemCommand(
+            "Dump API diagnostics",
+            "Write TabsdataServer call latency/error metrics to a JSON file",
+            self.action_dump_api_metrics,
+        )
+        yield SystemCommand(
+            "Export task timings",
+            "Write per-step wall/CPU times of past task runs to a JSON file",
+            self.action_export_task_timings,
+        )
+
+    def action_dump_api_metrics(self) -> None:
+        path = METRICS.dump_json()
+        self.notify(f"API diagnostics written to {path}")
+
+    def action_export_task_timings(self) -> None:
+        path = export_timings(self.session)
+        self.notify(f"Task timings written to {path}")
 
     def action_go_back(self):
         if len(self.screen_stack) > 2:
@@ -92,6 +129,7 @@ class NestedMenuApp(App):
 
     def handle_tabsdata_server_connection(self):
         self.tabsdata_server = tabsdata_api.initialize_tabsdata_server_connection(self)
+        self.catalog_cache = CatalogCache(self.tabsdata_server)
 
     @on(ListView.Highlighted)
     async def on_select_highlighted(self, event: ListView.Highlighted):
@@ -0,0 +1,20 @@
+import sys
+
+
+def main() -> None:
+    """
+    `tdconsole` opens the TUI; `tdconsole run ...` runs a flow headless.
+    Imports are deferred so the headless path never loads Textual.
+    """
+    if sys.argv[1:2] == ["run"]:
+        from tdconsole.core.headless import main as run_headless
+
+        sys.exit(run_headless(sys.argv[2:]))
+
+    from tdconsole.app_start import run_app
+
+    run_app()
+
+
+if __name__ == "__main__":
+    main()
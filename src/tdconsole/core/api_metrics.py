@@ -0,0 +1,183 @@
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from tdconsole.core.db import DEFAULT_DATA_DIR
+
+# Only the most recent samples per method are kept so long sessions don't grow
+# without bound; percentiles are computed over this window.
+SAMPLE_WINDOW = 2048
+
+
+@dataclass
+class MethodStats:
+    """Latency, error and payload tracking for a single TabsdataServer method."""
+
+    name: str
+    calls: int = 0
+    errors: int = 0
+    payload_bytes: int = 0
+    max_latency: float = 0.0
+    last_error: str | None = None
+    latencies: deque = field(default_factory=lambda: deque(maxlen=SAMPLE_WINDOW))
+
+    def record(self, elapsed: float, payload_bytes: int = 0, error=None) -> None:
+        self.calls += 1
+        self.latencies.append(elapsed)
+        self.max_latency = max(self.max_latency, elapsed)
+        self.payload_bytes += payload_bytes
+        if error is not None:
+            self.errors += 1
+            self.last_error = repr(error)
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile of the sampled latencies, in seconds."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = math.ceil(pct / 100 * len(ordered)) - 1
+        return ordered[max(0, min(len(ordered) - 1, rank))]
+
+    def as_dict(self) -> dict:
+        successes = self.calls - self.errors
+        return {
+            "method": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": _to_ms(self.percentile(50)),
+            "p95_ms": _to_ms(self.percentile(95)),
+            "p99_ms": _to_ms(self.percentile(99)),
+            "max_ms": _to_ms(self.max_latency),
+            "payload_bytes": self.payload_bytes,
+            "avg_payload_bytes": (
+                self.payload_bytes // successes if successes > 0 else 0
+            ),
+            "last_error": self.last_error,
+        }
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class ApiMetrics:
+    """Thread-safe registry of MethodStats keyed by method name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, MethodStats] = {}
+        self.started_at = datetime.now()
+
+    def record(self, method: str, elapsed: float, payload_bytes: int = 0, error=None):
+        with self._lock:
+            stats = self._stats.get(method)
+            if stats is None:
+                stats = self._stats[method] = MethodStats(method)
+            stats.record(elapsed, payload_bytes, error)
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [self._stats[k].as_dict() for k in sorted(self._stats)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = datetime.now()
+
+    def dump_json(self, path: str | Path | None = None) -> Path:
+        """Write the current snapshot to `path` (or the data dir) and return it."""
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = DEFAULT_DATA_DIR / "diagnostics" / f"api_metrics-{stamp}.json"
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "started_at": self.started_at.isoformat(),
+            "dumped_at": datetime.now().isoformat(),
+            "methods": self.snapshot(),
+        }
+        path.write_text(json.dumps(payload, indent=2))
+        return path
+
+
+METRICS = ApiMetrics()
+
+
+def estimate_payload_size(result) -> int:
+    """Approximate the size of a server response once deserialized."""
+    if result is None:
+        return 0
+    if isinstance(result, (bytes, bytearray, str)):
+        return len(result)
+    if hasattr(result, "estimated_size"):
+        try:
+            return int(result.estimated_size())
+        except Exception:
+            return 0
+    if isinstance(result, (list, tuple, set)):
+        return sum(estimate_payload_size(i) for i in result)
+    if isinstance(result, dict):
+        return len(json.dumps(result, default=str))
+    if hasattr(result, "__dict__"):
+        return len(json.dumps(vars(result), default=str))
+    return len(repr(result))
+
+
+class InstrumentedServer:
+    """
+    Transparent proxy around a TabsdataServer that records the latency,
+    outcome and payload size of every public method call.
+    """
+
+    def __init__(self, server, metrics: ApiMetrics = METRICS) -> None:
+        object.__setattr__(self, "_server", server)
+        object.__setattr__(self, "_metrics", metrics)
+
+    @property
+    def wrapped(self):
+        return self._server
+
+    def __getattr__(self, name):
+        attr = getattr(self._server, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        metrics = self._metrics
+
+        @functools.wraps(attr)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                metrics.record(name, time.perf_counter() - start, error=e)
+                raise
+            metrics.record(
+                name, time.perf_counter() - start, estimate_payload_size(result)
+            )
+            return result
+
+        return timed
+
+    def __setattr__(self, name, value):
+        setattr(self._server, name, value)
+
+    def __repr__(self) -> str:
+        return f"InstrumentedServer({self._server!r})"
+
+
+def timed_call(method: str, func, *args, metrics: ApiMetrics = METRICS, **kwargs):
+    """Time a one-off call (e.g. the TabsdataServer constructor) under `method`."""
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        metrics.record(method, time.perf_counter() - start, error=e)
+        raise
+    metrics.record(method, time.perf_counter() - start)
+    return result
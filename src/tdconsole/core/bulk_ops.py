@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Iterable
+
+
+def _env_concurrency(name: str, default: int) -> int:
+    """A positive int from the environment; `default` if unset or invalid."""
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+# Upper bound on server calls a bulk operation has in flight at once.
+DEFAULT_CONCURRENCY = _env_concurrency("TDCONSOLE_BULK_CONCURRENCY", 8)
+
+
+class BulkStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class BulkItem:
+    """One target of a bulk operation and its outcome."""
+
+    key: str
+    target: Any
+    status: BulkStatus = BulkStatus.PENDING
+    error: str | None = None
+    elapsed: float | None = None
+
+
+async def run_bulk(
+    items: Iterable[BulkItem],
+    operation: Callable[[Any], Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_update: Callable[[BulkItem], None] | None = None,
+) -> list[BulkItem]:
+    """
+    Run a blocking `operation(item.target)` for every item in worker threads,
+    with at most `concurrency` running at once. Failures are recorded on the
+    item and never stop the remaining items. `on_update` is called on the
+    event loop whenever an item changes status.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    def notify(item: BulkItem) -> None:
+        if on_update is not None:
+            on_update(item)
+
+    async def run_one(item: BulkItem) -> None:
+        async with semaphore:
+            item.status = BulkStatus.RUNNING
+            notify(item)
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(operation, item.target)
+                item.status = BulkStatus.SUCCEEDED
+            except asyncio.CancelledError:
+                item.status = BulkStatus.CANCELLED
+                raise
+            except Exception as e:
+                item.status = BulkStatus.FAILED
+                item.error = str(e) or repr(e)
+            finally:
+                item.elapsed = time.perf_counter() - start
+                notify(item)
+
+    try:
+        await asyncio.gather(*(run_one(i) for i in items))
+    finally:
+        for item in items:
+            if item.status == BulkStatus.PENDING:
+                item.status = BulkStatus.CANCELLED
+                notify(item)
+    return items
+
+
+def bulk_operations(server, kind: str, collection=None) -> dict[str, Callable]:
+    """Bulk operations available for a catalog pane, keyed by display name."""
+    if server is None:
+        return {}
+    if kind == "collections":
+        return {"Delete Collections": lambda c: server.delete_collection(c.name)}
+    if kind == "functions":
+        collection_name = getattr(collection, "name", collection)
+        return {
+            "Delete Functions": lambda f: server.delete_function(
+                collection_name, f.name
+            ),
+            "Trigger Functions": lambda f: server.trigger_function(
+                collection_name, f.name
+            ),
+        }
+    return {}
+
+
+def summarize(items: Iterable[BulkItem]) -> dict[str, int]:
+    counts = {status.value: 0 for status in BulkStatus}
+    for item in items:
+        counts[item.status.value] += 1
+    return counts
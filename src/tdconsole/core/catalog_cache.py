@@ -0,0 +1,178 @@
+import threading
+import time
+
+# Seconds a listing is considered fresh before it is fetched again.
+DEFAULT_TTL = 30.0
+
+LISTERS = {
+    "collections": lambda server, collection: server.list_collections(),
+    "functions": lambda server, collection: server.list_functions(collection),
+    "tables": lambda server, collection: server.list_tables(collection),
+}
+
+
+class NameSet:
+    """
+    A server's collection names as a set, so "is this name taken" is a local
+    lookup. Creates and deletes made through the console update it in place;
+    `refresh` re-lists from the server (call it off the UI thread). A stale
+    set keeps answering `in` (the as-you-type hints) until the refresh
+    lands; `taken` re-lists it first.
+    """
+
+    def __init__(self, lister, ttl: float = DEFAULT_TTL) -> None:
+        self.lister = lister
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._names: set[str] | None = None
+        self._loaded_at = 0.0
+        # Edits made while a refresh is listing, replayed on top of its result.
+        self._journal: list[tuple[bool, str]] = []
+        self._refreshing = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._names is not None
+
+    @property
+    def stale(self) -> bool:
+        return self._names is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def refresh(self) -> frozenset[str]:
+        with self._lock:
+            self._refreshing += 1
+        try:
+            names = set(self.lister())
+        finally:
+            with self._lock:
+                self._refreshing -= 1
+        with self._lock:
+            for added, name in self._journal:
+                (names.add if added else names.discard)(name)
+            if not self._refreshing:
+                self._journal.clear()
+            self._names = names
+            self._loaded_at = time.monotonic()
+            return frozenset(names)
+
+    def replace(self, names) -> None:
+        """Take a listing fetched elsewhere as the current set."""
+        with self._lock:
+            self._names = set(names)
+            self._loaded_at = time.monotonic()
+
+    def _edit(self, added: bool, name: str) -> None:
+        with self._lock:
+            if self._refreshing:
+                self._journal.append((added, name))
+            if self._names is not None:
+                (self._names.add if added else self._names.discard)(name)
+
+    def add(self, name: str) -> None:
+        self._edit(True, name)
+
+    def discard(self, name: str) -> None:
+        self._edit(False, name)
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def taken(self, name: str) -> bool:
+        """
+        Whether `name` is in use, for validating a submit: re-lists the
+        server first when the set is stale (or never loaded), so names
+        created outside the console are caught. Hints use `in` instead.
+        """
+        if self.stale:
+            try:
+                self.refresh()
+            except Exception:
+                if self._names is None:
+                    raise
+        with self._lock:
+            return name in self._names
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return self._names is not None and name in self._names
+
+
+class CatalogCache:
+    """
+    Listing cache in front of a TabsdataServer.
+
+    Listings are keyed by (kind, collection name) and shared by the catalog
+    widgets, so a pane and its parent panel no longer each hit the server for
+    the same data. `page` slices a cached listing into bounded windows for the
+    virtualized lists.
+    """
+
+    def __init__(self, server, ttl: float = DEFAULT_TTL) -> None:
+        self.server = server
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str | None], tuple[float, list]] = {}
+        self.collection_names = NameSet(self._list_collection_names, ttl)
+
+    def _list_collection_names(self) -> list[str]:
+        if self.server is None:
+            return []
+        return [c.name for c in self.server.list_collections()]
+
+    def _key(self, kind: str, collection=None) -> tuple[str, str | None]:
+        if kind not in LISTERS:
+            raise KeyError(f"Unknown catalog listing {kind!r}")
+        return kind, getattr(collection, "name", collection)
+
+    def cached(self, kind: str, collection=None) -> list | None:
+        """Return a fresh cached listing without fetching, or None."""
+        key = self._key(kind, collection)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def list(self, kind: str, collection=None, refresh: bool = False) -> list:
+        """Return the listing for `kind`, fetching it if missing or stale."""
+        key = self._key(kind, collection)
+        if not refresh:
+            items = self.cached(kind, collection)
+            if items is not None:
+                return items
+        if self.server is None:
+            return []
+        items = list(LISTERS[kind](self.server, key[1]))
+        self.store(kind, collection, items)
+        return items
+
+    def store(self, kind: str, collection, items: list) -> None:
+        key = self._key(kind, collection)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(items))
+        if kind == "collections":
+            self.collection_names.replace(i.name for i in items)
+
+    def page(
+        self, kind: str, collection=None, offset: int = 0, limit: int = 50
+    ) -> tuple[list, int]:
+        """Return (items[offset:offset + limit], total) for a listing."""
+        items = self.list(kind, collection)
+        return items[offset : offset + limit], len(items)
+
+    def invalidate(self, kind: str | None = None, collection=None) -> None:
+        """Drop cached listings; with no arguments the whole cache is cleared."""
+        if kind in (None, "collections"):
+            # Still answers lookups until refreshed.
+            self.collection_names.mark_stale()
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+                return
+            key = self._key(kind, collection)
+            if collection is None and kind != "collections":
+                for k in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[k]
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,272 @@
+import copy
+import difflib
+import fnmatch
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from tdconsole.core.find_instances import define_root, find_tabsdata_instance_names
+from tdconsole.core.yaml_getter_setter import VALUE_TYPES, ConfigTransaction
+
+CONFIG_PATTERNS = ("*.yaml", "*.yml")
+# apiserver/config/config.yaml and its siblings live under here.
+CONFIG_ROOT = "/workspace/config"
+
+# "[0]" list indices, dropped so `addresses` matches `addresses[0]`.
+_INDEX = re.compile(r"\[\d+\]")
+
+
+def find_instance_configs(instance_name: str) -> list[Path]:
+    """YAML config files in an instance's workspace config tree."""
+    root = define_root("instances", instance_name, CONFIG_ROOT)
+    if root is None:
+        return []
+    files = {p for pattern in CONFIG_PATTERNS for p in root.rglob(pattern)}
+    return sorted(p for p in files if p.is_file())
+
+
+def flatten(data, prefix: str = "") -> list[tuple[str, str]]:
+    """Leaf values of parsed YAML as (dotted.key[0], value) pairs."""
+    if isinstance(data, dict):
+        leaves = []
+        for key, value in data.items():
+            leaves.extend(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+        return leaves
+    if isinstance(data, list):
+        leaves = []
+        for n, value in enumerate(data):
+            leaves.extend(flatten(value, f"{prefix}[{n}]"))
+        return leaves
+    return [(prefix, "" if data is None else str(data))]
+
+
+def dump(data) -> str:
+    if data is None:
+        return ""
+    return yaml.safe_dump(data, sort_keys=False)
+
+
+def unified_diff(before: str, after: str, a: str, b: str) -> list[str]:
+    return list(
+        difflib.unified_diff(before.splitlines(), after.splitlines(), a, b, lineterm="")
+    )
+
+
+@dataclass
+class ConfigEntry:
+    """One parsed config file of one instance."""
+
+    instance: str
+    path: Path
+    # Path under the instance's workspace/config, e.g.
+    # proc/regular/apiserver/config/config.yaml
+    rel: str
+    mtime_ns: int
+    size: int
+    data: dict | None = None
+    error: str | None = None
+    leaves: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.instance}:{self.rel}"
+
+    def text(self) -> str:
+        return dump(self.data)
+
+
+def parse_config(instance: str, path: Path, rel: str, stat) -> ConfigEntry:
+    entry = ConfigEntry(instance, path, rel, stat.st_mtime_ns, stat.st_size)
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        entry.error = str(e)
+        return entry
+    if data is not None and not isinstance(data, dict):
+        entry.error = "not a mapping"
+        return entry
+    entry.data = data or {}
+    entry.leaves = flatten(entry.data)
+    return entry
+
+
+@dataclass
+class Match:
+    entry: ConfigEntry
+    # The (key, value) leaves that satisfied the query.
+    leaves: list[tuple[str, str]]
+
+
+class ConfigIndex:
+    """
+    Parsed configs of every instance, keyed by "instance:rel".
+
+    `refresh` stats every config file and only re-parses the ones whose
+    mtime or size changed since the last refresh, so keeping the index
+    fresh costs a directory walk. Leaves are also indexed by their key with
+    list indices dropped, which is what `query` looks up.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.entries: dict[str, ConfigEntry] = {}
+        self.by_key: dict[str, set[str]] = {}
+        self.parsed = 0
+
+    def refresh(self, instance_names=None) -> int:
+        """Bring the index up to date; returns how many files were parsed."""
+        if instance_names is None:
+            instance_names = find_tabsdata_instance_names()
+        seen = {}
+        for name in instance_names:
+            root = define_root("instances", name, CONFIG_ROOT)
+            for path in find_instance_configs(name):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                rel = path.relative_to(root).as_posix()
+                seen[f"{name}:{rel}"] = (name, path, rel, stat)
+
+        with self._lock:
+            current = dict(self.entries)
+        parsed = 0
+        fresh = {}
+        for key, (name, path, rel, stat) in seen.items():
+            entry = current.get(key)
+            if (
+                entry is None
+                or entry.mtime_ns != stat.st_mtime_ns
+                or entry.size != stat.st_size
+            ):
+                entry = parse_config(name, path, rel, stat)
+                parsed += 1
+            fresh[key] = entry
+
+        by_key: dict[str, set[str]] = {}
+        for key, entry in fresh.items():
+            for leaf, _ in entry.leaves:
+                by_key.setdefault(_INDEX.sub("", leaf), set()).add(key)
+        with self._lock:
+            self.entries = fresh
+            self.by_key = by_key
+            self.parsed += parsed
+        return parsed
+
+    def get(self, key: str) -> ConfigEntry | None:
+        with self._lock:
+            return self.entries.get(key)
+
+    def all(self) -> list[ConfigEntry]:
+        with self._lock:
+            return sorted(self.entries.values(), key=lambda e: (e.instance, e.rel))
+
+    def instances(self) -> list[str]:
+        return sorted({e.instance for e in self.all()})
+
+    def query(self, text: str) -> list[Match]:
+        """
+        Configs matching `text`:
+
+            addresses=0.0.0.0*   leaves under `addresses` matching the glob
+            addresses            configs that set `addresses`
+            0.0.0.0              any leaf value containing the text
+
+        An empty query matches every config. Keys are dotted paths without
+        list indices (`a.b` matches `a.b[2]`).
+        """
+        text = text.strip()
+        with self._lock:
+            entries = self.entries
+            by_key = self.by_key
+        if not text:
+            return [Match(e, []) for e in self.all()]
+
+        if "=" in text:
+            key, pattern = (part.strip() for part in text.split("=", 1))
+            if not any(c in pattern for c in "*?["):
+                pattern = f"*{pattern}*"
+            matches = []
+            for entry_key in sorted(by_key.get(key, ())):
+                entry = entries[entry_key]
+                leaves = [
+                    (k, v)
+                    for k, v in entry.leaves
+                    if _INDEX.sub("", k) == key and fnmatch.fnmatchcase(v, pattern)
+                ]
+                if leaves:
+                    matches.append(Match(entry, leaves))
+            return matches
+
+        if text in by_key:
+            return [
+                Match(
+                    entries[k],
+                    [(l, v) for l, v in entries[k].leaves if _INDEX.sub("", l) == text],
+                )
+                for k in sorted(by_key[text])
+            ]
+
+        matches = []
+        for entry in self.all():
+            leaves = [(k, v) for k, v in entry.leaves if text in v]
+            if leaves:
+                matches.append(Match(entry, leaves))
+        return matches
+
+    def diff(self, a: str, b: str) -> list[str]:
+        """Unified diff between two indexed configs."""
+        left, right = self.get(a), self.get(b)
+        if left is None or right is None:
+            raise KeyError(a if left is None else b)
+        return unified_diff(left.text(), right.text(), left.key, right.key)
+
+
+@dataclass
+class ConfigChange:
+    """A previewed edit of one config, applied only if the file is unchanged."""
+
+    entry: ConfigEntry
+    key: str
+    value: object
+    value_type: str
+    diff: list[str]
+
+    def apply(self) -> None:
+        stat = os.stat(self.entry.path)
+        if (stat.st_mtime_ns, stat.st_size) != (self.entry.mtime_ns, self.entry.size):
+            raise RuntimeError("changed on disk since the preview; refresh and retry")
+        result = (
+            ConfigTransaction(self.entry.path)
+            .set(self.key, self.value, self.value_type)
+            .commit()
+        )
+        if not result.ok:
+            raise RuntimeError("; ".join(map(str, result.errors)))
+
+
+def preview_edit(
+    entries, key: str, value, value_type: str = "str"
+) -> list[ConfigChange]:
+    """
+    What setting top-level `key` would do to each config, without writing
+    anything. Configs the edit wouldn't change are left out.
+    """
+    if value_type not in VALUE_TYPES:
+        raise ValueError(f"unknown value type {value_type!r}")
+    changes = []
+    for entry in entries:
+        if entry.data is None:
+            continue
+        data = copy.deepcopy(entry.data)
+        data[key] = value if value_type == "str" else [value]
+        before, after = entry.text(), dump(data)
+        if before != after:
+            diff = unified_diff(before, after, entry.key, f"{entry.key} (edited)")
+            changes.append(ConfigChange(entry, key, value, value_type, diff))
+    return changes
@@ -1,15 +1,20 @@
 import os
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
 from tdconsole.core.find_instances import sync_filesystem_instances_to_db
-from tdconsole.core.models import Base  # your ORM models
+from tdconsole.core.models import Base, TableSchema  # your ORM models
+
+DEFAULT_DATA_DIR = (
+    Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+    / "tdconsole"
+)
 
 DEFAULT_DB_URL = os.environ.get(
     "TDCONSOLE_DB_URL",
-    f"sqlite:///{(Path(os.environ.get('XDG_DATA_HOME', Path.home() / '.local' / 'share')) / 'tdconsole' / 'tdconsole.db').resolve()}",
+    f"sqlite:///{(DEFAULT_DATA_DIR / 'tdconsole.db').resolve()}",
 )
 
 
@@ -20,13 +25,34 @@ def _ensure_sqlite_dir(db_url: str) -> None:
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
 
+# Tables holding only refetchable data: dropped and recreated when their
+# primary key changes instead of being migrated.
+CACHE_TABLES = (TableSchema.__table__,)
+
+
+def _drop_stale_caches(engine) -> None:
+    inspector = inspect(engine)
+    existing = inspector.get_table_names()
+    for table in CACHE_TABLES:
+        if table.name not in existing:
+            continue
+        key = inspector.get_pk_constraint(table.name)["constrained_columns"]
+        if key != [column.name for column in table.primary_key]:
+            table.drop(engine)
+
+
 def start_session(db_url: str | None = None):
     url = db_url or DEFAULT_DB_URL
     _ensure_sqlite_dir(url)
     engine = create_engine(url, echo=False, future=True)
     SessionLocal = sessionmaker(bind=engine, future=True)
     session = SessionLocal()
+    _drop_stale_caches(engine)
     Base.metadata.create_all(engine)
+    # create_all leaves existing tables alone; add indexes defined since.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     sync_filesystem_instances_to_db(session=session)
     # Base.metadata.drop_all(engine)
     # Base.metadata.create_all(engine)
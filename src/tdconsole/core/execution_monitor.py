@@ -0,0 +1,203 @@
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+# Server listings the monitor follows, keyed by kind.
+LISTERS = {
+    "executions": "list_executions",
+    "transactions": "list_transactions",
+}
+
+# Record field the incremental cursor is kept on, and how it is sent to the
+# server's list filter.
+CURSOR_FIELD = "triggered_on"
+CURSOR_FILTER = "{field}:ge:{value}"
+
+# Fields shown for a record, in display order.
+FIELDS = ("id", "name", "status", "triggered_on", "started_on", "ended_on")
+
+# Statuses after which a record no longer changes. A record with an
+# `ended_on` is finished whatever its status says (error, stalled, statuses
+# newer servers add), so this list only matters for records without one.
+TERMINAL_STATUSES = {
+    "canceled",
+    "cancelled",
+    "committed",
+    "done",
+    "failed",
+    "finished",
+    "published",
+    "rolled back",
+    "rolledback",
+    "success",
+    "succeeded",
+}
+
+
+def is_terminal(status, ended_on=None) -> bool:
+    if ended_on is not None:
+        return True
+    return str(status or "").strip().lower() in TERMINAL_STATUSES
+
+
+def as_millis(value) -> int | None:
+    """Epoch milliseconds from an int/float/datetime/ISO string, else None."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(str(value)).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+@dataclass
+class MonitorRecord:
+    kind: str
+    id: str
+    fields: dict
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.kind, self.id
+
+    @property
+    def status(self):
+        return self.fields.get("status")
+
+    @property
+    def active(self) -> bool:
+        return not is_terminal(self.status, self.fields.get("ended_on"))
+
+    @classmethod
+    def from_server(cls, kind: str, obj) -> "MonitorRecord":
+        def get(name):
+            if isinstance(obj, dict):
+                return obj.get(name)
+            return getattr(obj, name, None)
+
+        fields = {name: get(name) for name in FIELDS}
+        if fields["name"] is None:
+            function = get("function")
+            fields["name"] = getattr(function, "name", function)
+        return cls(kind, str(fields["id"]), fields)
+
+
+@dataclass
+class MonitorStore:
+    """
+    Local copy of every record seen so far. `merge` reports only the records
+    that are new or whose fields changed, so the UI can touch just those rows.
+    """
+
+    records: dict[tuple[str, str], MonitorRecord] = field(default_factory=dict)
+
+    def merge(self, records) -> list[MonitorRecord]:
+        changed = []
+        for record in records:
+            old = self.records.get(record.key)
+            if old is not None and old.fields == record.fields:
+                continue
+            self.records[record.key] = record
+            changed.append(record)
+        return changed
+
+    def active(self, kind: str | None = None) -> list[MonitorRecord]:
+        return [
+            r
+            for r in self.records.values()
+            if r.active and (kind is None or r.kind == kind)
+        ]
+
+    def cursor(self, kind: str) -> int | None:
+        """
+        Oldest point the next poll must start from: the earliest still-active
+        record (so its status updates come back), otherwise the newest record
+        seen (so only new ones come back).
+        """
+        stamps = [
+            as_millis(r.fields.get(CURSOR_FIELD))
+            for r in self.records.values()
+            if r.kind == kind
+        ]
+        active = [
+            as_millis(r.fields.get(CURSOR_FIELD))
+            for r in self.active(kind)
+            if r.fields.get(CURSOR_FIELD) is not None
+        ]
+        stamps = [s for s in stamps if s is not None]
+        if active:
+            return min(active)
+        return max(stamps) if stamps else None
+
+
+@dataclass
+class AdaptiveBackoff:
+    """
+    Poll interval that stays at `minimum` while work is running or records keep
+    changing, and grows by `factor` up to `maximum` while the instance is idle.
+    Errors also back off, so a struggling server isn't hammered.
+    """
+
+    minimum: float = 1.0
+    maximum: float = 30.0
+    factor: float = 2.0
+    interval: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.interval = self.minimum
+
+    def next(self, busy: bool) -> float:
+        if busy:
+            self.interval = self.minimum
+        else:
+            self.interval = min(self.maximum, self.interval * self.factor)
+        return self.interval
+
+    def reset(self) -> None:
+        self.interval = self.minimum
+
+
+class ExecutionMonitor:
+    """
+    Incremental poller for executions and transactions. Each poll asks the
+    server only for records at or after the per-kind cursor, merges them into
+    the MonitorStore and returns the ones that changed.
+    """
+
+    def __init__(self, server, kinds=tuple(LISTERS), backoff=None) -> None:
+        self.server = server
+        self.kinds = list(kinds)
+        self.store = MonitorStore()
+        self.backoff = backoff or AdaptiveBackoff()
+        self.polls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, kind: str) -> list[MonitorRecord]:
+        lister = getattr(self.server, LISTERS[kind])
+        cursor = self.store.cursor(kind)
+        if cursor is None:
+            rows = lister()
+        else:
+            rows = lister(filter=CURSOR_FILTER.format(field=CURSOR_FIELD, value=cursor))
+        return [MonitorRecord.from_server(kind, row) for row in rows]
+
+    def poll(self) -> tuple[list[MonitorRecord], float]:
+        """Run one poll; returns (changed records, seconds until the next one)."""
+        with self._lock:
+            self.polls += 1
+            try:
+                fetched = [r for kind in self.kinds for r in self.fetch(kind)]
+            except Exception:
+                self.backoff.next(busy=False)
+                raise
+            changed = self.store.merge(fetched)
+            busy = bool(changed) or bool(self.store.active())
+            return changed, self.backoff.next(busy)
+
+    @property
+    def next_interval(self) -> float:
+        return self.backoff.interval
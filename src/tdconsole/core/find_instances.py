@@ -1,4 +1,3 @@
-import json
 import os
 from os import listdir
 from pathlib import Path
@@ -6,6 +5,7 @@ from urllib.parse import urlparse
 
 import psutil
 
+from tdconsole.core.login_session import read_connection
 from tdconsole.core.models import Instance
 from tdconsole.core.yaml_getter_setter import (
     get_yaml_value,
@@ -263,9 +263,8 @@ def query_session(session, model, limit=None, *conditions, **filters):
 
 
 def resolve_login_credentials(app=None):
-    json_path = os.path.expanduser("~/.tabsdata/connection.json")
-    url = json.load(open(json_path))["url"] if os.path.exists(json_path) else None
-    port = urlparse(url).port
+    url = (read_connection() or {}).get("url")
+    port = urlparse(url).port if url else None
     if app:
         app.working_url = url
         app.working_port = port
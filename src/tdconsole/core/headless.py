@@ -0,0 +1,327 @@
+"""
+Headless instance lifecycle for scripts and CI:
+
+    tdconsole run start --instance NAME [--ext PORT] [--int PORT] [--https]
+    tdconsole run {bind,start,stop,delete} --instance NAME ...
+
+Runs the same task graphs as the TUI (see instance_flows) and writes its
+progress to stdout as NDJSON, one event object per line:
+
+    {"event": "flow", "status": "started", "flow": ..., "tasks": [...]}
+    {"event": "task", "task": ..., "status": "running" | "succeeded" | ...}
+    {"event": "log", "task": ..., "message": ...}
+    {"event": "output", "task": ..., "line": ...}
+    {"event": "retry", "task": ..., "attempt": 2, "max_attempts": 3}
+    {"event": "error", "message": ...}
+    {"event": "flow", "status": "succeeded" | "failed" | "cancelled", ...}
+
+A new instance created without --ext/--int gets the next free port pair
+from port_allocator, reserved until the run exits.
+
+Exit codes: 0 all steps succeeded, 1 a step failed, 2 bad arguments or
+ports, 3 no such instance (or not running, for stop), 130 interrupted.
+
+This module must never import Textual.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from functools import partial
+
+from tdconsole.core.db import start_session
+from tdconsole.core.find_instances import (
+    instance_name_to_instance,
+    sync_filesystem_instances_to_db,
+)
+from tdconsole.core.instance_checks import port_problem
+from tdconsole.core.instance_flows import FLOWS, InstanceFlow, finish_flow
+from tdconsole.core.log_buffer import LineCoalescer
+from tdconsole.core.port_allocator import PORT_ALLOCATOR, instance_ports
+from tdconsole.core.run_logs import RunLog, prune_runs
+from tdconsole.core.task_graph import (
+    DEFAULT_CONCURRENCY,
+    TaskGraph,
+    TaskResult,
+    TaskSpec,
+    TaskStatus,
+)
+from tdconsole.core.task_runner import run_process, run_task
+from tdconsole.core.task_timing import record_results
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NOT_FOUND = 3
+EXIT_CANCELLED = 130
+
+HEADLESS_PORT_OWNER = f"headless:{os.getpid()}"
+
+
+class FlowError(Exception):
+    """A flow that can't start; `exit_code` is what the CLI exits with."""
+
+    def __init__(self, exit_code: int, message: str) -> None:
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class HeadlessRunner:
+    """
+    The runner instance_tasks expects (log_line, run_logged_subprocess, new),
+    reporting to an NDJSON stream instead of a task screen.
+    """
+
+    def __init__(self, flow: InstanceFlow, instance, new: dict, out=None) -> None:
+        self.flow = flow
+        self.instance = instance
+        self.new = new
+        self.out = out or sys.stdout
+        self.splitter = LineCoalescer()
+        self.recent_output: dict[str, deque[str]] = {}
+        self.cpu_seconds: dict[str, float] = {}
+        try:
+            self.run_log: RunLog | None = RunLog(flow.name)
+        except OSError:
+            self.run_log = None
+
+    def emit(self, event: str, **fields) -> None:
+        record = {"ts": round(time.time(), 3), "event": event, **fields}
+        self.out.write(json.dumps(record, default=str) + "\n")
+        self.out.flush()
+
+    def log_line(self, task: str | None, msg: str) -> None:
+        if self.run_log is not None:
+            self.run_log.write(task, msg)
+        self.emit("log", task=task, message=msg)
+
+    def log_output(self, label: str | None, chunk: bytes) -> None:
+        recent = self.recent_output.get(label)
+        for text in self.splitter.split(label, chunk, final=not chunk):
+            if self.run_log is not None:
+                self.run_log.write(label, text)
+            if recent is not None:
+                recent.append(text)
+            self.emit("output", task=label, line=text)
+
+    async def run_logged_subprocess(self, label: str | None, *args: str) -> int:
+        self.log_line(label, f"Running: {' '.join(args)}")
+        try:
+            code, cpu = await run_process(args, partial(self.log_output, label))
+        finally:
+            self.log_output(label, b"")
+        if label is not None and cpu is not None:
+            self.cpu_seconds[label] = self.cpu_seconds.get(label, 0.0) + cpu
+        self.log_line(label, f"Exited with code {code}")
+        return code
+
+    async def run_single_task(self, task: TaskSpec) -> int | None:
+        def on_retry(attempt: int, max_attempts: int) -> None:
+            self.emit(
+                "retry", task=task.name, attempt=attempt, max_attempts=max_attempts
+            )
+
+        return await run_task(task, self.log_line, self.recent_output, on_retry)
+
+    def on_update(self, result: TaskResult) -> None:
+        self.emit(
+            "task",
+            task=result.task.name,
+            description=result.task.description,
+            status=result.status.value,
+            code=result.code,
+            elapsed=None if result.elapsed is None else round(result.elapsed, 3),
+            blocked_by=result.blocked_by,
+        )
+
+    async def run(self, concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+        graph = TaskGraph(self.flow.build(self, self.instance))
+        self.emit(
+            "flow",
+            status="started",
+            flow=self.flow.name,
+            instance=self.instance.name,
+            tasks=[
+                {
+                    "task": t.name,
+                    "description": t.description,
+                    "depends_on": list(graph.deps[t.name]),
+                }
+                for t in graph.tasks
+            ],
+        )
+        return await graph.run(self.run_single_task, concurrency, self.on_update)
+
+    def close(self) -> None:
+        if self.run_log is not None:
+            self.run_log.close()
+
+
+def resolve_instance(
+    session,
+    flow: InstanceFlow,
+    name: str,
+    ext: str | None = None,
+    internal: str | None = None,
+    use_https: bool | None = None,
+):
+    """
+    The instance to run `flow` on with the requested settings applied, and
+    the `new` flags instance_tasks reads. Raises FlowError when it can't run.
+    """
+    instances = {i.name: i for i in sync_filesystem_instances_to_db(session=session)}
+    instance = instances.get(name)
+    changes_ports = ext is not None or internal is not None or use_https is not None
+    if changes_ports and not flow.configures_ports:
+        raise FlowError(EXIT_USAGE, "--ext/--int/--https only apply to bind and start")
+    if instance is None:
+        if not flow.configures_ports:
+            raise FlowError(EXIT_NOT_FOUND, f"No instance named {name!r}")
+        instance = instance_name_to_instance("_Create_Instance")
+        if ext is None and internal is None:
+            # Concurrent runs creating instances each get their own pair.
+            known = instance_ports(instances.values())
+            pair = PORT_ALLOCATOR.reserve_pair(HEADLESS_PORT_OWNER, known)
+            if pair is None:
+                raise FlowError(EXIT_USAGE, "No free port pair left on this host")
+            ext, internal = map(str, pair)
+    elif flow.name == "StopInstance" and instance.status != "Running":
+        raise FlowError(EXIT_NOT_FOUND, f"Instance {name!r} is not running")
+
+    new = {
+        "name": instance.name != name,
+        "arg_ext": False,
+        "arg_int": False,
+        "use_https": False,
+    }
+    if ext is not None:
+        problem = port_problem(
+            ext, name, session=session, port_owner=HEADLESS_PORT_OWNER
+        )
+        if problem is not None:
+            raise FlowError(EXIT_USAGE, problem)
+        new["arg_ext"] = str(ext) != instance.arg_ext
+        instance.arg_ext = str(ext)
+    if internal is not None:
+        problem = port_problem(
+            internal,
+            name,
+            session=session,
+            external_port=instance.arg_ext,
+            port_owner=HEADLESS_PORT_OWNER,
+        )
+        if problem is not None:
+            raise FlowError(EXIT_USAGE, problem)
+        new["arg_int"] = str(internal) != instance.arg_int
+        instance.arg_int = str(internal)
+    if use_https is not None:
+        new["use_https"] = use_https != bool(instance.use_https)
+        instance.use_https = use_https
+    instance.name = name
+    instance.working = flow.working
+    return instance, new
+
+
+async def run_flow(runner: HeadlessRunner, session, concurrency: int) -> int:
+    started = time.perf_counter()
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    try:
+        results = await runner.run(concurrency)
+    except asyncio.CancelledError:
+        runner.emit(
+            "flow",
+            status="cancelled",
+            exit_code=EXIT_CANCELLED,
+            elapsed=round(time.perf_counter() - started, 3),
+        )
+        return EXIT_CANCELLED
+
+    ok = all(r.status == TaskStatus.SUCCEEDED for r in results.values())
+    if ok:
+        finish_flow(session, runner.instance, runner.flow.working)
+    run_id = runner.run_log.run_id if runner.run_log is not None else runner.flow.name
+    record_results(
+        session,
+        run_id,
+        runner.flow.name,
+        runner.instance.name,
+        results,
+        runner.cpu_seconds,
+    )
+    code = EXIT_OK if ok else EXIT_FAILED
+    runner.emit(
+        "flow",
+        status="succeeded" if ok else "failed",
+        exit_code=code,
+        elapsed=round(time.perf_counter() - started, 3),
+        run_log=None if runner.run_log is None else str(runner.run_log.path),
+    )
+    return code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tdconsole run",
+        description="Run an instance lifecycle flow without the TUI (NDJSON output).",
+    )
+    parser.add_argument("flow", choices=sorted(FLOWS))
+    parser.add_argument("--instance", required=True, help="Instance name")
+    parser.add_argument("--ext", help="External port (bind/start)")
+    parser.add_argument("--int", dest="internal", help="Internal port (bind/start)")
+    parser.add_argument(
+        "--https",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Serve over HTTPS (bind/start)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Steps run at once when the flow allows it",
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    try:
+        args = build_parser().parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_USAGE
+
+    flow = FLOWS[args.flow]
+    session = start_session()[0]
+    try:
+        try:
+            instance, new = resolve_instance(
+                session, flow, args.instance, args.ext, args.internal, args.https
+            )
+        except FlowError as e:
+            record = {"ts": round(time.time(), 3), "event": "error", "message": str(e)}
+            print(json.dumps(record), flush=True)
+            return e.exit_code
+
+        runner = HeadlessRunner(flow, instance, new)
+        try:
+            return asyncio.run(run_flow(runner, session, args.concurrency))
+        finally:
+            runner.close()
+            try:
+                prune_runs()
+            except OSError:
+                pass
+    finally:
+        PORT_ALLOCATOR.release(HEADLESS_PORT_OWNER)
+        session.close()
@@ -1,7 +1,8 @@
 from tabsdata.api.tabsdata_server import Collection, TabsdataServer
 from textual.validation import ValidationResult, Validator
 
-from tdconsole.textual_assets import textual_instance_config
+from tdconsole.core import instance_checks
+from tdconsole.core.catalog_cache import NameSet
 
 
 class ValidInstanceName(Validator):
@@ -11,12 +12,16 @@ class ValidInstanceName(Validator):
         self.instance = instance
 
     def validate(self, value: str) -> ValidationResult:
+        return self.check(value)
+
+    def check(self, value: str, snapshot=None) -> ValidationResult:
+        """validate(), optionally against an instance_checks.InstanceSnapshot."""
         if value == "":
             return self.success()
-        if (
-            textual_instance_config.name_in_use(app=self.app, selected_name=value)
-            == True
-        ):
+        in_use = instance_checks.name_in_use(
+            app=self.app, selected_name=value, snapshot=snapshot
+        )
+        if in_use == True:
             return self.failure(f"{value} is Already in Use. Please Try Another.")
 
         return self.success()
@@ -27,45 +32,65 @@ class ValidCollectionName(Validator):
         super().__init__(failure_description=failure_description)
         self.app = app
         self.server = server
+        # Used when the app has no catalog cache for this server.
+        self._names: NameSet | None = None
 
     def validate(self, value: str) -> ValidationResult:
         if value == "":
             return self.failure("Your Collection Name Cannot be Empty")
-        server: TabsdataServer = self.server
-        collections = server.list_collections()
-        collection_names = [i.name for i in collections]
-
-        if value in collection_names:
+        if self.collection_names().taken(value):
             return self.failure(f"The collection with name {value} already exists")
 
         return self.success()
 
+    def collection_names(self) -> NameSet:
+        cache = getattr(self.app, "catalog_cache", None)
+        if cache is not None and cache.server is self.server:
+            return cache.collection_names
+        if self._names is None:
+            server: TabsdataServer = self.server
+            self._names = NameSet(lambda: [i.name for i in server.list_collections()])
+        return self._names
+
 
 class ValidExtPort(Validator):
-    def __init__(self, app, instance, failure_description: str | None = None):
+    def __init__(
+        self,
+        app,
+        instance,
+        failure_description: str | None = None,
+        port_owner: str | None = None,
+    ):
         super().__init__(failure_description=failure_description)
         self.app = app
         self.instance = instance
+        # Ports this form reserved itself (see port_allocator) stay usable.
+        self.port_owner = port_owner
 
     def validate(self, value: int) -> ValidationResult:
+        return self.check(value)
+
+    def check(self, value, snapshot=None, ext_port=None) -> ValidationResult:
+        """
+        validate(), optionally against an instance_checks.InstanceSnapshot.
+        `ext_port` is the external port entered alongside this one, if any.
+        """
         if value == "":
             return self.success()
-        if textual_instance_config.validate_port(value) == False:
-            return self.failure(
-                f"{value} is not a valid port number. Please enter 1–65535."
-            )
-
-        in_use_by = textual_instance_config.port_in_use(
-            app=self.app, port=int(value), current_instance_name=self.instance.name
+        problem = instance_checks.port_problem(
+            value,
+            self.instance.name,
+            app=self.app,
+            external_port=self.external_port(ext_port),
+            snapshot=snapshot,
+            port_owner=self.port_owner,
         )
+        if problem is not None:
+            return self.failure(problem)
+        return self.success()
 
-        if in_use_by is not None:
-            return self.failure(
-                f"Port {value} is already in use by instance '{in_use_by}'. "
-                "Please choose a different port."
-            )
-        else:
-            return self.success()
+    def external_port(self, ext_port=None):
+        return None
 
 
 class PlaeholderValidator(Validator):
@@ -74,10 +99,5 @@ class PlaeholderValidator(Validator):
 
 
 class ValidIntPort(ValidExtPort):
-    def validate(self, value: int) -> ValidationResult:
-        if value == self.instance.arg_ext:
-            return self.failure(
-                "Internal port must not be the same as external port. "
-                "Please choose another port."
-            )
-        return super().validate(value)
+    def external_port(self, ext_port=None):
+        return ext_port or self.instance.arg_ext
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from tdconsole.core.find_instances import (
+    find_tabsdata_instance_names,
+    instance_name_to_instance,
+)
+from tdconsole.core.find_instances import (
+    sync_filesystem_instances_to_db as sync_filesystem_instances_to_db,
+)
+from tdconsole.core.port_allocator import PORT_ALLOCATOR
+
+
+def validate_port(port_str: str) -> bool:
+    """Return True if port_str is an integer between 1 and 65535."""
+    port_str = str(port_str)
+    if not port_str.isdigit():
+        return False
+    port = int(port_str)
+    return 1 <= port <= 65535
+
+
+@dataclass(frozen=True)
+class InstanceSnapshot:
+    """
+    Instance names, running ports and port reservations read once, so a
+    form can check all of its fields against the same state.
+    """
+
+    names: frozenset
+    running: tuple
+    # Port -> owner of every pair reserved by a flow (see port_allocator).
+    reserved: dict = field(default_factory=dict)
+
+
+def take_snapshot() -> InstanceSnapshot:
+    """
+    Read instance state straight from the filesystem. Unlike
+    sync_filesystem_instances_to_db it never touches the DB session, so it is
+    safe to call from a worker thread.
+    """
+    instances = [instance_name_to_instance(n) for n in find_tabsdata_instance_names()]
+    return InstanceSnapshot(
+        names=frozenset(i.name for i in instances),
+        running=tuple(running_ports(instances)),
+        reserved=PORT_ALLOCATOR.reserved_by_others(),
+    )
+
+
+def get_running_ports(
+    app=None, session=None, snapshot: Optional[InstanceSnapshot] = None
+) -> List[Dict[str, Any]]:
+    """
+    Python equivalent of get_running_ports() from bash.
+
+    Returns a list of dicts for running instances, each with:
+      name, status, external_port, internal_port
+    """
+    if snapshot is not None:
+        return list(snapshot.running)
+    return running_ports(sync_filesystem_instances_to_db(app=app, session=session))
+
+
+def running_ports(instances) -> List[Dict[str, Any]]:
+    running = []
+
+    for inst in instances:
+        status = inst.status
+        if status != "Running":
+            continue
+
+        name = inst.name
+        arg_ext = inst.arg_ext or ""
+        arg_int = inst.arg_int or ""
+
+        # Only keep if they look like valid ports; otherwise ignore
+        ext_port = int(arg_ext) if arg_ext.isdigit() else None
+        int_port = int(arg_int) if arg_int.isdigit() else None
+
+        running.append(
+            {
+                "name": name,
+                "status": status,
+                "external_port": ext_port,
+                "internal_port": int_port,
+            }
+        )
+
+    return running
+
+
+def port_in_use(
+    app=None,
+    port: int = 0,
+    current_instance_name: Optional[str] = None,
+    session=None,
+    snapshot: Optional[InstanceSnapshot] = None,
+) -> Optional[str]:
+    """
+    Return the instance name using this port, or None if free.
+    """
+    for inst in get_running_ports(app=app, session=session, snapshot=snapshot):
+        name = inst.get("name")
+        if current_instance_name and name == current_instance_name:
+            continue
+
+        ext_port = inst.get("external_port")
+        int_port = inst.get("internal_port")
+
+        if ext_port == port or int_port == port:
+            return name
+
+    return None
+
+
+def port_problem(
+    value,
+    instance_name: Optional[str] = None,
+    app=None,
+    session=None,
+    external_port=None,
+    snapshot: Optional[InstanceSnapshot] = None,
+    port_owner: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Why `value` can't be used as a port of `instance_name`, or None if it
+    can. Pass `external_port` when checking an internal port, and a
+    `snapshot` to check against it instead of syncing instances again.
+    Ports reserved by flows other than `port_owner` are taken too.
+    """
+    if not validate_port(value):
+        return f"{value} is not a valid port number. Please enter 1–65535."
+    if external_port is not None and str(value) == str(external_port):
+        return (
+            "Internal port must not be the same as external port. "
+            "Please choose another port."
+        )
+    in_use_by = port_in_use(
+        app=app,
+        port=int(value),
+        current_instance_name=instance_name,
+        session=session,
+        snapshot=snapshot,
+    )
+    if in_use_by is not None:
+        return (
+            f"Port {value} is already in use by instance '{in_use_by}'. "
+            "Please choose a different port."
+        )
+    if snapshot is not None:
+        reserved = snapshot.reserved
+    else:
+        reserved = PORT_ALLOCATOR.reserved_by_others()
+    owner = reserved.get(int(value))
+    if owner is not None and owner != port_owner:
+        return (
+            f"Port {value} is reserved for another instance being set up. "
+            "Please choose a different port."
+        )
+    return None
+
+
+def name_in_use(
+    app=None,
+    selected_name: str = "",
+    session=None,
+    snapshot: Optional[InstanceSnapshot] = None,
+) -> bool:
+    """
+    Return True if an instance already uses this name.
+    """
+    if snapshot is not None:
+        return selected_name in snapshot.names
+    for inst in sync_filesystem_instances_to_db(app=app, session=session):
+        name = inst.name
+        if selected_name == name:
+            return True
+    return False
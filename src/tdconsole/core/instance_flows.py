@@ -0,0 +1,167 @@
+"""
+Instance lifecycle flows as TaskSpec lists.
+
+The TUI task screens and the headless `tdconsole run` command both build
+their steps here, so a flow behaves the same whichever front end runs it.
+`runner` is anything with log_line / run_logged_subprocess / new (see
+instance_tasks).
+"""
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from tdconsole.core import instance_tasks
+from tdconsole.core.task_graph import TaskSpec
+
+
+def bind_and_start_tasks(runner, instance) -> list[TaskSpec]:
+    return [
+        TaskSpec(
+            "Preparing Instance",
+            partial(instance_tasks.prepare_instance, runner, instance),
+            timeout=instance_tasks.PREPARE_TIMEOUT,
+            name="prepare",
+        ),
+        TaskSpec(
+            "Binding Ports",
+            partial(instance_tasks.bind_ports, runner, instance),
+            name="bind",
+        ),
+        TaskSpec(
+            "Connecting to Tabsdata instance",
+            partial(instance_tasks.connect_tabsdata, runner, instance),
+            timeout=instance_tasks.START_TIMEOUT,
+            retry=instance_tasks.START_RETRY,
+            name="start",
+            weight=5,
+        ),
+        # Once the server is started, the readiness wait (then the login) and
+        # the status check run side by side.
+        TaskSpec(
+            "Waiting for Server",
+            partial(instance_tasks.wait_for_server, runner, instance),
+            name="ready",
+            depends_on=["start"],
+        ),
+        TaskSpec(
+            "Checking Server Status",
+            partial(instance_tasks.run_tdserver_status, runner, instance),
+            timeout=instance_tasks.STATUS_TIMEOUT,
+            name="status",
+            depends_on=["start"],
+        ),
+        TaskSpec(
+            "Logging you In",
+            partial(instance_tasks.tabsdata_login, runner, instance),
+            timeout=instance_tasks.LOGIN_TIMEOUT,
+            retry=instance_tasks.LOGIN_RETRY,
+            name="login",
+            depends_on=["ready"],
+            weight=2,
+        ),
+    ]
+
+
+def start_tasks(runner, instance) -> list[TaskSpec]:
+    return [
+        TaskSpec(
+            "Preparing Instance",
+            partial(instance_tasks.prepare_instance, runner, instance),
+            timeout=instance_tasks.PREPARE_TIMEOUT,
+            name="prepare",
+        ),
+        TaskSpec(
+            "Binding Ports",
+            partial(instance_tasks.bind_ports, runner, instance),
+            name="bind",
+        ),
+        TaskSpec(
+            "Connecting to Tabsdata instance",
+            partial(instance_tasks.connect_tabsdata, runner, instance),
+            timeout=instance_tasks.START_TIMEOUT,
+            retry=instance_tasks.START_RETRY,
+            name="start",
+            weight=5,
+        ),
+        TaskSpec(
+            "Waiting for Server",
+            partial(instance_tasks.wait_for_server, runner, instance),
+            name="ready",
+            depends_on=["start"],
+        ),
+        TaskSpec(
+            "Checking Server Status",
+            partial(instance_tasks.run_tdserver_status, runner, instance),
+            timeout=instance_tasks.STATUS_TIMEOUT,
+            name="status",
+            depends_on=["start"],
+        ),
+    ]
+
+
+def stop_tasks(runner, instance) -> list[TaskSpec]:
+    return [
+        TaskSpec(
+            "Preparing Instance",
+            partial(instance_tasks.prepare_instance, runner, instance),
+            timeout=instance_tasks.PREPARE_TIMEOUT,
+        ),
+        TaskSpec(
+            "Stopping Tabsdata instance",
+            partial(instance_tasks.stop_instance, runner, instance),
+            timeout=instance_tasks.STOP_TIMEOUT,
+        ),
+        TaskSpec(
+            "Checking Server Status",
+            partial(instance_tasks.run_tdserver_status, runner, instance),
+            timeout=instance_tasks.STATUS_TIMEOUT,
+        ),
+    ]
+
+
+def delete_tasks(runner, instance) -> list[TaskSpec]:
+    return [
+        TaskSpec(
+            "Preparing Instance",
+            partial(instance_tasks.prepare_instance, runner, instance),
+            timeout=instance_tasks.PREPARE_TIMEOUT,
+        ),
+        TaskSpec(
+            "Deleting Tabsdata instance",
+            partial(instance_tasks.delete_instance, runner, instance),
+            timeout=instance_tasks.STOP_TIMEOUT,
+        ),
+        TaskSpec(
+            "Checking Server Status",
+            partial(instance_tasks.run_tdserver_status, runner, instance),
+            timeout=instance_tasks.STATUS_TIMEOUT,
+        ),
+    ]
+
+
+@dataclass(frozen=True)
+class InstanceFlow:
+    # Also the flow name task timings are recorded under.
+    name: str
+    build: Callable[[object, object], list[TaskSpec]]
+    # Instance.working once the flow succeeded.
+    working: bool
+    # Whether the flow accepts new ports (and may create the instance).
+    configures_ports: bool = False
+
+
+FLOWS = {
+    "bind": InstanceFlow("BindAndStartInstance", bind_and_start_tasks, True, True),
+    "start": InstanceFlow("StartInstance", start_tasks, True, True),
+    "stop": InstanceFlow("StopInstance", stop_tasks, False),
+    "delete": InstanceFlow("DeleteInstance", delete_tasks, False),
+}
+
+
+def finish_flow(session, instance, working: bool):
+    """Persist the instance after a successful flow; returns the merged row."""
+    instance.working = working
+    merged = session.merge(instance)
+    session.commit()
+    return merged
@@ -1,7 +1,45 @@
 # tdconsole/core/tasks/instance_tasks.py
 
 from pathlib import Path
-from tdconsole.core.yaml_getter_setter import set_yaml_value
+from tdconsole.core.login_session import (
+    forget_login,
+    record_login,
+    reusable_login,
+    token_accepted,
+)
+from tdconsole.core.readiness import wait_until_ready
+from tdconsole.core.task_graph import TIMEOUT_EXIT_CODE, RetryPolicy
+from tdconsole.core.yaml_getter_setter import ConfigTransaction
+
+# Seconds before a hung CLI step is killed (see TaskSpec.timeout).
+PREPARE_TIMEOUT = 300
+START_TIMEOUT = 180
+STOP_TIMEOUT = 120
+LOGIN_TIMEOUT = 60
+STATUS_TIMEOUT = 60
+
+# Transient failures worth another attempt (see TaskSpec.retry).
+# A just-stopped server can hold on to its ports for a moment.
+START_RETRY = RetryPolicy(
+    max_attempts=3,
+    initial_delay=2.0,
+    retry_output=(r"(?i)address already in use", r"(?i)port \d+ .*in use"),
+)
+# A server that only just started may still refuse, drop or stall logins. The
+# patterns follow the wording of socket errors and HTTP status lines, so a
+# stray "503" or "timeout" elsewhere in the output doesn't trigger a retry;
+# a login cut off by LOGIN_TIMEOUT is retried by its exit code instead.
+LOGIN_RETRY = RetryPolicy(
+    max_attempts=4,
+    initial_delay=1.0,
+    retry_codes=frozenset({TIMEOUT_EXIT_CODE}),
+    retry_output=(
+        r"(?i)\bconnection (refused|reset by peer|aborted)\b",
+        r"(?i)\b(HTTP(/\d(\.\d)?)?|status( code)?:?) 50[234]\b",
+        r"(?i)\b50[234] (Bad Gateway|Service Unavailable|Gateway Time-?out)\b",
+        r"(?i)\b(connection|connect|read|operation|request) timed out\b",
+    ),
+)
 
 
 # ------------------------------------------------------------
@@ -28,6 +66,8 @@ async def delete_instance(runner, instance, label=None) -> int:
     runner.log_line(label, f"Deleting instance {instance.name}...")
     if instance.status == "Running":
         await stop_instance(runner, instance)
+    # Tokens of a deleted server must not be reused by a new one of that name.
+    forget_login(instance)
     code = await runner.run_logged_subprocess(
         label,
         "tdserver",
@@ -41,8 +81,15 @@ async def delete_instance(runner, instance, label=None) -> int:
 
 
 async def tabsdata_login(runner, instance, label=None) -> int:
-    """Login to a Tabsdata Instance"""
-    runner.log_line(label, f"Logging User into {instance.name}...")
+    """Login to a Tabsdata Instance, unless a valid session for it exists."""
+    reusable, reason = reusable_login(instance)
+    if reusable:
+        accepted, detail = await token_accepted(instance)
+        if accepted:
+            runner.log_line(label, f"Already logged into {instance.name} ({reason})")
+            return 0
+        reason = detail
+    runner.log_line(label, f"Logging User into {instance.name} ({reason})...")
     https_config = "https://" if instance.use_https is True else ""
     code = await runner.run_logged_subprocess(
         label,
@@ -57,6 +104,8 @@ async def tabsdata_login(runner, instance, label=None) -> int:
         "--password",
         "tabsdata",
     )
+    if code == 0:
+        record_login(instance)
     runner.log_line(label, f"Stop command exited with code {code}")
     return code
 
@@ -64,6 +113,7 @@ async def tabsdata_login(runner, instance, label=None) -> int:
 async def tabsdata_logout(runner, instance, label=None) -> int:
     """Login to a Tabsdata Instance"""
     runner.log_line(label, f"Logging User out of {instance.name}...")
+    forget_login()
     code = await runner.run_logged_subprocess(label, "td", "logout")
     runner.log_line(label, f"Logout command exited with code {code}")
     return code
@@ -72,6 +122,7 @@ async def tabsdata_logout(runner, instance, label=None) -> int:
 async def create_instance(runner, instance, label=None) -> int:
     """Create a new Tabsdata instance."""
     runner.log_line(label, f"Creating instance {instance.name}...")
+    forget_login(instance)
     code = await runner.run_logged_subprocess(
         label,
         "tdserver",
@@ -117,8 +168,11 @@ async def prepare_instance(runner, instance, label=None) -> int:
     elif runner.new["arg_ext"] == False and runner.new["arg_int"] == False:
         return await noop_instance(runner, instance, label)
     elif instance.status == "Running":
+        # Rebinding ports restarts the server; log in to it afresh.
+        forget_login(instance)
         return await stop_instance(runner, instance, label)
     else:
+        forget_login(instance)
         return await noop_instance(runner, instance, label)
 
 
@@ -127,7 +181,7 @@ async def prepare_instance(runner, instance, label=None) -> int:
 # ------------------------------------------------------------
 
 
-async def bind_ports(runner, instance, label=None) -> None:
+async def bind_ports(runner, instance, label=None) -> int:
     """Update instance config.yaml with external and internal ports."""
     config_path = (
         Path.home()
@@ -145,25 +199,24 @@ async def bind_ports(runner, instance, label=None) -> None:
 
     runner.log_line(label, f"Updating port config at {config_path}")
 
-    # external
+    # One read and one atomic write for both addresses.
+    tx = ConfigTransaction(config_path)
     if runner.new["arg_ext"] is True:
-        cfg_ext = set_yaml_value(
-            path=config_path,
-            key="addresses",
-            value=f"127.0.0.1:{instance.arg_ext}",
-            value_type="list",
-        )
-        runner.log_line(label, f"Set external port -> {cfg_ext}")
-
-    # internal
+        tx.set("addresses", f"127.0.0.1:{instance.arg_ext}", "list")
     if runner.new["arg_int"] is True:
-        cfg_int = set_yaml_value(
-            path=config_path,
-            key="internal_addresses",
-            value=f"127.0.0.1:{instance.arg_int}",
-            value_type="list",
-        )
-        runner.log_line(label, f"Set internal port -> {cfg_int}")
+        tx.set("internal_addresses", f"127.0.0.1:{instance.arg_int}", "list")
+    if not tx.edits:
+        runner.log_line(label, "Ports unchanged")
+        return 0
+
+    result = tx.commit()
+    for error in result.errors:
+        runner.log_line(label, f"Config error: {error}")
+    if not result.ok:
+        return 1
+    for key, value in result.changed.items():
+        runner.log_line(label, f"Set {key} -> {value}")
+    return 0
 
 
 # ------------------------------------------------------------
@@ -201,3 +254,29 @@ async def run_tdserver_status(runner, instance, label=None) -> int:
     runner.log_line(label, "Updating working instance record in the database...")
 
     return code
+
+
+async def wait_for_server(runner, instance, label=None) -> int:
+    """Wait until the instance's API answers on its external socket."""
+    host, port = instance.public_ip, int(instance.arg_ext)
+    runner.log_line(label, f"Waiting for Tabsdata server on {host}:{port}...")
+
+    def report(attempt, stage, detail):
+        if stage != "refused" or attempt % 10 == 0:
+            runner.log_line(label, f"Probe {attempt}: {stage} ({detail})")
+
+    result = await wait_until_ready(
+        host, port, use_https=bool(instance.use_https), on_attempt=report
+    )
+    if result.ready:
+        runner.log_line(
+            label,
+            f"Server ready after {result.elapsed:.2f}s ({result.attempts} probes)",
+        )
+        return 0
+    runner.log_line(
+        label,
+        f"Server not ready after {result.elapsed:.0f}s: "
+        f"{result.stage} ({result.detail})",
+    )
+    return 1
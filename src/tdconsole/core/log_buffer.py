@@ -0,0 +1,55 @@
+from collections import deque
+
+# Bytes read from a subprocess pipe per chunk.
+READ_CHUNK = 64 * 1024
+# Seconds between flushes of buffered lines to the log widget (~30 fps).
+FLUSH_INTERVAL = 1 / 30
+
+
+class LineCoalescer:
+    """
+    Buffers log lines between UI frames.
+
+    `split` turns raw pipe chunks into lines, carrying any trailing partial
+    line over per source. Lines queued with `push` wait until `drain` is
+    called once per frame. At most `max_pending` are kept; when output
+    outruns rendering the oldest are dropped and counted in `elided`, since
+    the log widget would scroll them away unseen anyway.
+    """
+
+    def __init__(self, max_pending: int = 1000) -> None:
+        self.max_pending = max_pending
+        self.pending: deque[str] = deque()
+        self.elided = 0
+        self.total_elided = 0
+        self.total_lines = 0
+        self._partials: dict[str | None, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def split(self, source: str | None, data: bytes, final: bool = False) -> list[str]:
+        """Complete lines in a raw chunk; `final` also returns a trailing partial."""
+        data = self._partials.pop(source, b"") + data
+        *lines, partial = data.split(b"\n")
+        if final and partial:
+            lines.append(partial)
+        elif partial:
+            self._partials[source] = partial
+        return [line.decode(errors="replace").rstrip("\r") for line in lines]
+
+    def push(self, line: str) -> None:
+        self.pending.append(line)
+        self.total_lines += 1
+        if len(self.pending) > self.max_pending:
+            self.pending.popleft()
+            self.elided += 1
+            self.total_elided += 1
+
+    def drain(self) -> tuple[list[str], int]:
+        """Return (queued lines, lines elided since the last drain) and reset."""
+        lines = list(self.pending)
+        elided = self.elided
+        self.pending.clear()
+        self.elided = 0
+        return lines, elided
@@ -0,0 +1,166 @@
+import os
+import re
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+
+from tdconsole.core.db import DEFAULT_DATA_DIR
+from tdconsole.core.find_instances import define_root
+
+# Lines kept in memory per tail; older ones are spilled to disk.
+DEFAULT_BUFFER_LINES = 5000
+# Bytes read from the log per chunk.
+CHUNK_BYTES = 256 * 1024
+# Where spilled lines live while a tail is open.
+SPILL_DIR = Path(DEFAULT_DATA_DIR) / "log_cache"
+
+LOG_PATTERNS = ("*.log", "*.log.*")
+
+
+def find_instance_logs(instance_name: str) -> list[Path]:
+    """Log files in an instance's workspace, most recently written first."""
+    root = define_root("instances", instance_name, "/workspace")
+    if root is None:
+        return []
+    logs = {p for pattern in LOG_PATTERNS for p in root.rglob(pattern) if p.is_file()}
+    return sorted(logs, key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+class FileLogSource:
+    """
+    Reads a log file in chunks from a byte offset, so only bytes written since
+    the last read are transferred. A file that shrank (rotated or truncated)
+    is read again from the start.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+
+    def read(self, offset: int, limit: int = CHUNK_BYTES) -> tuple[bytes, int]:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return b"", offset
+        if size < offset:
+            offset = 0
+        if size == offset:
+            return b"", offset
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(limit)
+        return data, offset + len(data)
+
+    def pending(self, offset: int) -> int:
+        """Bytes written past `offset` that haven't been read yet."""
+        try:
+            return max(0, os.path.getsize(self.path) - offset)
+        except OSError:
+            return 0
+
+
+class LogTail:
+    """
+    Incremental tail over a log source with a bounded in-memory ring buffer.
+
+    `poll` pulls new chunks and returns the complete lines they contain. Only
+    the newest `buffer_lines` lines stay in memory; older ones are appended
+    to an anonymous spill file so `search` can still reach them. The spill
+    file is removed when the tail is closed.
+    """
+
+    def __init__(
+        self,
+        source,
+        buffer_lines: int = DEFAULT_BUFFER_LINES,
+        spill_dir=SPILL_DIR,
+        offset: int = 0,
+    ) -> None:
+        self.source = source
+        self.buffer_lines = buffer_lines
+        self.offset = offset
+        self.lines: deque[str] = deque()
+        self.spilled = 0
+        self._partial = b""
+        self._lock = threading.Lock()
+        self.closed = False
+        Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self._spill = tempfile.TemporaryFile(dir=spill_dir)
+
+    @property
+    def total_lines(self) -> int:
+        return self.spilled + len(self.lines)
+
+    @property
+    def behind(self) -> int:
+        return self.source.pending(self.offset)
+
+    def poll(self, max_chunks: int = 8, chunk_bytes: int = CHUNK_BYTES) -> list[str]:
+        """Read up to `max_chunks` chunks and return the new complete lines."""
+        new_lines = []
+        for _ in range(max_chunks):
+            data, offset = self.source.read(self.offset, chunk_bytes)
+            if offset < self.offset:
+                # Source restarted from the top (rotation/truncation).
+                self._partial = b""
+            self.offset = offset
+            if not data:
+                break
+            data = self._partial + data
+            *complete, self._partial = data.split(b"\n")
+            new_lines.extend(
+                line.decode("utf-8", errors="replace").rstrip("\r") for line in complete
+            )
+        if new_lines:
+            self._append(new_lines)
+        return new_lines
+
+    def _append(self, new_lines: list[str]) -> None:
+        with self._lock:
+            # A poll still running in a worker when the tail was closed.
+            if self.closed:
+                return
+            self.lines.extend(new_lines)
+            overflow = len(self.lines) - self.buffer_lines
+            if overflow <= 0:
+                return
+            spilled = [self.lines.popleft() for _ in range(overflow)]
+            self._spill.seek(0, os.SEEK_END)
+            self._spill.write("\n".join(spilled).encode("utf-8") + b"\n")
+            self.spilled += overflow
+
+    def search(self, pattern: str, limit: int = 500) -> list[tuple[int, str]]:
+        """
+        Regex search over spilled and buffered lines, oldest first. Returns
+        up to `limit` (line number, line) pairs; raises re.error for a bad
+        pattern.
+        """
+        regex = re.compile(pattern)
+        matches = []
+        with self._lock:
+            if self.closed:
+                raise ValueError("search on a closed LogTail")
+            self._spill.flush()
+            self._spill.seek(0)
+            line_no = 0
+            for raw in self._spill:
+                line = raw.decode("utf-8", errors="replace").rstrip("\n")
+                if regex.search(line):
+                    matches.append((line_no, line))
+                    if len(matches) >= limit:
+                        return matches
+                line_no += 1
+            for line in self.lines:
+                if regex.search(line):
+                    matches.append((line_no, line))
+                    if len(matches) >= limit:
+                        return matches
+                line_no += 1
+        return matches
+
+    def close(self) -> None:
+        # Under the lock, so a poll or search in another thread never sees
+        # the spill file closed halfway through.
+        with self._lock:
+            self.closed = True
+            self._spill.close()
@@ -0,0 +1,201 @@
+import base64
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+from tdconsole.core.readiness import http_status
+
+CONNECTION_FILE = Path("~/.tabsdata/connection.json")
+# Which instance the saved session was made for, written after a `td login`
+# run by the console. connection.json alone only knows the server URL.
+SESSION_FILE = Path("~/.tabsdata/tdconsole_session.json")
+# Authenticated endpoint asked whether the saved token is still accepted.
+AUTH_INFO_PATH = os.environ.get("TDCONSOLE_AUTH_INFO_PATH", "/api/v1/auth/info")
+# Set to 0 to always run `td login` at the end of a flow.
+REUSE_LOGIN = os.environ.get("TDCONSOLE_REUSE_LOGIN", "1") != "0"
+# A token this close to expiry is treated as expired.
+EXPIRY_MARGIN = 60.0
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+def read_connection(path=CONNECTION_FILE) -> dict | None:
+    """The saved `td login` connection, or None if missing or unreadable."""
+    try:
+        with open(Path(path).expanduser()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def jwt_claims(token) -> dict | None:
+    """Decode a JWT's payload without verifying it (we only read `exp`)."""
+    if not isinstance(token, str) or token.count(".") != 2:
+        return None
+    payload = token.split(".")[1]
+    try:
+        raw = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        claims = json.loads(raw)
+    except ValueError:
+        return None
+    return claims if isinstance(claims, dict) else None
+
+
+def _as_epoch(value) -> float | None:
+    if isinstance(value, (int, float)):
+        # Some servers use milliseconds.
+        return value / 1000 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def access_token(connection: dict) -> tuple[str, float] | None:
+    """
+    The saved access token and its expiry (epoch seconds): the JWT in the
+    connection that expires first, whatever key `td login` stored it under
+    (a refresh token outlives it).
+    """
+    tokens = []
+    for value in connection.values():
+        claims = jwt_claims(value)
+        if claims is not None and "exp" in claims:
+            expiry = _as_epoch(claims["exp"])
+            if expiry is not None:
+                tokens.append((expiry, value))
+    if not tokens:
+        return None
+    expiry, token = min(tokens)
+    return token, expiry
+
+
+def token_expiry(connection: dict) -> float | None:
+    """Expiry (epoch seconds) of the saved access token, if it can be told."""
+    token = access_token(connection)
+    return None if token is None else token[1]
+
+
+def connection_stamp(path=CONNECTION_FILE) -> list[int] | None:
+    """(mtime_ns, size) of connection.json, to tell if it was rewritten."""
+    try:
+        stat = Path(path).expanduser().stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def record_login(instance, path=CONNECTION_FILE, session_path=SESSION_FILE) -> None:
+    """Note that the current connection.json is a login to `instance`."""
+    connection = read_connection(path)
+    stamp = connection_stamp(path)
+    if connection is None or stamp is None:
+        return
+    session = {"instance": instance.name, "url": connection.get("url"), "stamp": stamp}
+    try:
+        with open(Path(session_path).expanduser(), "w") as f:
+            json.dump(session, f)
+    except OSError:
+        pass
+
+
+def forget_login(instance=None, session_path=SESSION_FILE) -> None:
+    """
+    Drop the record of the console's login, so the next flow logs in again.
+    With `instance`, only if the record is for it (e.g. it was deleted or
+    is being re-created, so its tokens are dead).
+    """
+    if instance is not None:
+        session = read_connection(session_path)
+        if session is None or session.get("instance") != instance.name:
+            return
+    Path(session_path).expanduser().unlink(missing_ok=True)
+
+
+def targets_instance(url, instance) -> bool:
+    """Whether a saved server URL points at this instance's external socket."""
+    if not url:
+        return False
+    parsed = urlparse(url if "://" in url else f"http://{url}")
+    try:
+        port = parsed.port
+    except ValueError:
+        return False
+    if port is None or str(port) != str(instance.arg_ext):
+        return False
+    if (parsed.scheme == "https") != bool(instance.use_https):
+        return False
+    host = parsed.hostname or ""
+    public_ip = instance.public_ip or "127.0.0.1"
+    return host == public_ip or {host, public_ip} <= LOCAL_HOSTS
+
+
+def reusable_login(
+    instance,
+    path=CONNECTION_FILE,
+    session_path=SESSION_FILE,
+    now: float | None = None,
+) -> tuple[bool, str]:
+    """
+    Whether the saved `td login` session can be kept for `instance`: the
+    console logged into this very instance (by name, so a new instance on
+    the same port doesn't qualify), connection.json hasn't been rewritten
+    since, it still targets the instance's server and its token is valid for
+    at least EXPIRY_MARGIN more seconds. Returns (reusable, reason); any
+    doubt means logging in again.
+    """
+    if not REUSE_LOGIN:
+        return False, "session reuse disabled"
+    try:
+        connection = read_connection(path)
+        if connection is None:
+            return False, "no saved session"
+        session = read_connection(session_path)
+        if session is None:
+            return False, "saved session was not made by tdconsole"
+        if session.get("instance") != instance.name:
+            return False, f"saved session is for {session.get('instance')}"
+        if session.get("stamp") != connection_stamp(path):
+            return False, "saved session was replaced since the last login"
+        if not targets_instance(connection.get("url"), instance):
+            return False, f"saved session is for {connection.get('url')}"
+        expiry = token_expiry(connection)
+    except Exception as e:
+        return False, f"could not check the saved session: {e}"
+    if expiry is None:
+        return False, "saved session has no readable token expiry"
+    remaining = expiry - (time.time() if now is None else now)
+    if remaining <= EXPIRY_MARGIN:
+        return False, "saved session has expired"
+    return True, f"token valid for another {remaining / 60:.0f} min"
+
+
+async def token_accepted(
+    instance, path=CONNECTION_FILE, timeout: float = 2.0
+) -> tuple[bool, str]:
+    """
+    Ask the instance's server whether the saved access token is valid, with
+    one authenticated GET of AUTH_INFO_PATH. Only a 200 counts; anything
+    else (rejected, unreachable, no token) means logging in again.
+    """
+    connection = read_connection(path)
+    token = None if connection is None else access_token(connection)
+    if token is None:
+        return False, "no saved token"
+    status = await http_status(
+        instance.public_ip or "127.0.0.1",
+        int(instance.arg_ext),
+        AUTH_INFO_PATH,
+        use_https=bool(instance.use_https),
+        headers={"Authorization": f"Bearer {token[0]}"},
+        timeout=timeout,
+    )
+    if status != 200:
+        reason = "no answer" if status is None else f"HTTP {status}"
+        return False, f"server rejected the saved token ({reason})"
+    return True, "server accepted the saved token"
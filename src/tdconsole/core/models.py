@@ -1,4 +1,14 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base, relationship
@@ -91,6 +101,44 @@ class Table(Base):
     name = Column(String, nullable=True, primary_key=True)
 
 
+class TableSchema(Base):
+    """Last fetched schema of a table, cached so unchanged tables aren't refetched."""
+
+    __tablename__ = "table_schemas"
+
+    # "" when there is no working instance; a NULL key can't be looked up.
+    instance_name = Column(String, primary_key=True, nullable=False, default="")
+    collection_name = Column(String, primary_key=True)
+    table_name = Column(String, primary_key=True)
+    # Data version the listing carried when fetched, if it carried one.
+    table_version = Column(String, nullable=True)
+
+    columns = Column(Text, nullable=False)  # JSON list of {"name", "type"}
+    fetched_at = Column(DateTime, nullable=True)
+
+
+class TaskRun(Base):
+    """Timing of one step of one task-flow run."""
+
+    __tablename__ = "task_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String, nullable=False, index=True)
+    flow = Column(String, nullable=False)
+    step = Column(String, nullable=False)
+    instance_name = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+    exit_code = Column(Integer, nullable=True)
+    started_at = Column(DateTime, nullable=False)
+    wall_seconds = Column(Float, nullable=False)
+    cpu_seconds = Column(Float, nullable=True)  # child processes only
+
+    # historical_medians reads the latest runs of each step on each instance.
+    __table_args__ = (
+        Index("ix_task_runs_step_instance", "step", "instance_name", "started_at"),
+    )
+
+
 class ApiResponse(Base):
     __tablename__ = "api_responses"
 
@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from tdconsole.core.db import DEFAULT_DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: reservations are only guarded in-process.
+    fcntl = None
+
+# Where a new instance's ports are looked for first (tabsdata's defaults).
+DEFAULT_EXT_PORT = 2457
+# Below this only root can bind; used when nothing is free above the start.
+LOWEST_PORT = 1024
+HIGHEST_PORT = 65535
+# Seconds a reservation holds without its flow finishing.
+RESERVATION_TTL = 600.0
+RESERVATIONS_FILE = Path(DEFAULT_DATA_DIR) / "port_reservations.json"
+
+# Bits 1..65534: ports p whose pair partner p + 1 is still a valid port.
+_PAIR_STARTS = ((1 << HIGHEST_PORT) - 1) & ~1
+
+
+def instance_ports(instances) -> set[int]:
+    """Every port an instance is configured or running with."""
+    ports = set()
+    for inst in instances:
+        for value in (inst.arg_ext, inst.arg_int, inst.cfg_ext, inst.cfg_int):
+            value = str(value or "").rsplit(":", 1)[-1]
+            if value.isdigit() and 0 < int(value) <= HIGHEST_PORT:
+                ports.add(int(value))
+    return ports
+
+
+def listening_ports() -> set[int]:
+    """Ports with a listening TCP socket on this host (empty if not allowed)."""
+    try:
+        connections = psutil.net_connections(kind="tcp")
+    except (psutil.AccessDenied, OSError):
+        return set()
+    return {
+        c.laddr.port for c in connections if c.status == psutil.CONN_LISTEN and c.laddr
+    }
+
+
+def bitmap(ports) -> int:
+    """An int with bit p set for every port p."""
+    bits = 0
+    for port in ports:
+        bits |= 1 << port
+    return bits
+
+
+def first_free_pair(occupied: int, start: int = DEFAULT_EXT_PORT) -> int | None:
+    """
+    Lowest port p >= start with p and p + 1 both clear in `occupied`,
+    wrapping round to LOWEST_PORT. A few big-int operations, however many
+    ports are taken.
+    """
+    free = ~(occupied | (occupied >> 1)) & _PAIR_STARTS
+    for low in (start, LOWEST_PORT):
+        candidates = free & ~((1 << low) - 1)
+        if candidates:
+            return (candidates & -candidates).bit_length() - 1
+    return None
+
+
+class PortAllocator:
+    """
+    Suggests free (external, internal) port pairs and reserves them.
+
+    Occupied ports are the known instance ports passed in (from the DB),
+    sockets listening on the host and other flows' reservations. Reserving
+    happens under a file lock, so concurrent flows in this process or in
+    others (e.g. parallel `tdconsole run`) never get the same pair.
+    Reservations lapse after RESERVATION_TTL or when their process exits.
+    """
+
+    def __init__(self, path=RESERVATIONS_FILE, ttl: float = RESERVATION_TTL) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        now = time.time()
+        return {
+            port: entry
+            for port, entry in data.items()
+            if isinstance(entry, dict)
+            and entry.get("expires", 0) > now
+            and psutil.pid_exists(entry.get("pid", 0))
+        }
+
+    def _save(self, reservations: dict[str, dict]) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(reservations, f)
+        os.replace(tmp, self.path)
+
+    def _locked(self, update):
+        """Run update(reservations) -> result with the file locked; saves."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path.with_suffix(".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            reservations = self._load()
+            result = update(reservations)
+            self._save(reservations)
+            return result
+
+    def reserve_pair(
+        self, owner: str, known=(), start: int = DEFAULT_EXT_PORT
+    ) -> tuple[int, int] | None:
+        """
+        Reserve the next free (external, internal) pair for `owner`, giving
+        up any pair it held before. `known` are ports already taken by
+        instances. Returns None if the host has no free pair left.
+        """
+        listening = listening_ports()
+
+        def update(reservations: dict[str, dict]) -> tuple[int, int] | None:
+            for port in [p for p, e in reservations.items() if e.get("owner") == owner]:
+                del reservations[port]
+            occupied = bitmap(set(known) | listening | set(map(int, reservations)))
+            port = first_free_pair(occupied, start)
+            if port is None:
+                return None
+            entry = {
+                "owner": owner,
+                "pid": os.getpid(),
+                "expires": time.time() + self.ttl,
+            }
+            reservations[str(port)] = entry
+            reservations[str(port + 1)] = entry
+            return port, port + 1
+
+        return self._locked(update)
+
+    def reserved_by_others(self, owner: str | None = None) -> dict[int, str]:
+        """
+        Reserved ports, mapped to their owner, except those held by `owner`.
+        Read without the lock: reservations are replaced atomically.
+        """
+        return {
+            int(port): entry.get("owner")
+            for port, entry in self._load().items()
+            if entry.get("owner") != owner
+        }
+
+    def release(self, owner: str) -> None:
+        def update(reservations: dict[str, dict]) -> None:
+            for port in [p for p, e in reservations.items() if e.get("owner") == owner]:
+                del reservations[port]
+
+        try:
+            self._locked(update)
+        except OSError:
+            pass
+
+
+PORT_ALLOCATOR = PortAllocator()
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import signal
+
+# Seconds a child gets to exit after SIGTERM before it is SIGKILLed.
+TERMINATE_GRACE = float(os.environ.get("TDCONSOLE_TERMINATE_GRACE", "5"))
+
+
+def new_group_kwargs() -> dict:
+    """Subprocess kwargs that put the child in its own process group/session."""
+    if os.name == "posix":
+        return {"start_new_session": True}
+    return {"creationflags": 0x00000200}  # CREATE_NEW_PROCESS_GROUP
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig) -> None:
+    if os.name == "posix":
+        # start_new_session makes the child its own group leader.
+        os.killpg(process.pid, sig)
+    elif sig == signal.SIGTERM:
+        process.terminate()
+    else:
+        process.kill()
+
+
+async def terminate_process_group(
+    process: asyncio.subprocess.Process, grace: float = TERMINATE_GRACE
+) -> int | None:
+    """
+    SIGTERM the child's whole process group, wait up to `grace` seconds for
+    it to exit, then SIGKILL the group so no grandchildren outlive it.
+    Returns the child's exit code.
+    """
+    if process.returncode is None:
+        try:
+            _signal_group(process, signal.SIGTERM)
+            await asyncio.wait_for(process.wait(), grace)
+        except (ProcessLookupError, asyncio.TimeoutError):
+            pass
+    try:
+        _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+    except (ProcessLookupError, PermissionError):
+        pass
+    if process.returncode is None:
+        await process.wait()
+    return process.returncode
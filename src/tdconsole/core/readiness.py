@@ -0,0 +1,161 @@
+import asyncio
+import os
+import ssl
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+# Overall seconds to wait for a starting server to accept requests.
+DEFAULT_TIMEOUT = float(os.environ.get("TDCONSOLE_READY_TIMEOUT", "60"))
+# Path probed once the socket accepts connections. Any HTTP answer (including
+# 401/404) means the API server is handling requests, except the statuses a
+# proxy or a still-starting server returns.
+HEALTH_PATH = os.environ.get("TDCONSOLE_HEALTH_PATH", "/")
+NOT_READY_STATUSES = {502, 503, 504}
+
+
+@dataclass
+class Backoff:
+    """Delay between probes: starts at `initial`, grows by `factor` to `maximum`."""
+
+    initial: float = 0.05
+    maximum: float = 1.0
+    factor: float = 1.5
+
+    def delays(self):
+        delay = self.initial
+        while True:
+            yield delay
+            delay = min(self.maximum, delay * self.factor)
+
+
+@dataclass
+class Readiness:
+    ready: bool
+    elapsed: float
+    attempts: int
+    stage: str
+    detail: str = ""
+
+
+def _ssl_context(use_https: bool) -> ssl.SSLContext | None:
+    if not use_https:
+        return None
+    # Local instances use self-signed certificates; we only need liveness.
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _get_request(host: str, port: int, path: str, headers=None) -> bytes:
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+async def http_status(
+    host: str,
+    port: int,
+    path: str,
+    use_https: bool = False,
+    headers: dict | None = None,
+    timeout: float = 2.0,
+) -> int | None:
+    """Status code of one GET request, or None if there was no HTTP answer."""
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=_ssl_context(use_https)), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        writer.write(_get_request(host, port, path, headers))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+    parts = status_line.decode(errors="replace").split()
+    if len(parts) >= 2 and parts[0].startswith("HTTP/") and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+
+async def probe_http(
+    host: str,
+    port: int,
+    use_https: bool = False,
+    path: str = HEALTH_PATH,
+    timeout: float = 2.0,
+) -> tuple[str, str]:
+    """
+    One readiness probe. Returns (stage, detail) where stage is "refused"
+    (nothing listening), "socket" (listening but no usable HTTP answer yet)
+    or "http" (the API answered).
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=_ssl_context(use_https)), timeout
+        )
+    except (OSError, asyncio.TimeoutError) as e:
+        return "refused", str(e) or type(e).__name__
+
+    try:
+        writer.write(_get_request(host, port, path))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+    except (OSError, asyncio.TimeoutError) as e:
+        return "socket", str(e) or type(e).__name__
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    parts = status_line.decode(errors="replace").split()
+    if len(parts) >= 2 and parts[0].startswith("HTTP/") and parts[1].isdigit():
+        if int(parts[1]) not in NOT_READY_STATUSES:
+            return "http", f"HTTP {parts[1]}"
+        return "socket", f"HTTP {parts[1]}"
+    return "socket", "no HTTP response"
+
+
+async def wait_until_ready(
+    host: str,
+    port: int,
+    use_https: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    backoff: Backoff | None = None,
+    path: str = HEALTH_PATH,
+    on_attempt: Callable[[int, str, str], None] | None = None,
+) -> Readiness:
+    """
+    Poll the server's external socket and API until it answers HTTP, or
+    until `timeout` seconds pass. Returns as soon as the server is usable.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    attempts = 0
+    stage, detail = "refused", ""
+    for delay in (backoff or Backoff()).delays():
+        attempts += 1
+        remaining = deadline - time.perf_counter()
+        stage, detail = await probe_http(
+            host, port, use_https, path, timeout=max(0.1, min(2.0, remaining))
+        )
+        if on_attempt is not None:
+            on_attempt(attempts, stage, detail)
+        if stage == "http":
+            return Readiness(True, time.perf_counter() - start, attempts, stage, detail)
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(delay, remaining))
+    return Readiness(False, time.perf_counter() - start, attempts, stage, detail)
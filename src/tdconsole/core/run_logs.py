@@ -0,0 +1,228 @@
+import gzip
+import logging
+import mmap
+import os
+import re
+import shutil
+import threading
+from array import array
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from tdconsole.core.db import DEFAULT_DATA_DIR
+
+RUN_LOG_DIR = Path(DEFAULT_DATA_DIR) / "runs"
+# Decompressed copies of old runs opened in the viewer.
+REPLAY_CACHE_DIR = Path(DEFAULT_DATA_DIR) / "runs_cache"
+# A run's log rotates into a new segment after this many bytes...
+MAX_RUN_BYTES = 20 * 1024 * 1024
+# ...and keeps at most this many older (gzipped) segments.
+MAX_RUN_SEGMENTS = 5
+# Newest runs left uncompressed; older ones are gzipped.
+KEEP_PLAIN_RUNS = 3
+# Runs kept at all; older ones are deleted.
+MAX_RUNS = 50
+
+_SEGMENT = re.compile(r"^(?P<run>.+?)\.log(?:\.(?P<n>\d+))?(?P<gz>\.gz)?$")
+
+
+def _gzip_file(source: str, dest: str) -> None:
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _rotation_namer(name: str) -> str:
+    return name + ".gz"
+
+
+class RunLog:
+    """
+    Plain-text log of one task run, written through a RotatingFileHandler so a
+    runaway run can't fill the disk: segments past MAX_RUN_BYTES are rotated
+    out and gzipped.
+    """
+
+    def __init__(self, flow: str, log_dir=RUN_LOG_DIR) -> None:
+        log_dir = Path(log_dir)
+        # Pruning old runs can gzip large files; it runs elsewhere (see
+        # prune_runs), never here, since screens construct this on mount.
+        log_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "-", flow).strip("-") or "run"
+        self.run_id = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{slug}"
+        self.path = log_dir / f"{self.run_id}.log"
+
+        self.logger = logging.getLogger(f"tdconsole.runs.{self.run_id}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.handler = RotatingFileHandler(
+            self.path,
+            maxBytes=MAX_RUN_BYTES,
+            backupCount=MAX_RUN_SEGMENTS,
+            encoding="utf-8",
+        )
+        self.handler.namer = _rotation_namer
+        self.handler.rotator = _gzip_file
+        self.handler.setFormatter(
+            logging.Formatter("%(asctime)s %(message)s", "%H:%M:%S")
+        )
+        self.logger.addHandler(self.handler)
+
+    def write(self, task: str | None, msg: str) -> None:
+        if self.handler is None:
+            return
+        self.logger.info(f"[{task}] {msg}" if task else msg)
+
+    def close(self) -> None:
+        if self.handler is None:
+            return
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+        self.handler = None
+        logging.Logger.manager.loggerDict.pop(self.logger.name, None)
+
+
+def list_runs(log_dir=RUN_LOG_DIR) -> list[dict]:
+    """
+    Runs on disk, newest first, as dicts with run id, segment files (oldest
+    first), total bytes and whether any segment is compressed.
+    """
+    runs: dict[str, list[tuple[int, Path]]] = {}
+    log_dir = Path(log_dir)
+    if not log_dir.exists():
+        return []
+    for path in log_dir.iterdir():
+        match = _SEGMENT.match(path.name)
+        if match is None:
+            continue
+        # Segment .N is older the higher N is; the live segment is 0.
+        runs.setdefault(match["run"], []).append((int(match["n"] or 0), path))
+
+    result = []
+    for run_id, segments in runs.items():
+        files = [p for _, p in sorted(segments, key=lambda s: -s[0])]
+        result.append(
+            {
+                "run_id": run_id,
+                "files": files,
+                "bytes": sum(p.stat().st_size for p in files),
+                "compressed": any(p.suffix == ".gz" for p in files),
+                "mtime": max(p.stat().st_mtime for p in files),
+            }
+        )
+    return sorted(result, key=lambda r: r["run_id"], reverse=True)
+
+
+def prune_runs(log_dir=RUN_LOG_DIR, cache_dir=REPLAY_CACHE_DIR) -> None:
+    """
+    Gzip runs older than the newest KEEP_PLAIN_RUNS, delete past MAX_RUNS
+    along with their replay copies, and drop replay copies of runs that are
+    gone. Slow with big logs: the app runs it in a worker thread at startup
+    and `tdconsole run` after its flow.
+    """
+    kept = set()
+    for i, run in enumerate(list_runs(log_dir)):
+        if i >= MAX_RUNS:
+            for path in run["files"]:
+                path.unlink(missing_ok=True)
+            continue
+        kept.add(run["run_id"])
+        if i >= KEEP_PLAIN_RUNS:
+            for path in run["files"]:
+                if path.suffix != ".gz":
+                    _gzip_file(str(path), str(path) + ".gz")
+
+    cache_dir = Path(cache_dir)
+    if cache_dir.exists():
+        for path in cache_dir.glob("*.log"):
+            if path.stem not in kept:
+                path.unlink(missing_ok=True)
+
+
+def replay_file(run: dict, cache_dir=REPLAY_CACHE_DIR) -> Path:
+    """
+    A single plain file holding the whole run, so it can be memory-mapped.
+    Uncompressed single-segment runs are used in place; others are
+    decompressed and joined once into the replay cache.
+    """
+    files = run["files"]
+    if len(files) == 1 and files[0].suffix != ".gz":
+        return files[0]
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    target = cache_dir / f"{run['run_id']}.log"
+    if target.exists() and target.stat().st_mtime >= run["mtime"]:
+        return target
+    tmp = target.with_suffix(".tmp")
+    with open(tmp, "wb") as out:
+        for path in files:
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rb") as f:
+                shutil.copyfileobj(f, out)
+    os.replace(tmp, target)
+    return target
+
+
+class LineIndex:
+    """
+    Memory-mapped reader with a lazily built line-offset index. Only the lines
+    asked for are indexed, so the first page of a huge log is available
+    immediately; `ensure()` with no limit finishes the index.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        )
+        self.size = size
+        self.offsets = array("Q", [0]) if size else array("Q")
+        self.complete = size == 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Lines indexed so far (all of them once `complete`)."""
+        return len(self.offsets)
+
+    def ensure(self, lines: int | None = None, batch: int = 10_000) -> int:
+        """Index until `lines` lines are known (or the end); returns the count."""
+        # Work in batches so readers aren't blocked behind a full index build.
+        while True:
+            with self._lock:
+                mm = self._mm
+                for _ in range(batch):
+                    if self.complete or mm is None:
+                        return len(self.offsets)
+                    if lines is not None and len(self.offsets) >= lines:
+                        return len(self.offsets)
+                    nl = mm.find(b"\n", self.offsets[-1])
+                    if nl == -1 or nl + 1 >= self.size:
+                        self.complete = True
+                        break
+                    self.offsets.append(nl + 1)
+
+    def lines(self, start: int, count: int) -> list[str]:
+        self.ensure(start + count + 1)
+        out = []
+        with self._lock:
+            if self._mm is None:
+                return out
+            for i in range(start, min(start + count, len(self.offsets))):
+                begin = self.offsets[i]
+                end = (
+                    self.offsets[i + 1] - 1 if i + 1 < len(self.offsets) else self.size
+                )
+                out.append(
+                    self._mm[begin:end].decode("utf-8", errors="replace").rstrip("\r\n")
+                )
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            self._file.close()
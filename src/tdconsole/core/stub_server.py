@@ -0,0 +1,316 @@
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+class StubServerError(Exception):
+    """Raised by StubTabsdataServer when an injected failure fires."""
+
+
+@dataclass
+class StubCollection:
+    name: str
+    description: str = ""
+
+
+@dataclass
+class StubFunction:
+    name: str
+    collection: StubCollection
+    description: str = ""
+
+
+@dataclass
+class StubTable:
+    name: str
+    collection: StubCollection
+    function: str | None = None
+    version: str = "1"
+
+
+@dataclass
+class StubRun:
+    """An execution or transaction started by trigger_function."""
+
+    id: str
+    name: str
+    triggered_on: int
+    duration: float
+    failed: bool = False
+
+    @property
+    def ended_on(self) -> int | None:
+        end = self.triggered_on + int(self.duration * 1000)
+        return end if end <= time.time() * 1000 else None
+
+    @property
+    def started_on(self) -> int:
+        return self.triggered_on
+
+    @property
+    def status(self) -> str:
+        if self.ended_on is None:
+            return "Running"
+        return "Failed" if self.failed else "Finished"
+
+
+@dataclass
+class StubCatalog:
+    """Synthetic collections/functions/tables held entirely in memory."""
+
+    collections: dict[str, StubCollection] = field(default_factory=dict)
+    functions: dict[str, list[StubFunction]] = field(default_factory=dict)
+    tables: dict[str, list[StubTable]] = field(default_factory=dict)
+
+    @classmethod
+    def generate(
+        cls,
+        collections: int = 100,
+        functions_per_collection: int = 5,
+        tables_per_collection: int = 5,
+    ) -> "StubCatalog":
+        catalog = cls()
+        width = len(str(max(collections, 1)))
+        for c in range(collections):
+            name = f"collection_{c:0{width}d}"
+            catalog.add_collection(name)
+            coll = catalog.collections[name]
+            catalog.functions[name] = [
+                StubFunction(f"function_{f}", coll)
+                for f in range(functions_per_collection)
+            ]
+            catalog.tables[name] = [
+                StubTable(
+                    f"table_{t}",
+                    coll,
+                    f"function_{t % max(1, functions_per_collection)}",
+                )
+                for t in range(tables_per_collection)
+            ]
+        return catalog
+
+    def add_collection(self, name: str, description: str = "") -> StubCollection:
+        coll = StubCollection(name, description)
+        self.collections[name] = coll
+        self.functions.setdefault(name, [])
+        self.tables.setdefault(name, [])
+        return coll
+
+
+class StubTabsdataServer:
+    """
+    In-process stand-in for TabsdataServer used to benchmark the console at
+    catalog scale without a real deployment.
+
+    `latency` is either a number of seconds applied to every call or a dict of
+    method name -> seconds (with an optional "default" key). `error_rate` is
+    the probability (0-1) that any call raises StubServerError.
+    """
+
+    def __init__(
+        self,
+        collections: int = 100,
+        functions_per_collection: int = 5,
+        tables_per_collection: int = 5,
+        latency: float | dict[str, float] = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        catalog: StubCatalog | None = None,
+        rows_per_table: int = 1_000_000,
+        columns_per_table: int = 20,
+        run_seconds: float = 5.0,
+    ) -> None:
+        self.catalog = catalog or StubCatalog.generate(
+            collections, functions_per_collection, tables_per_collection
+        )
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rows_per_table = rows_per_table
+        self.columns_per_table = columns_per_table
+        self.run_seconds = run_seconds
+        self.executions: list[StubRun] = []
+        self.transactions: list[StubRun] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: dict[str, int] = {}
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "StubTabsdataServer":
+        """
+        Build a stub from a "key=value,key=value" string, e.g.
+        "collections=5000,latency_ms=20,error_rate=0.01".
+        """
+        kwargs = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            key, sep, value = part.partition("=")
+            key = key.strip()
+            if not sep:
+                raise ValueError(f"Stub server option {key!r} needs a value")
+            if key == "latency_ms":
+                kwargs["latency"] = _option(key, value, float) / 1000
+            elif key == "jitter_ms":
+                kwargs["jitter"] = _option(key, value, float) / 1000
+            elif key in ("latency", "jitter", "error_rate", "run_seconds"):
+                kwargs[key] = _option(key, value, float)
+            elif key in (
+                "collections",
+                "functions_per_collection",
+                "tables_per_collection",
+                "rows_per_table",
+                "columns_per_table",
+                "seed",
+            ):
+                kwargs[key] = _option(key, value, int)
+            else:
+                raise ValueError(f"Unknown stub server option {key!r}")
+        return cls(**kwargs)
+
+    # ------------------------------------------------------------
+    # Fault and latency injection
+    # ------------------------------------------------------------
+
+    def _call(self, method: str) -> None:
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            roll = self._random.random()
+            jitter = self._random.uniform(-self.jitter, self.jitter)
+
+        if isinstance(self.latency, dict):
+            delay = self.latency.get(method, self.latency.get("default", 0.0))
+        else:
+            delay = self.latency
+        delay = max(0.0, delay + jitter)
+        if delay:
+            time.sleep(delay)
+
+        if roll < self.error_rate:
+            raise StubServerError(f"Injected failure in {method}")
+
+    def _collection(self, name: str) -> StubCollection:
+        try:
+            return self.catalog.collections[name]
+        except KeyError:
+            raise StubServerError(f"Collection {name!r} not found") from None
+
+    # ------------------------------------------------------------
+    # TabsdataServer surface used by the console
+    # ------------------------------------------------------------
+
+    def auth_info(self) -> dict:
+        self._call("auth_info")
+        return {"user": "admin", "role": "sys_admin"}
+
+    def list_collections(self) -> list[StubCollection]:
+        self._call("list_collections")
+        return list(self.catalog.collections.values())
+
+    def list_functions(self, collection_name: str) -> list[StubFunction]:
+        self._call("list_functions")
+        self._collection(collection_name)
+        return list(self.catalog.functions[collection_name])
+
+    def list_tables(self, collection_name: str) -> list[StubTable]:
+        self._call("list_tables")
+        self._collection(collection_name)
+        return list(self.catalog.tables[collection_name])
+
+    def create_collection(self, name: str, description: str = "") -> StubCollection:
+        self._call("create_collection")
+        if name in self.catalog.collections:
+            raise StubServerError(f"Collection {name!r} already exists")
+        return self.catalog.add_collection(name, description)
+
+    def delete_collection(self, name: str) -> None:
+        self._call("delete_collection")
+        self._collection(name)
+        del self.catalog.collections[name]
+        self.catalog.functions.pop(name, None)
+        self.catalog.tables.pop(name, None)
+
+    def delete_function(self, collection_name: str, function_name: str) -> None:
+        self._call("delete_function")
+        self._collection(collection_name)
+        self.catalog.functions[collection_name] = [
+            f
+            for f in self.catalog.functions[collection_name]
+            if f.name != function_name
+        ]
+
+    def trigger_function(self, collection_name: str, function_name: str) -> None:
+        self._call("trigger_function")
+        self._collection(collection_name)
+        with self._lock:
+            n = len(self.executions)
+            now = int(time.time() * 1000)
+            failed = self._random.random() < self.error_rate
+            name = f"{collection_name}/{function_name}"
+            self.executions.append(
+                StubRun(f"exe_{n:06d}", name, now, self.run_seconds, failed)
+            )
+            self.transactions.append(
+                StubRun(f"trx_{n:06d}", name, now, self.run_seconds, failed)
+            )
+
+    @staticmethod
+    def _since(runs: list[StubRun], filter: str | None) -> list[StubRun]:
+        # Understands the "triggered_on:ge:<millis>" filter the monitor sends.
+        if not filter:
+            return list(runs)
+        field_name, op, value = filter.split(":", 2)
+        if field_name != "triggered_on" or op != "ge":
+            raise StubServerError(f"Unsupported filter {filter!r}")
+        return [r for r in runs if r.triggered_on >= int(value)]
+
+    def list_executions(self, filter: str | None = None) -> list[StubRun]:
+        self._call("list_executions")
+        return self._since(self.executions, filter)
+
+    def list_transactions(self, filter: str | None = None) -> list[StubRun]:
+        self._call("list_transactions")
+        return self._since(self.transactions, filter)
+
+    def get_table_schema(self, collection_name: str, table_name: str) -> list[dict]:
+        self._call("get_table_schema")
+        self._collection(collection_name)
+        return [
+            {"name": f"col_{c:04d}", "type": "Int64"}
+            for c in range(self.columns_per_table)
+        ]
+
+    def get_table_sample(
+        self, collection_name: str, table_name: str, offset: int = 0, len: int = 100
+    ):
+        """Synthetic rows [offset, offset + len) of a rows_per_table-row table."""
+        import polars as pl
+
+        self._call("get_table_sample")
+        self._collection(collection_name)
+        stop = min(offset + len, self.rows_per_table)
+        rows = range(offset, max(offset, stop))
+        return pl.DataFrame(
+            {
+                f"col_{c:04d}": [r * self.columns_per_table + c for r in rows]
+                for c in range(self.columns_per_table)
+            }
+        )
+
+
+def _option(key: str, value: str, kind):
+    try:
+        return kind(value)
+    except ValueError:
+        raise ValueError(
+            f"Bad value {value!r} for stub server option {key!r}"
+        ) from None
+
+
+def stub_server_from_env() -> StubTabsdataServer | None:
+    """Return a stub server when TDCONSOLE_STUB_SERVER is set, else None."""
+    spec = os.environ.get("TDCONSOLE_STUB_SERVER")
+    if spec is None:
+        return None
+    return StubTabsdataServer.from_spec(spec)
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+# Rows fetched per request from the table sample endpoint.
+DEFAULT_PAGE_ROWS = 500
+# Upper bound on the bytes of sample pages kept in memory at once.
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+def frame_size(frame) -> int:
+    """Bytes held by a Polars/Arrow frame (0 if it can't tell)."""
+    for attr in ("estimated_size", "nbytes", "get_total_buffer_size"):
+        size = getattr(frame, attr, None)
+        if size is None:
+            continue
+        try:
+            return int(size() if callable(size) else size)
+        except Exception:
+            continue
+    return 0
+
+
+class SamplePager:
+    """
+    Fetches bounded row windows of a table and keeps them as frames in an LRU
+    bounded by `memory_budget` bytes. The page being viewed is never evicted,
+    so a single oversized page still renders.
+
+    `fetch(offset, length)` must return a frame with `.height` (Polars) or
+    `.num_rows` (Arrow).
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int], object],
+        page_rows: int = DEFAULT_PAGE_ROWS,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        self.fetch = fetch
+        self.page_rows = page_rows
+        self.memory_budget = memory_budget
+        self.last_page: int | None = None
+        self.current_page: int | None = None
+        self._pages: OrderedDict[int, object] = OrderedDict()
+        self._sizes: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._inflight: dict[int, threading.Event] = {}
+
+    @property
+    def cached_pages(self) -> list[int]:
+        with self._lock:
+            return list(self._pages)
+
+    @property
+    def cached_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def is_past_end(self, page_no: int) -> bool:
+        return self.last_page is not None and page_no > self.last_page
+
+    def page(self, page_no: int, pin: bool = True):
+        """
+        Return page `page_no`, fetching it if needed. Blocks, so call it off the
+        UI thread. With `pin`, the page becomes the one protected from eviction.
+        """
+        if pin:
+            self.current_page = page_no
+        while True:
+            with self._lock:
+                if page_no in self._pages:
+                    self._pages.move_to_end(page_no)
+                    return self._pages[page_no]
+                waiter = self._inflight.get(page_no)
+                if waiter is None:
+                    waiter = self._inflight[page_no] = threading.Event()
+                    break
+            # Another thread (usually the prefetcher) is already fetching it.
+            waiter.wait()
+
+        try:
+            frame = self.fetch(page_no * self.page_rows, self.page_rows)
+            rows = getattr(frame, "height", None)
+            if rows is None:
+                rows = getattr(frame, "num_rows", 0)
+            with self._lock:
+                if rows < self.page_rows:
+                    self.last_page = page_no
+                self._pages[page_no] = frame
+                self._sizes[page_no] = frame_size(frame)
+                self._evict()
+            return frame
+        finally:
+            with self._lock:
+                self._inflight.pop(page_no).set()
+
+    def prefetch(self, page_no: int) -> None:
+        """Warm `page_no` unless it is cached, known to be past the end, or negative."""
+        if page_no < 0 or self.is_past_end(page_no):
+            return
+        with self._lock:
+            if page_no in self._pages or page_no in self._inflight:
+                return
+        self.page(page_no, pin=False)
+
+    def _evict(self) -> None:
+        while sum(self._sizes.values()) > self.memory_budget and len(self._pages) > 1:
+            victim = next((p for p in self._pages if p != self.current_page), None)
+            if victim is None:
+                return
+            del self._pages[victim]
+            del self._sizes[victim]
@@ -0,0 +1,95 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from tdconsole.core.models import TableSchema
+
+
+def normalize_schema(raw) -> list[dict]:
+    """
+    Flatten whatever the server returned for a schema into a list of
+    {"name": ..., "type": ...} dicts, in column order.
+    """
+    if raw is None:
+        return []
+    if isinstance(raw, dict):
+        for key in ("columns", "fields", "schema"):
+            if key in raw:
+                return normalize_schema(raw[key])
+        return [{"name": str(k), "type": str(v)} for k, v in raw.items()]
+    if hasattr(raw, "items") and callable(raw.items):
+        # Polars Schema / OrderedDict-like mappings of name -> dtype.
+        return [{"name": str(k), "type": str(v)} for k, v in raw.items()]
+
+    columns = []
+    for col in raw:
+        if isinstance(col, dict):
+            name = col.get("name", col.get("column"))
+            dtype = col.get("type", col.get("dtype", col.get("data_type")))
+        elif isinstance(col, (tuple, list)) and len(col) == 2:
+            name, dtype = col
+        else:
+            name = getattr(col, "name", col)
+            dtype = getattr(col, "type", getattr(col, "dtype", None))
+        columns.append({"name": str(name), "type": "" if dtype is None else str(dtype)})
+    return columns
+
+
+def _key(instance_name, collection, table) -> tuple:
+    return (
+        instance_name or "",
+        getattr(collection, "name", collection),
+        getattr(table, "name", table),
+    )
+
+
+def cached_schema(
+    session: Session, instance_name, collection, table, version=None
+) -> list[dict] | None:
+    """
+    Return the stored schema of a table, or None on a miss. When the listing
+    carries a data version, a schema stored for another version is a miss.
+    """
+    row = session.get(TableSchema, _key(instance_name, collection, table))
+    if row is None:
+        return None
+    if version is not None and row.table_version != version:
+        return None
+    return json.loads(row.columns)
+
+
+def store_schema(
+    session: Session, instance_name, collection, table, version, columns: list[dict]
+) -> None:
+    """Save a fetched schema, replacing the one stored for the table."""
+    instance_name, collection_name, table_name = _key(instance_name, collection, table)
+    session.merge(
+        TableSchema(
+            instance_name=instance_name,
+            collection_name=collection_name,
+            table_name=table_name,
+            table_version=version,
+            columns=json.dumps(columns),
+            fetched_at=datetime.now(),
+        )
+    )
+    session.commit()
+
+
+def invalidate_schemas(session: Session, instance_name, collection=None) -> int:
+    """
+    Drop the stored schemas of an instance (or of one of its collections),
+    e.g. once a trigger or commit may have changed them. Returns how many.
+    """
+    query = delete(TableSchema).where(
+        TableSchema.instance_name == (instance_name or "")
+    )
+    if collection is not None:
+        query = query.where(
+            TableSchema.collection_name == getattr(collection, "name", collection)
+        )
+    result = session.execute(query)
+    session.commit()
+    return result.rowcount
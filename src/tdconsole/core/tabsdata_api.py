@@ -1,23 +1,43 @@
+from rich.markup import escape
 from sqlalchemy.orm import Session
 from tabsdata.api.tabsdata_server import TabsdataServer
 
+from tdconsole.core.api_metrics import InstrumentedServer, timed_call
 from tdconsole.core.models import Collection, Function, Instance, Table
+from tdconsole.core.stub_server import stub_server_from_env
 
 
 def initialize_tabsdata_server_connection(app):
+    # A bad stub spec is a setup mistake, not a connection failure: report it
+    # before anything else, with or without a working instance.
+    try:
+        stub = stub_server_from_env()
+    except ValueError as e:
+        app.notify(
+            f"❌ Invalid TDCONSOLE_STUB_SERVER: {escape(str(e))}", severity="error"
+        )
+        return None
+    # The stub stands in for any server, so it needs no instance at all.
+    if stub is not None:
+        return InstrumentedServer(stub)
     instance = app.working_instance
+    if instance is None:
+        return None
+    socket = instance.ext_socket
+    username = "admin"
+    password = "tabsdata"
+    role = "sys_admin"
     try:
-        if instance is not None:
-            socket = instance.ext_socket
-            username = "admin"
-            password = "tabsdata"
-            role = "sys_admin"
-            server = TabsdataServer(socket, username, password, role)
-            return server
-        else:
-            return None
-    except:
+        server = timed_call("connect", TabsdataServer, socket, username, password, role)
+    except Exception as e:
+        # A stopped instance can't be reached; only a running one is news.
+        if instance.status == "Running":
+            app.notify(
+                f"❌ Could not connect to {instance.name}: {escape(str(e))}",
+                severity="error",
+            )
         return None
+    return InstrumentedServer(server)
 
 
 def pull_all_collections(app):
@@ -41,6 +61,41 @@ def pull_tables_from_collection(app, collection):
     return tables
 
 
+def pull_table_sample(app, collection, table, offset: int, length: int):
+    """Fetch rows [offset, offset + length) of a table as a Polars frame."""
+    server = app.tabsdata_server
+    server: TabsdataServer
+    return server.get_table_sample(
+        getattr(collection, "name", collection),
+        getattr(table, "name", table),
+        offset=offset,
+        len=length,
+    )
+
+
+def pull_table_schema(app, collection, table):
+    """Fetch the schema of a table as returned by the server."""
+    server = app.tabsdata_server
+    server: TabsdataServer
+    return server.get_table_schema(
+        getattr(collection, "name", collection), getattr(table, "name", table)
+    )
+
+
+def table_version(table) -> str | None:
+    """
+    Identifier of the current data version of a listed table, or None when
+    the listing doesn't carry one (the table's id is not a version: it stays
+    the same across commits). A cached schema stored for another version is
+    refetched; without one the cache relies on invalidation.
+    """
+    for attr in ("version", "data_version", "last_data_version"):
+        value = getattr(table, attr, None)
+        if value is not None:
+            return str(value)
+    return None
+
+
 def check_server_status(app, server: TabsdataServer = None):
     if not server:
         server = app.tabsdata_server
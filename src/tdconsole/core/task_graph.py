@@ -0,0 +1,264 @@
+import asyncio
+import os
+import re
+import time
+from datetime import datetime
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Iterable
+
+# Exit code of an attempt cut off by its TaskSpec.timeout (as timeout(1)).
+TIMEOUT_EXIT_CODE = 124
+# Upper bound on tasks of one flow running at the same time.
+DEFAULT_CONCURRENCY = int(os.environ.get("TDCONSOLE_TASK_CONCURRENCY", "4"))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When a failed task is run again. A failure is retried while attempts
+    remain if its exit code is in `retry_codes` or a line of its output
+    matches one of `retry_output`; with neither set, any failure is retried.
+    Attempts are `initial_delay` apart, growing by `factor` to `max_delay`.
+    """
+
+    max_attempts: int = 3
+    initial_delay: float = 1.0
+    factor: float = 2.0
+    max_delay: float = 10.0
+    retry_codes: frozenset[int] | None = None
+    retry_output: tuple[str, ...] = ()
+    _patterns: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Compiled once per policy (which is frozen), not per failed attempt.
+        patterns = tuple(re.compile(p) for p in self.retry_output)
+        object.__setattr__(self, "_patterns", patterns)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (from 1)."""
+        return min(self.max_delay, self.initial_delay * self.factor ** (attempt - 1))
+
+    def should_retry(self, attempt: int, code: int | None, output=()) -> bool:
+        if code in (0, None) or attempt >= self.max_attempts:
+            return False
+        if self.retry_codes is None and not self.retry_output:
+            return True
+        if self.retry_codes is not None and code in self.retry_codes:
+            return True
+        return any(p.search(line) for line in output for p in self._patterns)
+
+
+@dataclass
+class TaskSpec:
+    """
+    One step of a task flow.
+
+    `name` identifies the task for `depends_on` (it defaults to the
+    description). With `depends_on=None` a task depends on the task listed
+    before it, so plain lists keep running in order; `background=True` tasks
+    default to no dependencies instead. `weight` is the expected duration used
+    for the critical path before real timings are known. A task still running
+    after `timeout` seconds is cancelled and counts as failed. A `retry`
+    policy reruns transient failures before they fail the task.
+    """
+
+    description: str
+    func: Callable[[str | None], Awaitable[int | None]]
+    background: bool = False
+    name: str | None = None
+    depends_on: Iterable[str] | None = None
+    weight: float = 1.0
+    timeout: float | None = None
+    retry: RetryPolicy | None = None
+
+    def __post_init__(self) -> None:
+        if self.name is None:
+            self.name = self.description
+        if self.depends_on is not None:
+            self.depends_on = tuple(self.depends_on)
+
+
+class TaskStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class TaskResult:
+    task: TaskSpec
+    status: TaskStatus = TaskStatus.PENDING
+    code: int | None = None
+    started: float | None = None
+    started_at: datetime | None = None
+    elapsed: float | None = None
+    blocked_by: str | None = None
+
+
+@dataclass
+class TaskGraph:
+    """Dependency graph over a flow's TaskSpecs."""
+
+    tasks: list[TaskSpec]
+    deps: dict[str, tuple[str, ...]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.deps = {}
+        names = [t.name for t in self.tasks]
+        if len(set(names)) != len(names):
+            raise ValueError("Task names must be unique within a flow")
+        previous = None
+        for task in self.tasks:
+            if task.depends_on is not None:
+                deps = task.depends_on
+            elif task.background or previous is None:
+                deps = ()
+            else:
+                deps = (previous,)
+            unknown = [d for d in deps if d not in names]
+            if unknown:
+                raise ValueError(f"Task {task.name!r} depends on unknown {unknown}")
+            self.deps[task.name] = deps
+            if not task.background:
+                previous = task.name
+        self.order()
+
+    def by_name(self, name: str) -> TaskSpec:
+        return next(t for t in self.tasks if t.name == name)
+
+    def dependents(self, name: str) -> list[str]:
+        """Every task that directly or transitively depends on `name`."""
+        found, frontier = [], [name]
+        while frontier:
+            current = frontier.pop()
+            for task, deps in self.deps.items():
+                if current in deps and task not in found:
+                    found.append(task)
+                    frontier.append(task)
+        return found
+
+    def order(self) -> list[str]:
+        """Topological order (stable w.r.t. declaration order)."""
+        done: list[str] = []
+        remaining = [t.name for t in self.tasks]
+        while remaining:
+            ready = [n for n in remaining if all(d in done for d in self.deps[n])]
+            if not ready:
+                raise ValueError(f"Dependency cycle between {remaining}")
+            done.extend(ready)
+            remaining = [n for n in remaining if n not in ready]
+        return done
+
+    def critical_path(
+        self, durations: dict[str, float] | None = None
+    ) -> tuple[list[str], float]:
+        """
+        Longest chain of dependent tasks, by `durations` (falling back to each
+        task's weight). Returns (names, total duration).
+        """
+        durations = durations or {}
+        finish: dict[str, float] = {}
+        via: dict[str, str | None] = {}
+        for name in self.order():
+            cost = durations.get(name, self.by_name(name).weight)
+            start, parent = 0.0, None
+            for dep in self.deps[name]:
+                if finish[dep] > start:
+                    start, parent = finish[dep], dep
+            finish[name] = start + cost
+            via[name] = parent
+        if not finish:
+            return [], 0.0
+        end = max(finish, key=finish.get)
+        path = [end]
+        while via[path[-1]] is not None:
+            path.append(via[path[-1]])
+        return path[::-1], finish[end]
+
+    async def run(
+        self,
+        run_one: Callable[[TaskSpec], Awaitable[int | None]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        on_update: Callable[[TaskResult], None] | None = None,
+    ) -> dict[str, TaskResult]:
+        """
+        Run every task once its dependencies succeeded, with at most
+        `concurrency` running at once. A failed task (non-zero code or an
+        exception) skips its dependents; unrelated tasks keep going.
+        """
+        results = {t.name: TaskResult(t) for t in self.tasks}
+        running: dict[asyncio.Task, str] = {}
+
+        def notify(result: TaskResult) -> None:
+            if on_update is not None:
+                on_update(result)
+
+        def ready() -> list[str]:
+            return [
+                name
+                for name in self.order()
+                if results[name].status == TaskStatus.PENDING
+                and all(
+                    results[d].status == TaskStatus.SUCCEEDED for d in self.deps[name]
+                )
+            ]
+
+        async def execute(task: TaskSpec) -> int | None:
+            try:
+                return await run_one(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                return 1
+
+        try:
+            while True:
+                for name in ready():
+                    if len(running) >= max(1, concurrency):
+                        break
+                    result = results[name]
+                    result.status = TaskStatus.RUNNING
+                    result.started = time.perf_counter()
+                    result.started_at = datetime.now()
+                    notify(result)
+                    running[asyncio.create_task(execute(result.task))] = name
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in finished:
+                    result = results[running.pop(future)]
+                    result.elapsed = time.perf_counter() - result.started
+                    result.code = future.result()
+                    if result.code in (0, None):
+                        result.status = TaskStatus.SUCCEEDED
+                        notify(result)
+                        continue
+                    result.status = TaskStatus.FAILED
+                    notify(result)
+                    for name in self.dependents(result.task.name):
+                        skipped = results[name]
+                        if skipped.status == TaskStatus.PENDING:
+                            skipped.status = TaskStatus.SKIPPED
+                            skipped.blocked_by = result.task.name
+                            notify(skipped)
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                # Let cancelled tasks run their cleanup (e.g. killing children).
+                await asyncio.gather(*running, return_exceptions=True)
+            for name in running.values():
+                results[name].status = TaskStatus.CANCELLED
+                notify(results[name])
+            for result in results.values():
+                if result.status == TaskStatus.PENDING:
+                    result.status = TaskStatus.CANCELLED
+                    notify(result)
+        return results
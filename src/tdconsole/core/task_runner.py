@@ -0,0 +1,116 @@
+import asyncio
+from collections import deque
+from typing import Callable
+
+from tdconsole.core.log_buffer import READ_CHUNK
+from tdconsole.core.process_control import new_group_kwargs, terminate_process_group
+from tdconsole.core.task_graph import TIMEOUT_EXIT_CODE, TaskSpec
+from tdconsole.core.task_timing import CPU_SAMPLE_INTERVAL, ProcessTreeCpu
+from tdconsole.core.warm_exec import WARM_EXECUTOR, WarmExecUnavailable
+
+# Output lines of an attempt kept for matching RetryPolicy.retry_output.
+RETRY_SCAN_LINES = 200
+
+LogLine = Callable[[str | None, str], None]
+
+
+async def run_process(
+    args, on_output: Callable[[bytes], None]
+) -> tuple[int, float | None]:
+    """
+    Run a command, feeding its combined stdout/stderr to `on_output` in
+    chunks (an empty chunk is never sent). td/tdserver go through the warm
+    fork server when it can run them. Returns the exit code and the CPU
+    seconds the child used; cancelling kills its whole process group.
+    """
+    if WARM_EXECUTOR.handles(args):
+        try:
+            return await WARM_EXECUTOR.run(args, on_output)
+        except WarmExecUnavailable:
+            # Nothing ran; the executor is now disabled, use a subprocess.
+            pass
+
+    # Own process group, so a cancel/timeout also takes down its children.
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        **new_group_kwargs(),
+    )
+    cpu = ProcessTreeCpu(process.pid)
+
+    async def sample_cpu() -> None:
+        # Quiet children (tdserver start) print nothing for long stretches.
+        while True:
+            cpu.sample()
+            await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+
+    sampler = asyncio.create_task(sample_cpu())
+    try:
+        while chunk := await process.stdout.read(READ_CHUNK):
+            on_output(chunk)
+        cpu.sample()
+        return await process.wait(), cpu.total
+    except asyncio.CancelledError:
+        await terminate_process_group(process)
+        raise
+    finally:
+        sampler.cancel()
+
+
+async def run_attempt(task: TaskSpec, log_line: LogLine) -> int | None:
+    """One attempt at a task; exceptions and timeouts become exit codes."""
+    log_line(task.description, "Starting")
+    deadline = asyncio.timeout(task.timeout)
+    try:
+        async with deadline:
+            # allow task.func to return either None or an int
+            result = await task.func(task.description)
+        code = result if isinstance(result, int) else None
+        log_line(task.description, "Finished")
+    except TimeoutError as e:
+        if not deadline.expired():
+            # Raised by the step itself (a socket or HTTP timeout), not the
+            # step's deadline: an ordinary failure.
+            log_line(task.description, f"Error: {e!r}")
+            return 1
+        log_line(task.description, f"Timed out after {task.timeout}s")
+        code = TIMEOUT_EXIT_CODE
+    except asyncio.CancelledError:
+        log_line(task.description, "Cancelled")
+        raise
+    except Exception as e:
+        log_line(task.description, f"Error: {e!r}")
+        code = 1  # treat exception as failure
+    return code
+
+
+async def run_task(
+    task: TaskSpec,
+    log_line: LogLine,
+    recent_output: dict[str, deque],
+    on_retry: Callable[[int, int], None] | None = None,
+) -> int | None:
+    """
+    Run a task, retrying it as its RetryPolicy allows. `recent_output` gets
+    a fresh deque under the task's description for each attempt; the runner
+    appends the attempt's output lines to it for the policy's patterns.
+    """
+    policy = task.retry
+    attempt = 1
+    while True:
+        recent_output[task.description] = deque(maxlen=RETRY_SCAN_LINES)
+        code = await run_attempt(task, log_line)
+        output = recent_output[task.description]
+        if policy is None or not policy.should_retry(attempt, code, output):
+            return code
+        delay = policy.delay(attempt)
+        attempt += 1
+        log_line(
+            task.description,
+            f"Failed with code {code}; retrying in {delay:g}s "
+            f"(attempt {attempt}/{policy.max_attempts})",
+        )
+        if on_retry is not None:
+            on_retry(attempt, policy.max_attempts)
+        await asyncio.sleep(delay)
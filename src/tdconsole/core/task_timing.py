@@ -0,0 +1,175 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+
+import psutil
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from tdconsole.core.db import DEFAULT_DATA_DIR
+from tdconsole.core.models import TaskRun
+from tdconsole.core.task_graph import TaskResult, TaskStatus
+
+# Recent successful runs of a step that its ETA is the median of.
+HISTORY_RUNS = 20
+# Seconds between CPU readings of a running subprocess tree.
+CPU_SAMPLE_INTERVAL = 0.2
+
+
+class ProcessTreeCpu:
+    """
+    User + system CPU of a process and every descendant seen while it runs.
+    asyncio reaps the child the moment it exits, so its final figure can't
+    be read afterwards: `sample()` it periodically and each process keeps
+    its last reading. Descendants that live less than one sample interval
+    are missed, so the total is a lower bound.
+    """
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.readings: dict[int, float] = {}
+
+    def sample(self) -> None:
+        try:
+            root = psutil.Process(self.pid)
+            tree = [root, *root.children(recursive=True)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        for process in tree:
+            try:
+                times = process.cpu_times()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            # Own time only: a reaped child's time is already its own reading.
+            self.readings[process.pid] = times.user + times.system
+
+    @property
+    def total(self) -> float | None:
+        return sum(self.readings.values()) if self.readings else None
+
+
+def record_results(
+    session: Session,
+    run_id: str,
+    flow: str,
+    instance_name: str | None,
+    results: dict[str, TaskResult],
+    cpu_seconds: dict[str, float] | None = None,
+    step_instances: dict[str, str] | None = None,
+) -> list[TaskRun]:
+    """
+    Store one row per step that actually ran; skipped steps are left out.
+    `step_instances` names the instance of steps that don't run against
+    `instance_name`, such as each step of a fleet operation.
+    """
+    cpu_seconds = cpu_seconds or {}
+    step_instances = step_instances or {}
+    rows = []
+    for name, result in results.items():
+        if result.elapsed is None or result.started_at is None:
+            continue
+        rows.append(
+            TaskRun(
+                run_id=run_id,
+                flow=flow,
+                step=name,
+                instance_name=step_instances.get(name, instance_name),
+                status=result.status.value,
+                exit_code=result.code,
+                started_at=result.started_at,
+                wall_seconds=result.elapsed,
+                cpu_seconds=cpu_seconds.get(result.task.description),
+            )
+        )
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def historical_medians(
+    session: Session,
+    flow: str,
+    instance_name: str | None,
+    limit: int = HISTORY_RUNS,
+) -> dict[str, float]:
+    """
+    Median wall time of each step of `flow` over its last `limit` successful
+    runs on this instance. Steps never run here fall back to all instances.
+    """
+    # Rank runs newest first both per (step, instance) and per step, so only
+    # the rows that can make either median are read back.
+    newest = TaskRun.started_at.desc()
+    ranked = (
+        select(
+            TaskRun.step,
+            TaskRun.instance_name,
+            TaskRun.wall_seconds,
+            func.row_number()
+            .over(partition_by=(TaskRun.step, TaskRun.instance_name), order_by=newest)
+            .label("local_rank"),
+            func.row_number()
+            .over(partition_by=TaskRun.step, order_by=newest)
+            .label("any_rank"),
+        )
+        .where(
+            TaskRun.flow == flow,
+            TaskRun.status == TaskStatus.SUCCEEDED.value,
+        )
+        .subquery()
+    )
+    rows = session.execute(
+        select(ranked).where(
+            or_(
+                and_(
+                    ranked.c.instance_name == instance_name,
+                    ranked.c.local_rank <= limit,
+                ),
+                ranked.c.any_rank <= limit,
+            )
+        )
+    ).all()
+
+    local: dict[str, list[float]] = {}
+    anywhere: dict[str, list[float]] = {}
+    for step, instance, seconds, local_rank, any_rank in rows:
+        if instance == instance_name and local_rank <= limit:
+            local.setdefault(step, []).append(seconds)
+        if any_rank <= limit:
+            anywhere.setdefault(step, []).append(seconds)
+    merged = {**anywhere, **{k: v for k, v in local.items() if v}}
+    return {step: median(values) for step, values in merged.items() if values}
+
+
+def export_timings(
+    session: Session, path: str | Path | None = None, since: datetime | None = None
+) -> Path:
+    """Write every recorded step timing (optionally since `since`) as JSON."""
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = DEFAULT_DATA_DIR / "diagnostics" / f"task_timings-{stamp}.json"
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    query = select(TaskRun).order_by(TaskRun.started_at)
+    if since is not None:
+        query = query.where(TaskRun.started_at >= since)
+    runs = [
+        {
+            "run_id": row.run_id,
+            "flow": row.flow,
+            "step": row.step,
+            "instance": row.instance_name,
+            "status": row.status,
+            "exit_code": row.exit_code,
+            "started_at": row.started_at.isoformat(),
+            "wall_seconds": round(row.wall_seconds, 3),
+            "cpu_seconds": (
+                None if row.cpu_seconds is None else round(row.cpu_seconds, 3)
+            ),
+        }
+        for row in session.scalars(query)
+    ]
+    payload = {"exported_at": datetime.now().isoformat(), "runs": runs}
+    path.write_text(json.dumps(payload, indent=2))
+    return path
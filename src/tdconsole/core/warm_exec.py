@@ -0,0 +1,404 @@
+"""
+Fork server for td/tdserver commands.
+
+    python -m tdconsole.core.warm_exec SOCKET MODULE...
+
+imports the console scripts' modules once, then forks a child per request
+received on the Unix socket. A request carries the entry point, argv, cwd
+and environment plus (via SCM_RIGHTS) the pipe the child writes its
+stdout/stderr to; the server answers with the child's pid and, once it
+exits, its exit code and CPU seconds. WarmExecutor starts the server and talks to it.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import selectors
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import traceback
+from importlib import import_module
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Callable
+
+from tdconsole.core.log_buffer import READ_CHUNK
+from tdconsole.core.process_control import TERMINATE_GRACE
+
+# Set to 0 to always spawn td/tdserver as fresh processes.
+WARM_ENABLED = os.environ.get("TDCONSOLE_WARM_EXEC", "1") != "0"
+WARM_COMMANDS = ("td", "tdserver")
+# `tdserver start` leaves a server running; it must not be a child of the
+# fork server, so it keeps going through a plain subprocess.
+COLD_COMMANDS = {("tdserver", "start")}
+# Seconds to wait for the fork server to import everything and listen.
+STARTUP_TIMEOUT = 60.0
+
+
+class WarmExecUnavailable(RuntimeError):
+    """The fork server can't run a command; run it as a plain subprocess."""
+
+
+def resolve_entry_point(command: str) -> str | None:
+    """The "module:attr" console script behind `command`, if installed."""
+    for ep in entry_points(group="console_scripts", name=command):
+        return ep.value
+    return None
+
+
+def _load(target: str) -> Callable:
+    module, _, attr = target.partition(":")
+    obj = import_module(module.strip())
+    for part in attr.strip().split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _run_child(request: dict, output_fd: int) -> None:
+    """In the forked child: become the console script, then exit."""
+    os.setsid()
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.dup2(output_fd, 1)
+    os.dup2(output_fd, 2)
+    os.close(null)
+    os.close(output_fd)
+    code = 1
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.argv = list(request["argv"])
+        result = _load(request["target"])()
+        code = result if isinstance(result, int) else 0
+    except SystemExit as e:
+        code = _exit_code(e)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (AttributeError, OSError, ValueError):
+                pass
+        os._exit(code & 0xFF)
+
+
+def serve(path: str, modules: list[str]) -> None:
+    """Fork server loop; exits when the parent closes our stdin."""
+    for module in modules:
+        try:
+            import_module(module)
+        except Exception:
+            traceback.print_exc()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ, "accept")
+    selector.register(wake_r, selectors.EVENT_READ, "reap")
+    selector.register(sys.stdin, selectors.EVENT_READ, "parent")
+    children: dict[int, socket.socket] = {}
+    print("ready", flush=True)
+
+    while True:
+        for key, _ in selector.select():
+            if key.data == "parent":
+                # Parent closed stdin (or died): leave running children be.
+                listener.close()
+                os.unlink(path)
+                return
+            if key.data == "reap":
+                os.read(wake_r, 4096)
+                while children:
+                    try:
+                        pid, status, usage = os.wait4(-1, os.WNOHANG)
+                    except ChildProcessError:
+                        break
+                    if pid == 0:
+                        break
+                    conn = children.pop(pid, None)
+                    if conn is not None:
+                        code = os.waitstatus_to_exitcode(status)
+                        cpu = usage.ru_utime + usage.ru_stime
+                        try:
+                            conn.sendall(f"exit {code} {cpu}\n".encode())
+                        except OSError:
+                            pass
+                        conn.close()
+                continue
+
+            conn, _ = listener.accept()
+            # The pipe travels with the first bytes: "<length>\n<json>".
+            data, fds, _, _ = socket.recv_fds(conn, 65536, 1)
+            size, _, message = data.partition(b"\n")
+            while len(message) < int(size):
+                message += conn.recv(65536)
+            request = json.loads(message)
+            pid = os.fork()
+            if pid == 0:
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                selector.close()
+                listener.close()
+                os.close(wake_r)
+                os.close(wake_w)
+                for other in children.values():
+                    other.close()
+                conn.close()
+                _run_child(request, fds[0])
+            os.close(fds[0])
+            conn.sendall(f"pid {pid}\n".encode())
+            children[pid] = conn
+
+
+class WarmExecutor:
+    """
+    Runs td/tdserver console scripts in processes forked from a server that
+    has already imported them, instead of starting (and importing tabsdata
+    in) a cold interpreter for every flow step.
+    """
+
+    def __init__(self, commands=WARM_COMMANDS) -> None:
+        self.commands = tuple(commands)
+        self.targets: dict[str, str] | None = None
+        self.server: subprocess.Popen | None = None
+        self.socket_dir: str | None = None
+        self.socket_path: str | None = None
+        # Set once the server failed to start or died; everything then goes
+        # through plain subprocesses instead of waiting on it again.
+        self.failed = False
+        self._atexit_registered = False
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> dict[str, str]:
+        if self.targets is None:
+            targets = {}
+            for command in self.commands:
+                target = resolve_entry_point(command)
+                if target is not None:
+                    targets[command] = target
+            self.targets = targets
+        return self.targets
+
+    @property
+    def available(self) -> bool:
+        return (
+            WARM_ENABLED
+            and not self.failed
+            and os.name == "posix"
+            and bool(self._resolve())
+        )
+
+    def handles(self, args) -> bool:
+        args = tuple(args)
+        return (
+            bool(args)
+            and args[:2] not in COLD_COMMANDS
+            and self.available
+            and args[0] in self._resolve()
+        )
+
+    def warm_up(self) -> bool:
+        """
+        Start the fork server (blocking) unless it is already running.
+        Returns False, and disables the executor, if it can't be started.
+        """
+        with self._lock:
+            if self.failed:
+                return False
+            if self.server is not None and self.server.poll() is None:
+                return True
+            self._stop_server()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+            try:
+                self.socket_dir = tempfile.mkdtemp(prefix="tdconsole-")
+                self.socket_path = str(Path(self.socket_dir) / "warm.sock")
+                modules = [
+                    t.partition(":")[0].strip() for t in self._resolve().values()
+                ]
+                self.server = subprocess.Popen(
+                    [sys.executable, "-m", __name__, self.socket_path, *modules],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+                ready = threading.Timer(STARTUP_TIMEOUT, self.server.kill)
+                ready.start()
+                try:
+                    line = self.server.stdout.readline()
+                finally:
+                    ready.cancel()
+            except OSError:
+                line = b""
+            if line.strip() != b"ready":
+                self.failed = True
+                self._stop_server()
+                return False
+            return True
+
+    def disable(self) -> None:
+        """Stop using the fork server for the rest of the session."""
+        with self._lock:
+            self.failed = True
+            self._stop_server()
+
+    def _stop_server(self) -> None:
+        if self.server is not None:
+            for pipe in (self.server.stdin, self.server.stdout):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+            if self.server.poll() is None:
+                self.server.kill()
+            self.server.wait()
+            self.server = None
+        if self.socket_dir is not None:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+            self.socket_dir = self.socket_path = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self.server is not None:
+                # EOF on stdin tells the server to exit on its own.
+                self.server.stdin.close()
+                self.server.stdout.close()
+                self.server.wait()
+                self.server = None
+            self._stop_server()
+
+    def _submit(self, args, output_fd: int) -> socket.socket:
+        if not self.warm_up():
+            raise WarmExecUnavailable("td fork server failed to start")
+        request = json.dumps(
+            {
+                "target": self._resolve()[args[0]],
+                "argv": list(args),
+                "cwd": os.getcwd(),
+                "env": dict(os.environ),
+            }
+        ).encode()
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.connect(self.socket_path)
+            socket.send_fds(conn, [f"{len(request)}\n".encode() + request], [output_fd])
+        except OSError:
+            conn.close()
+            raise
+        return conn
+
+    async def _start(self, args, output_fd: int):
+        """Hand `args` to the server; returns (replies, writer, child pid)."""
+        conn = await asyncio.to_thread(self._submit, args, output_fd)
+        conn.setblocking(False)
+        replies, writer = await asyncio.open_unix_connection(sock=conn)
+        reply = (await replies.readline()).split()
+        if len(reply) != 2 or reply[0] != b"pid":
+            writer.close()
+            raise WarmExecUnavailable("td fork server did not start the command")
+        return replies, writer, int(reply[1])
+
+    async def run(
+        self, args, on_output: Callable[[bytes], None]
+    ) -> tuple[int, float | None]:
+        """
+        Run `args` (e.g. ["td", "login", ...]) in a warm child, feeding its
+        combined stdout/stderr to `on_output`. Returns the exit code and the
+        child's CPU seconds. Cancelling terminates its process group.
+
+        Raises WarmExecUnavailable, before anything ran, when the server
+        can't take the command; the executor is then disabled.
+        """
+        read_fd, write_fd = os.pipe()
+        start = asyncio.ensure_future(self._start(args, write_fd))
+        try:
+            replies, writer, pid = await asyncio.shield(start)
+        except asyncio.CancelledError:
+            # The submit thread can't be interrupted: let it finish, then
+            # kill whatever it started instead of orphaning it.
+            try:
+                replies, writer, pid = await start
+            except (OSError, ValueError, WarmExecUnavailable):
+                pass
+            else:
+                await _terminate_group(pid, replies)
+                writer.close()
+            os.close(read_fd)
+            raise
+        except (OSError, ValueError, WarmExecUnavailable) as e:
+            os.close(read_fd)
+            self.disable()
+            raise WarmExecUnavailable(str(e)) from e
+        finally:
+            os.close(write_fd)
+
+        loop = asyncio.get_running_loop()
+        output = asyncio.StreamReader(limit=READ_CHUNK)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(output), os.fdopen(read_fd, "rb")
+        )
+        try:
+            while chunk := await output.read(READ_CHUNK):
+                on_output(chunk)
+            exit_line = await replies.readline()
+        except asyncio.CancelledError:
+            await _terminate_group(pid, replies)
+            raise
+        finally:
+            transport.close()
+            writer.close()
+        # No exit line means the server went away before reaping the child.
+        if not exit_line:
+            self.disable()
+            return 1, None
+        _, code, cpu = exit_line.split()
+        return int(code), float(cpu)
+
+
+def _signal_group(pid: int, sig) -> None:
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _terminate_group(pid: int, replies: asyncio.StreamReader) -> None:
+    """SIGTERM the child's group, then SIGKILL it after TERMINATE_GRACE."""
+    _signal_group(pid, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(replies.readline(), TERMINATE_GRACE)
+    except (asyncio.TimeoutError, OSError):
+        pass
+    _signal_group(pid, signal.SIGKILL)
+
+
+WARM_EXECUTOR = WarmExecutor()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1], sys.argv[2:])
@@ -1,5 +1,9 @@
 #!/home/tabsdata/tabsdata-env/bin/python
-import yaml, os, argparse, sys
+import yaml, os, argparse, sys, tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+VALUE_TYPES = ("str", "list")
 
 
 def get_yaml_value(path, key):
@@ -12,19 +16,176 @@ def get_yaml_value(path, key):
         return None
 
 
-def set_yaml_value(path, key, value, value_type):
+@dataclass
+class ConfigError:
+    """Why an edit (or, with key=None, the whole transaction) failed."""
+
+    key: str | None
+    message: str
+
+    def __str__(self) -> str:
+        return self.message if self.key is None else f"{self.key}: {self.message}"
+
+
+@dataclass
+class ConfigResult:
+    path: Path
+    # key -> its value after the edits, in the order they were made.
+    changed: dict = field(default_factory=dict)
+    errors: list[ConfigError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def atomic_dump(path, data) -> None:
+    """
+    Write `data` as YAML next to `path`, fsync it and rename it over `path`,
+    so a crash leaves either the old file or the new one, never half of it.
+    """
+    path = Path(path)
+    text = yaml.safe_dump(data, sort_keys=False)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
     try:
-        with open(path) as f:
-            data = yaml.safe_load(f) or {}
-        if value_type == "str":
-            data[key] = value
-        elif value_type == "list":
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    # Make the rename itself durable.
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class ConfigTransaction:
+    """
+    A batch of edits to one YAML config, read once and written once:
+
+        with ConfigTransaction(path) as tx:
+            tx.set("addresses", "127.0.0.1:2457", "list")
+            tx.set("internal_addresses", "127.0.0.1:2458", "list")
+        tx.result.ok
+
+    Nothing is written unless every edit applies; existing keys keep their
+    order and new keys go at the end. Problems come back as ConfigErrors on
+    the ConfigResult rather than as exceptions.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = Path(path) if path is not None else None
+        self.edits: list[tuple[str, str, object, str | None]] = []
+        self.result: ConfigResult | None = None
+
+    def set(self, key: str, value, value_type: str = "str") -> "ConfigTransaction":
+        self.edits.append(("set", key, value, value_type))
+        return self
+
+    def append(self, key: str, value) -> "ConfigTransaction":
+        self.edits.append(("append", key, value, None))
+        return self
+
+    def __enter__(self) -> "ConfigTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+    def _load(self, result: ConfigResult) -> dict | None:
+        if self.path is None:
+            result.errors.append(ConfigError(None, "config file not found"))
+            return None
+        try:
+            with open(self.path) as f:
+                data = yaml.safe_load(f)
+        except OSError as e:
+            result.errors.append(ConfigError(None, f"cannot read {self.path}: {e}"))
+            return None
+        except yaml.YAMLError as e:
+            result.errors.append(ConfigError(None, f"invalid YAML in {self.path}: {e}"))
+            return None
+        if data is None:
+            return {}
+        if not isinstance(data, dict):
+            result.errors.append(ConfigError(None, f"{self.path} is not a mapping"))
+            return None
+        return data
+
+    def _apply(self, data: dict, op, key, value, value_type) -> ConfigError | None:
+        if not isinstance(key, str) or not key:
+            return ConfigError(None, f"invalid key {key!r}")
+        if op == "set":
+            if value_type not in VALUE_TYPES:
+                return ConfigError(key, f"unknown value type {value_type!r}")
+            data[key] = value if value_type == "str" else [value]
+            return None
+        current = data.get(key)
+        if current is None:
             data[key] = [value]
-        with open(path, "w") as f:
-            yaml.safe_dump(data, f, sort_keys=False)
+        elif isinstance(current, list):
+            if value not in current:
+                current.append(value)
+        else:
+            return ConfigError(key, f"cannot append to a {type(current).__name__}")
+        return None
+
+    def commit(self) -> ConfigResult:
+        """Apply all edits and write the file if they changed anything."""
+        result = ConfigResult(self.path)
+        self.result = result
+        data = self._load(result)
+        if data is None:
+            return result
+        before = yaml.safe_dump(data, sort_keys=False)
+        for op, key, value, value_type in self.edits:
+            error = self._apply(data, op, key, value, value_type)
+            if error is not None:
+                result.errors.append(error)
+            else:
+                result.changed[key] = data[key]
+        if result.errors:
+            result.changed.clear()
+            return result
+        try:
+            after = yaml.safe_dump(data, sort_keys=False)
+        except yaml.YAMLError as e:
+            result.errors.append(ConfigError(None, f"cannot serialise config: {e}"))
+            result.changed.clear()
+            return result
+        if after == before:
+            return result
+        try:
+            atomic_dump(self.path, data)
+        except OSError as e:
+            result.errors.append(ConfigError(None, f"cannot write {self.path}: {e}"))
+            result.changed.clear()
+        return result
+
+
+def set_yaml_value(path, key, value, value_type):
+    result = ConfigTransaction(path).set(key, value, value_type).commit()
+    if result.ok:
         return f"Successfully set {value} on {key}"
-    except:
-        return f"Failed to set {value} on {key}"
+    return f"Failed to set {value} on {key}: {'; '.join(map(str, result.errors))}"
 
 
 def get_process_arg(process, key):
@@ -39,33 +200,10 @@ def get_process_arg(process, key):
 
 
 def append_yaml_value(path, key, value):
-    try:
-        with open(path) as f:
-            data = yaml.safe_load(f) or {}
-
-        current = data.get(key)
-
-        if current is None:
-            data[key] = [value]
-
-        elif isinstance(current, str):
-            return "None"
-
-        elif isinstance(current, list):
-            if value not in current:
-                current.append(value)
-            data[key] = current
-
-        else:
-            return "None"
-
-        with open(path, "w") as f:
-            yaml.safe_dump(data, f, sort_keys=False)
-
-        return data[key]
-
-    except Exception:
+    result = ConfigTransaction(path).append(key, value).commit()
+    if not result.ok:
         return "None"
+    return result.changed[key]
 
 
 def main():
@@ -3,15 +3,21 @@ from __future__ import annotations
 import ast
 import asyncio
 import asyncio.subprocess
+import os
 import random
-from dataclasses import dataclass
+import re
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
 from functools import partial
 from pathlib import Path
-from typing import Awaitable, Callable, Iterable, List, Optional
+from typing import Callable, Iterable, List, Optional
 
 from rich.console import Group, RenderableType
+from rich.markup import escape
 from rich.panel import Panel
 from rich.text import Text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from tabsdata.api.tabsdata_server import Collection, Function, TabsdataServer
 from textual import events, on, work
@@ -20,9 +26,11 @@ from textual.containers import Center, Container, Horizontal, Vertical, Vertical
 from textual.events import Key, ScreenResume
 from textual.reactive import reactive
 from textual.screen import ModalScreen, Screen
+from textual.validation import ValidationResult
 from textual.widgets import (
     Button,
     Checkbox,
+    DataTable,
     DirectoryTree,
     Footer,
     Input,
@@ -34,13 +42,64 @@ from textual.widgets import (
     Static,
 )
 from textual.widgets._tree import TreeNode
-
-from tdconsole.core import input_validators, instance_tasks, tabsdata_api
+from textual.worker import get_current_worker
+
+from tdconsole.core import (
+    bulk_ops,
+    input_validators,
+    instance_checks,
+    instance_flows,
+    instance_tasks,
+    tabsdata_api,
+)
+from tdconsole.core.api_metrics import METRICS
+from tdconsole.core.config_index import (
+    ConfigChange,
+    ConfigIndex,
+    Match,
+    preview_edit,
+)
+from tdconsole.core.execution_monitor import ExecutionMonitor
 from tdconsole.core.find_instances import (
+    define_root,
     instance_name_to_instance,
     sync_filesystem_instances_to_db,
 )
+from tdconsole.core.log_buffer import FLUSH_INTERVAL, LineCoalescer
+from tdconsole.core.log_tail import (
+    DEFAULT_BUFFER_LINES,
+    FileLogSource,
+    LogTail,
+    find_instance_logs,
+)
 from tdconsole.core.models import Instance
+from tdconsole.core.port_allocator import PORT_ALLOCATOR, instance_ports
+from tdconsole.core.run_logs import (
+    RUN_LOG_DIR,
+    LineIndex,
+    RunLog,
+    list_runs,
+    replay_file,
+)
+from tdconsole.core.table_sample import (
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_PAGE_ROWS,
+    SamplePager,
+)
+from tdconsole.core.table_schema import (
+    cached_schema,
+    invalidate_schemas,
+    normalize_schema,
+    store_schema,
+)
+from tdconsole.core.task_graph import (
+    DEFAULT_CONCURRENCY,
+    TaskGraph,
+    TaskSpec,
+    TaskStatus,
+)
+from tdconsole.core.task_runner import run_process, run_task
+from tdconsole.core.task_timing import historical_medians, record_results
 from tdconsole.textual_assets.spinners import SpinnerWidget
 
 
@@ -105,6 +164,7 @@ class RefreshBar(Container):
     @on(Button.Pressed, "#refresh-btn")
     def on_refresh_pressed(self, event: Button.Pressed) -> None:
         try:
+            self.app.catalog_cache.invalidate()
             self.screen.query_one(InstanceInfoPanel).refresh(recompose=True)
         except:
             pass
@@ -272,12 +332,17 @@ class CollectionModal(ModalScreen):
         width: 100%;
         height: 1fr;
     }
+
+    #name-hint {
+        color: $text-muted;
+    }
     """
 
     def __init__(self, server, collection) -> None:
         super().__init__()
         self.server = server
         self.collection = collection
+        self.collection_names = self.app.catalog_cache.collection_names
 
     def compose(self) -> ComposeResult:
         with Container(id="popup"):
@@ -302,6 +367,34 @@ class CollectionModal(ModalScreen):
                         )
                     ],
                 )
+                yield Static("", id="name-hint")
+
+    def on_mount(self) -> None:
+        if not isinstance(self.collection, Collection) and self.collection_names.stale:
+            self.refresh_collection_names()
+
+    @work(thread=True, exclusive=True, group="collection-names")
+    def refresh_collection_names(self) -> None:
+        try:
+            self.collection_names.refresh()
+        except Exception:
+            # Hints fall back to the last known names; ValidCollectionName
+            # re-lists stale names on submit.
+            return
+        self.app.call_from_thread(self.update_name_hint)
+
+    @on(Input.Changed)
+    def update_name_hint(self, event: Input.Changed | None = None) -> None:
+        value = self.query_one(Input).value if event is None else event.value
+        hint = self.query_one("#name-hint", Static)
+        if not value:
+            hint.update("")
+        elif not self.collection_names.loaded:
+            hint.update("Checking existing collections…")
+        elif value in self.collection_names:
+            hint.update(f"[red]✗ {escape(value)} is taken[/]")
+        else:
+            hint.update(f"[green]✓ {escape(value)} is available[/]")
 
     @on(ListView.Selected)
     def _picked(self, event: ListView.Selected) -> None:
@@ -309,6 +402,8 @@ class CollectionModal(ModalScreen):
         if selected == "Delete Collection":
             server: TabsdataServer = self.server
             delete_collection = server.delete_collection(self.collection.name)
+            self.collection_names.discard(self.collection.name)
+            self.app.catalog_cache.invalidate()
         self.dismiss(delete_collection)
 
     @on(Input.Submitted)
@@ -317,7 +412,17 @@ class CollectionModal(ModalScreen):
         if event.validation_result.is_valid:
             server: TabsdataServer = self.server
             print(value)
-            create_collection = server.create_collection(value)
+            try:
+                create_collection = server.create_collection(value)
+            except Exception as e:
+                # E.g. created elsewhere since the names were last listed.
+                self.collection_names.mark_stale()
+                self.app.notify(
+                    f"❌ Could not create {value}: {escape(str(e))}", severity="error"
+                )
+                return
+            self.collection_names.add(value)
+            self.app.catalog_cache.invalidate("collections")
             self.dismiss(create_collection)
         else:
             self.app.notify(f"{event.validation_result.failure_descriptions}")
@@ -510,6 +615,7 @@ InstanceInfoPanel .box > ListView {
         return working_instance or instance
 
     def refresh_widget(self):
+        self.app.catalog_cache.invalidate()
         self.recompile_td_data()
         self.selected_collection = None
         self.selected_function = None
@@ -520,19 +626,16 @@ InstanceInfoPanel .box > ListView {
         self.instance = self.resolve_working_instance()
         self.tabsdata_server = self.app.tabsdata_server
         self.tabsdata_server: TabsdataServer
+        cache = self.app.catalog_cache
         try:
-            self.collection_list = self.tabsdata_server.list_collections()
+            self.collection_list = cache.list("collections")
 
             if (
                 self.selected_collection in self.collection_list
                 and self.tabsdata_server
             ):
-                self.function_list = self.tabsdata_server.list_functions(
-                    self.selected_collection.name
-                )
-                self.table_list = self.tabsdata_server.list_tables(
-                    self.selected_collection.name
-                )
+                self.function_list = cache.list("functions", self.selected_collection)
+                self.table_list = cache.list("tables", self.selected_collection)
             else:
                 self.function_list = []
                 self.table_list = []
@@ -652,6 +755,9 @@ class CurrentStateWidgetTemplate(Static):
         self.title = title
         self.dependency = dependency
 
+    # Catalog kind used to look up bulk operations; None disables them.
+    bulk_kind = None
+
     def generate_internals(self):
         return Static("null", classes="inner")
 
@@ -659,6 +765,33 @@ class CurrentStateWidgetTemplate(Static):
         self.border_title = self.title
         yield self.generate_internals()
 
+    def action_bulk_action(self) -> None:
+        """Offer the bulk operations for this pane on the marked items."""
+        list_view = getattr(self, "list", None)
+        marked = (
+            list_view.marked_items() if isinstance(list_view, VirtualListView) else []
+        )
+        if not marked:
+            self.app.notify("Mark items with space before running a bulk action.")
+            return
+        operations = bulk_ops.bulk_operations(
+            self.app.tabsdata_server,
+            self.bulk_kind,
+            getattr(self.parent, "selected_collection", None),
+        )
+
+        def start(choice) -> None:
+            if choice not in operations:
+                return
+            items = [bulk_ops.BulkItem(list_view.label_for(i), i) for i in marked]
+            self.app.push_screen(
+                BulkOperationScreen(
+                    f"{choice} ({len(items)})", items, operations[choice]
+                )
+            )
+
+        self.app.push_screen(BulkActionModal(len(marked), list(operations)), start)
+
 
 class CurrentInstanceWidget(CurrentStateWidgetTemplate):
     def generate_internals(self):
@@ -697,47 +830,79 @@ class CurrentInstanceWidget(CurrentStateWidgetTemplate):
 
 
 class CurrentCollectionsWidget(CurrentStateWidgetTemplate):
+    BINDINGS = [("b", "bulk_action", "Bulk Action")]
+    bulk_kind = "collections"
+
+    # Seconds the highlight must rest on a collection before prefetching it.
+    PREFETCH_DELAY = 0.15
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefetch_timer = None
+
     def generate_internals(self, collections=None):
-        """Converts List to a ListView"""
-        server: TabsdataServer = self.app.tabsdata_server
-        try:
-            collections = server.list_collections()
-        except:
-            collections = []
-        collections.append("Create a Collection")
-        choiceLabels = [
-            LabelItem(getattr(i, "name", "Create a Collection"), i) for i in collections
-        ]
-        self.list = ListView(*choiceLabels)
+        """Converts the cached collection listing to a VirtualListView"""
+        self.list = VirtualListView(
+            catalog_page_source(self.app, "collections"),
+            trailing=["Create a Collection"],
+            multi_select=True,
+        )
         return self.list
 
     @on(ListView.Selected)
     def handle_collection_selected(self, event: ListView.Selected):
         event.stop()
         collection = event.item.label
+        if collection is None:
+            return
         self.parent.selected_collection = collection
         self.parent.recompile_td_data()
         widgets_to_refresh = self.screen.query(".collection_dependent")
         for i in widgets_to_refresh:
             i.refresh(recompose=True)
 
+    @on(ListView.Highlighted)
+    def handle_collection_highlighted(self, event: ListView.Highlighted):
+        """Debounce highlight changes and warm the cache for the resting one."""
+        if self._prefetch_timer is not None:
+            self._prefetch_timer.stop()
+            self._prefetch_timer = None
+        collection = getattr(event.item, "label", None)
+        if getattr(collection, "name", None) is None:
+            self.workers.cancel_group(self, "collection-prefetch")
+            return
+        self._prefetch_timer = self.set_timer(
+            self.PREFETCH_DELAY, partial(self.prefetch_collection, collection)
+        )
+
+    @work(thread=True, exclusive=True, group="collection-prefetch")
+    def prefetch_collection(self, collection) -> None:
+        """Fetch a collection's functions and tables into the catalog cache."""
+        worker = get_current_worker()
+        cache = self.app.catalog_cache
+        for kind in ("functions", "tables"):
+            if worker.is_cancelled:
+                return
+            if cache.cached(kind, collection) is not None:
+                continue
+            try:
+                cache.list(kind, collection)
+            except:
+                return
+
 
 class CurrentFunctionsWidget(CurrentStateWidgetTemplate):
+    BINDINGS = [("b", "bulk_action", "Bulk Action")]
+    bulk_kind = "functions"
 
     def generate_internals(self, functions=None):
-        """Converts List to a ListView"""
-        server: TabsdataServer = self.app.tabsdata_server
+        """Converts the cached function listing to a VirtualListView"""
         selected_collection = self.parent.selected_collection
-        try:
-            functions = server.list_functions(selected_collection.name)
-        except:
-            functions = []
-
-        functions.append("Create a Function")
-        choiceLabels = [
-            LabelItem(getattr(i, "name", "Create a Function"), i) for i in functions
-        ]
-        self.list = ListView(*choiceLabels)
+        self.list = VirtualListView(
+            catalog_page_source(self.app, "functions", selected_collection),
+            trailing=["Create a Function"],
+            multi_select=True,
+        )
         return self.list
 
     @on(ListView.Selected)
@@ -754,25 +919,19 @@ class CurrentTablesWidget(CurrentStateWidgetTemplate):
     """
 
     def generate_internals(self, collections=None):
-        """Converts List to a ListView"""
-        server: TabsdataServer = self.app.tabsdata_server
+        """Converts the cached table listing to a VirtualListView"""
         selected_collection = self.parent.selected_collection
-
-        try:
-            tables = server.list_tables(selected_collection.name)
-        except:
-            tables = []
-
-        tables.append("Create a Table")
-        choiceLabels = [
-            LabelItem(getattr(i, "name", "Create a Function"), i) for i in tables
-        ]
-        self.list = ListView(*choiceLabels)
+        self.list = VirtualListView(
+            catalog_page_source(self.app, "tables", selected_collection),
+            trailing=["Create a Table"],
+        )
         return self.list
 
     @on(ListView.Selected)
     def handle_table_selected(self, event: ListView.Selected):
         event.stop()
+        table = event.item.label
+        self.parent.selected_table = table if hasattr(table, "name") else None
 
 
 class LabelItem(ListItem):
@@ -790,6 +949,202 @@ class LabelItem(ListItem):
         yield self.front
 
 
+def catalog_page_source(app, kind, collection=None):
+    """Paged fetcher over app.catalog_cache that degrades to an empty listing."""
+
+    def fetch(offset: int, limit: int):
+        if kind != "collections" and getattr(collection, "name", None) is None:
+            return [], 0
+        try:
+            return app.catalog_cache.page(kind, collection, offset, limit)
+        except:
+            return [], 0
+
+    return fetch
+
+
+class VirtualListView(ListView):
+    """
+    ListView over a paged data source that only materializes `window_size`
+    rows. Moving past either edge slides the window and rebinds the existing
+    rows instead of mounting new ones, so widget count, layout cost and memory
+    stay flat however large the listing is. Pages are pulled from
+    `fetch_page(offset, limit) -> (items, total)` on demand and only the most
+    recent `max_pages` are kept.
+
+    With `multi_select`, space marks/unmarks the highlighted item. Marks are
+    tracked by item label, so they survive the window sliding.
+    """
+
+    BINDINGS = [
+        ("space", "toggle_mark", "Mark"),
+        ("pagedown", "page_down", "Page Down"),
+        ("pageup", "page_up", "Page Up"),
+        ("home", "first", "First"),
+        ("end", "last", "Last"),
+    ]
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], tuple[list, int]],
+        *,
+        trailing: Iterable = (),
+        label_for: Callable | None = None,
+        window_size: int = 30,
+        page_size: int = 100,
+        max_pages: int = 3,
+        multi_select: bool = False,
+        **kwargs,
+    ) -> None:
+        self.fetch_page = fetch_page
+        self.multi_select = multi_select
+        self.marked: dict[str, object] = {}
+        self.trailing = list(trailing)
+        self.label_for = label_for or (lambda item: getattr(item, "name", str(item)))
+        self.window_size = window_size
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.window_offset = 0
+        self.total = 0
+        # Where a short page showed the listing really ends, if it did.
+        self._end: int | None = None
+        self._pages: OrderedDict[int, list] = OrderedDict()
+        self._load_page(0)
+        rows = [
+            LabelItem(self._row_text(item), item)
+            for item in self._items(0, min(window_size, self.total_len))
+        ]
+        super().__init__(*rows, **kwargs)
+
+    @property
+    def total_len(self) -> int:
+        return self.total + len(self.trailing)
+
+    @property
+    def position(self) -> int | None:
+        """Absolute index of the highlighted item in the full listing."""
+        return None if self.index is None else self.window_offset + self.index
+
+    def _row_text(self, item) -> str:
+        if item is None:
+            return ""
+        text = self.label_for(item)
+        return f"■ {text}" if text in self.marked else text
+
+    def _load_page(self, page_no: int) -> list:
+        if page_no in self._pages:
+            self._pages.move_to_end(page_no)
+            return self._pages[page_no]
+        offset = page_no * self.page_size
+        items, total = self.fetch_page(offset, self.page_size)
+        items = list(items)
+        end = offset + len(items)
+        if len(items) < self.page_size and end < total:
+            # The source ran out before the total it reported: believe the
+            # short page, so the window stops sliding past the real end.
+            self._end = end
+        elif self._end is not None and end > self._end:
+            self._end = None
+        self.total = total if self._end is None else min(total, self._end)
+        self._pages[page_no] = items
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return self._pages[page_no]
+
+    def item_at(self, position: int):
+        """The item at `position`, or None past the end of the listing."""
+        if position >= self.total:
+            extra = position - self.total
+            return self.trailing[extra] if extra < len(self.trailing) else None
+        page = self._load_page(position // self.page_size)
+        try:
+            return page[position % self.page_size]
+        except IndexError:
+            return None
+
+    def _items(self, start: int, stop: int) -> list:
+        return [self.item_at(i) for i in range(start, stop)]
+
+    def scroll_window(self, delta: int) -> bool:
+        """Slide the window by `delta` items and rebind the mounted rows."""
+        rows = self._nodes
+        offset = max(0, min(self.window_offset + delta, self.total_len - len(rows)))
+        if offset == self.window_offset:
+            return False
+        self.window_offset = offset
+        for row, item in zip(rows, self._items(offset, offset + len(rows))):
+            row.label = item
+            row.front.update(self._row_text(item))
+        self.post_message(self.Highlighted(self, self.highlighted_child))
+        return True
+
+    def check_action(self, action: str, parameters: tuple) -> bool | None:
+        if action == "toggle_mark" and not self.multi_select:
+            return False
+        return super().check_action(action, parameters)
+
+    def marked_items(self) -> list:
+        return list(self.marked.values())
+
+    def action_toggle_mark(self) -> None:
+        position = self.position
+        if position is None or position >= self.total:
+            return
+        item = self.item_at(position)
+        if item is None:
+            return
+        key = self.label_for(item)
+        if self.marked.pop(key, None) is None:
+            self.marked[key] = item
+        self.highlighted_child.front.update(self._row_text(item))
+        self.action_cursor_down()
+
+    def action_cursor_down(self) -> None:
+        if self.index is not None and self.index >= len(self) - 1:
+            if self.scroll_window(1):
+                return
+        super().action_cursor_down()
+
+    def action_cursor_up(self) -> None:
+        if self.index == 0 and self.scroll_window(-1):
+            return
+        super().action_cursor_up()
+
+    def action_page_down(self) -> None:
+        if self.index is not None and self.index < len(self) - 1:
+            self.index = len(self) - 1
+        else:
+            self.scroll_window(len(self))
+
+    def action_page_up(self) -> None:
+        if self.index:
+            self.index = 0
+        else:
+            self.scroll_window(-len(self))
+
+    def action_first(self) -> None:
+        self.scroll_window(-self.window_offset)
+        self.index = 0
+
+    def action_last(self) -> None:
+        self.scroll_window(self.total_len)
+        self.index = len(self) - 1
+
+    # The wheel moves the highlight like the arrow keys, so the window slides
+    # at its edges whether this list or an auto-height parent is scrolling.
+    def on_mouse_scroll_down(self, event: events.MouseScrollDown) -> None:
+        event.stop()
+        event.prevent_default()
+        for _ in range(3):
+            self.action_cursor_down()
+
+    def on_mouse_scroll_up(self, event: events.MouseScrollUp) -> None:
+        event.stop()
+        event.prevent_default()
+        for _ in range(3):
+            self.action_cursor_up()
+
+
 class ListScreenTemplate(Screen):
     def __init__(self, choice_dict=None, header="Select a File: "):
         super().__init__()
@@ -836,13 +1191,43 @@ class ListScreenTemplate(Screen):
 class InstanceSelectionScreen(ListScreenTemplate):
     BINDINGS = [
         ("enter", "press_close", "Done"),
+        ("space", "toggle_mark", "Mark"),
+        ("f", "run_fleet", "Run on Marked"),
     ]
 
+    CSS = """
+    LabelItem.marked { background: $accent 30%; }
+    """
+
     def __init__(self, instances=None, flow_mode=None):
         self.app.flow_mode = flow_mode
         self.instances = self.resolve_instance_list()
+        self.marked: dict[str, Instance] = {}
         super().__init__(choice_dict=self.instances)
 
+    def check_action(self, action: str, parameters: tuple) -> bool | None:
+        if action in ("toggle_mark", "run_fleet"):
+            return self.app.flow_mode in FLEET_OPERATIONS
+        return super().check_action(action, parameters)
+
+    def action_toggle_mark(self) -> None:
+        item = self.list.highlighted_child
+        instance = getattr(item, "label", None)
+        if not isinstance(instance, Instance) or instance.name == "_Create_Instance":
+            return
+        if self.marked.pop(instance.name, None) is None:
+            self.marked[instance.name] = instance
+        item.set_class(instance.name in self.marked, "marked")
+        self.list.action_cursor_down()
+
+    def action_run_fleet(self) -> None:
+        if not self.marked:
+            self.app.notify("Mark instances with space first.", severity="warning")
+            return
+        self.app.push_screen(
+            FleetOperationScreen(self.app.flow_mode, list(self.marked.values()))
+        )
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "back-btn":
             self.app.pop_screen()
@@ -922,8 +1307,9 @@ class MainScreen(ListScreenTemplate):
             choice_dict={
                 "Instance Management": InstanceManagementScreen,
                 "Asset Management": AssetManagementScreen,
-                "Workflow Management (Not Built Yet)": None,
-                "Config Management (Not Built Yet)": None,
+                "Workflow Management": ExecutionMonitorScreen,
+                "Config Management": ConfigManagementScreen,
+                "API Diagnostics": ApiDiagnosticsScreen,
                 "Exit": None,
             },
         )
@@ -948,10 +1334,32 @@ class AssetManagementScreen(ListScreenTemplate):
                 "Delete a Collection": None,
                 "Delete a Table": None,
                 "Sample Table Schema": None,
-                "Sample Table Data" "Exit": None,
+                "Sample Table Data": None,
+                "Exit": None,
             },
         )
 
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        screens = {
+            "Sample Table Schema": TableSchemaScreen,
+            "Sample Table Data": TableSampleScreen,
+        }
+        if event.item.label in screens:
+            self.open_table_screen(screens[event.item.label])
+            return
+        super().on_list_view_selected(event)
+
+    def open_table_screen(self, screen_cls) -> None:
+        panel = self.query_one(InstanceInfoPanel)
+        collection, table = panel.selected_collection, panel.selected_table
+        if not hasattr(collection, "name") or not hasattr(table, "name"):
+            self.app.notify(
+                "Select a collection and a table in the panes above first.",
+                severity="warning",
+            )
+            return
+        self.app.push_screen(screen_cls(collection, table))
+
     @on(ListView.Selected)
     def handle_api_response(self, event: ListView.Selected):
         value = event.item.label
@@ -965,108 +1373,1266 @@ class AssetManagementScreen(ListScreenTemplate):
                 self.app.push_screen(PyFileTreeScreen())
 
 
-class InstanceManagementScreen(ListScreenTemplate):
-    def __init__(self):
-        super().__init__(
-            choice_dict={
-                "Bind An Instance": partial(InstanceSelectionScreen, flow_mode="bind"),
-                "Start an Instance": partial(
-                    InstanceSelectionScreen, flow_mode="start"
-                ),
-                "Stop An Instance": partial(InstanceSelectionScreen, flow_mode="stop"),
-                "Delete An Instance": partial(
-                    InstanceSelectionScreen, flow_mode="delete"
-                ),
-            },
-            header="Welcome to Tabsdata. Select an Option to get started below",
-        )
+class ApiDiagnosticsScreen(Screen):
+    """Live per-method latency, error and payload stats for TabsdataServer calls."""
 
+    BINDINGS = [
+        ("d", "dump_metrics", "Dump JSON"),
+        ("r", "reset_metrics", "Reset"),
+    ]
 
-class PortConfigScreen(Screen):
+    CSS = """
+    * {
+        height: auto;
+    }
+    #diagnostics-header { padding: 1 2; text-style: bold; }
+    #diagnostics-table { height: 1fr; max-height: 30; margin: 0 2; }
+    #diagnostics-status { padding: 1 2; color: $text-muted; }
     """
-    Screen that asks for:
-      - Instance name (for new instances)
-      - External port
-      - Internal port
 
-    Validation:
-      * Port 1–65535
-      * Port not in use by another running instance
-      * Internal port must not equal external port
+    COLUMNS = {
+        "method": "Method",
+        "calls": "Calls",
+        "errors": "Errors",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "p99_ms": "p99 (ms)",
+        "max_ms": "max (ms)",
+        "avg_payload_bytes": "avg payload (B)",
+    }
+
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            Label("TabsdataServer Call Diagnostics", id="diagnostics-header"),
+            DataTable(id="diagnostics-table", zebra_stripes=True, cursor_type="row"),
+            Static("", id="diagnostics-status"),
+            Footer(),
+        )
+
+    def on_mount(self) -> None:
+        table = self.query_one("#diagnostics-table", DataTable)
+        table.add_columns(*self.COLUMNS.values())
+        self.refresh_metrics()
+        self.set_interval(1, self.refresh_metrics)
+
+    def on_show(self) -> None:
+        self.set_focus(self.query_one("#diagnostics-table"))
+
+    def refresh_metrics(self) -> None:
+        table = self.query_one("#diagnostics-table", DataTable)
+        rows = METRICS.snapshot()
+        table.clear()
+        for row in rows:
+            table.add_row(
+                *["-" if row[k] is None else str(row[k]) for k in self.COLUMNS],
+                key=row["method"],
+            )
+        total_calls = sum(r["calls"] for r in rows)
+        total_errors = sum(r["errors"] for r in rows)
+        self.query_one("#diagnostics-status", Static).update(
+            f"{total_calls} calls, {total_errors} errors since "
+            f"{METRICS.started_at:%H:%M:%S}. Press d to dump JSON, r to reset."
+        )
+
+    def action_dump_metrics(self) -> None:
+        path = METRICS.dump_json()
+        self.app.notify(f"API diagnostics written to {path}")
+
+    def action_reset_metrics(self) -> None:
+        METRICS.reset()
+        self.refresh_metrics()
+
+
+class ExecutionMonitorScreen(Screen):
+    """
+    Live view of the working instance's executions and transactions. Polling
+    is incremental (only records at or after the cursor are requested), only
+    rows whose fields changed are touched, and the poll interval backs off
+    while nothing is running.
     """
 
+    BINDINGS = [
+        ("r", "poll_now", "Refresh Now"),
+        ("l", "open_logs", "Worker Logs"),
+    ]
+
     CSS = """
     * {
         height: auto;
     }
-    Screen {
-        layout: vertical;
-    }
+    #monitor-header { padding: 1 2; text-style: bold; }
+    #monitor-status { padding: 0 2 1 2; color: $text-muted; }
+    #monitor-table { height: 1fr; max-height: 40; margin: 0 2; }
+    """
 
-    #portscroll {
-        height: 1fr;
-        overflow-y: auto;
+    COLUMNS = {
+        "kind": "Kind",
+        "id": "ID",
+        "name": "Name",
+        "status": "Status",
+        "triggered_on": "Triggered",
+        "ended_on": "Ended",
     }
 
-    .input_container Input {
-    width: auto;
-    }
+    def __init__(self) -> None:
+        super().__init__()
+        self.monitor = ExecutionMonitor(self.app.tabsdata_server)
+        self.poll_timer = None
 
-Checkbox:focus > .toggle--button {
-    color: $accent;
-}
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            Label("Executions and Transactions", id="monitor-header"),
+            Static("Loading…", id="monitor-status"),
+            DataTable(id="monitor-table", zebra_stripes=True, cursor_type="row"),
+            Footer(),
+        )
+
+    def on_mount(self) -> None:
+        table = self.query_one("#monitor-table", DataTable)
+        for key, label in self.COLUMNS.items():
+            table.add_column(label, key=key)
+        if self.app.tabsdata_server is None:
+            self.query_one("#monitor-status", Static).update(
+                "No Tabsdata server connection for the working instance."
+            )
+            return
+        self.poll()
+
+    def on_show(self) -> None:
+        self.set_focus(self.query_one("#monitor-table"))
+
+    @work(thread=True, exclusive=True, group="execution-monitor")
+    def poll(self) -> None:
+        try:
+            changed, interval = self.monitor.poll()
+            error = None
+        except Exception as e:
+            changed, interval, error = [], self.monitor.next_interval, e
+        if get_current_worker().is_cancelled:
+            return
+        self.app.call_from_thread(self.apply_changes, changed, interval, error)
+
+    def apply_changes(self, changed, interval: float, error) -> None:
+        if any(r.kind == "transactions" and not r.active for r in changed):
+            # A finished transaction may have committed new table schemas.
+            invalidate_schemas(
+                self.app.session, getattr(self.app.working_instance, "name", None)
+            )
+        table = self.query_one("#monitor-table", DataTable)
+        for record in changed:
+            key = f"{record.kind}:{record.id}"
+            values = {**record.fields, "kind": record.kind}
+            if key in table.rows:
+                for column in self.COLUMNS:
+                    table.update_cell(key, column, self.format_value(values[column]))
+            else:
+                table.add_row(
+                    *(self.format_value(values[c]) for c in self.COLUMNS), key=key
+                )
+
+        store = self.monitor.store
+        status = (
+            f"{len(store.records)} records · {len(store.active())} active · "
+            f"{len(changed)} changed · next poll in {interval:.1f}s"
+        )
+        if error is not None:
+            status += f" · last poll failed: {escape(str(error))}"
+        self.query_one("#monitor-status", Static).update(status)
+
+        if self.poll_timer is not None:
+            self.poll_timer.stop()
+        self.poll_timer = self.set_timer(interval, self.poll)
+
+    @staticmethod
+    def format_value(value) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, (int, float)) and value > 10**11:
+            # Epoch milliseconds from the server.
+            return datetime.fromtimestamp(value / 1000).strftime("%Y-%m-%d %H:%M:%S")
+        return escape(str(value))
+
+    def action_poll_now(self) -> None:
+        self.monitor.backoff.reset()
+        self.poll()
+
+    def action_open_logs(self) -> None:
+        self.app.push_screen(LogTailScreen())
 
 
+class LogTailScreen(Screen):
+    """
+    Follows a log file from the working instance's workspace. New bytes are
+    read by offset, only the newest `buffer_lines` lines are kept in memory
+    (older ones spill to a temp file) and the regex search covers both.
     """
 
-    def __init__(self, instance) -> None:
-        super().__init__()
-        if instance is None:
-            raise TypeError("PortConfigScreen requires an Instance object")
+    BINDINGS = [
+        ("/", "focus_search", "Search"),
+    ]
 
-        if instance.name == "_Create_Instance":
-            self.placeholder = "tabsdata"
-        else:
-            self.placeholder = instance.name
-        self.instance = instance
+    CSS = """
+    * {
+        height: auto;
+    }
+    #log-header { padding: 1 2; text-style: bold; }
+    #log-status { padding: 0 2 1 2; color: $text-muted; }
+    #log-files { max-height: 8; margin: 0 2; }
+    #log-search { margin: 0 2; }
+    #log-output { height: 1fr; min-height: 15; max-height: 40; margin: 0 2; }
+    #log-matches { max-height: 12; margin: 0 2; }
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, buffer_lines: int = DEFAULT_BUFFER_LINES) -> None:
+        super().__init__()
+        self.buffer_lines = buffer_lines
+        self.tail: LogTail | None = None
+        self.poll_timer = None
+        self.logs: list[Path] = []
 
     def compose(self) -> ComposeResult:
         yield ExitBar()
         yield VerticalScroll(
-            InstanceInfoPanel(),
-            Vertical(
-                Horizontal(
-                    Label(
-                        "Instance Name:",
-                        id="title-instance",
-                    ),
-                    Input(
-                        placeholder=self.placeholder,
-                        validate_on=["submitted"],
-                        disabled=True,
-                        validators=[
-                            input_validators.ValidInstanceName(self.app, self.instance)
-                        ],
-                        compact=True,
-                        id="instance-input",
-                        classes="inputs",
-                    ),
-                    Pretty("", id="instance-message"),
-                ),
-                id="instance-container",
-                classes="input_container",
-            ),
-            Vertical(
-                Horizontal(
-                    Label("External port:", id="ext-label"),
-                    Input(
-                        placeholder=str(self.instance.arg_ext or ""),
-                        restrict=r"\d*",
+            Label("Worker Logs", id="log-header"),
+            Static("Looking for log files…", id="log-status"),
+            Vertical(id="log-files-box"),
+            Input(placeholder="Regex search (Enter)", id="log-search"),
+            RichLog(id="log-output", max_lines=self.buffer_lines, wrap=False),
+            RichLog(id="log-matches", max_lines=500, wrap=False),
+            Footer(),
+        )
+
+    def on_mount(self) -> None:
+        self.find_logs()
+
+    def on_show(self) -> None:
+        for log_files in self.query("#log-files"):
+            self.set_focus(log_files)
+
+    @work(thread=True, exclusive=True, group="log-files")
+    def find_logs(self) -> None:
+        # rglob over the instance workspace; kept off the UI thread.
+        instance = self.app.working_instance
+        logs = find_instance_logs(instance.name) if instance else []
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self.show_logs, logs)
+
+    def show_logs(self, logs: list[Path]) -> None:
+        self.logs = logs
+        self.query_one("#log-status", Static).update(
+            f"{len(self.logs)} log files. Select one to follow it."
+        )
+        log_files = VirtualListView(
+            lambda offset, limit: (
+                self.logs[offset : offset + limit],
+                len(self.logs),
+            ),
+            label_for=self.log_label,
+            window_size=8,
+            id="log-files",
+        )
+        self.query_one("#log-files-box", Vertical).mount(log_files)
+        if self.tail is None:
+            self.set_focus(log_files)
+
+    def log_label(self, path) -> str:
+        if path is None:
+            return ""
+        root = define_root("instances", self.app.working_instance.name)
+        return escape(str(path.relative_to(root) if root else path))
+
+    @on(ListView.Selected, "#log-files")
+    def handle_log_selected(self, event: ListView.Selected) -> None:
+        if event.item.label is not None:
+            self.follow(event.item.label)
+
+    def follow(self, path) -> None:
+        self.stop_tail()
+        self.tail = LogTail(FileLogSource(path), buffer_lines=self.buffer_lines)
+        self.query_one("#log-output", RichLog).clear()
+        self.query_one("#log-matches", RichLog).clear()
+        self.query_one("#log-header", Label).update(f"Worker Logs · {path.name}")
+        self.poll_log()
+        self.poll_timer = self.set_interval(self.POLL_INTERVAL, self.poll_log)
+
+    def stop_tail(self) -> None:
+        if self.poll_timer is not None:
+            self.poll_timer.stop()
+            self.poll_timer = None
+        if self.tail is not None:
+            self.tail.close()
+            self.tail = None
+
+    @work(thread=True, exclusive=True, group="log-tail")
+    def poll_log(self) -> None:
+        tail = self.tail
+        if tail is None:
+            return
+        lines = tail.poll()
+        if get_current_worker().is_cancelled or tail is not self.tail:
+            return
+        self.app.call_from_thread(self.show_lines, tail, lines)
+
+    def show_lines(self, tail: LogTail, lines: list[str]) -> None:
+        if tail is not self.tail:
+            return
+        if lines:
+            # One write per poll; the RichLog itself is capped at buffer_lines.
+            self.query_one("#log-output", RichLog).write(
+                "\n".join(lines[-self.buffer_lines :])
+            )
+        behind = tail.behind
+        self.query_one("#log-status", Static).update(
+            f"{tail.total_lines} lines · {len(tail.lines)} in memory · "
+            f"{tail.spilled} spilled to disk"
+            + (f" · {behind / 1024:.0f} KiB behind" if behind else "")
+        )
+
+    @on(Input.Submitted, "#log-search")
+    def handle_search(self, event: Input.Submitted) -> None:
+        if self.tail is None:
+            self.app.notify("Select a log file first.", severity="warning")
+            return
+        self.search_log(self.tail, event.value)
+
+    @work(thread=True, exclusive=True, group="log-search")
+    def search_log(self, tail: LogTail, pattern: str) -> None:
+        try:
+            matches = tail.search(pattern)
+        except re.error as e:
+            self.app.call_from_thread(
+                self.app.notify, f"❌ Invalid pattern: {e}", severity="error"
+            )
+            return
+        except ValueError:
+            # Tail was closed while searching.
+            return
+        self.app.call_from_thread(self.show_matches, pattern, matches)
+
+    def show_matches(self, pattern: str, matches: list[tuple[int, str]]) -> None:
+        log = self.query_one("#log-matches", RichLog)
+        log.clear()
+        log.write(f"{len(matches)} matches for /{pattern}/")
+        if matches:
+            log.write("\n".join(f"{n + 1:>8}  {line}" for n, line in matches))
+
+    def action_focus_search(self) -> None:
+        self.set_focus(self.query_one("#log-search", Input))
+
+    def on_unmount(self) -> None:
+        self.stop_tail()
+
+
+class TableSampleScreen(Screen):
+    """
+    Paged sample viewer for one table. Rows arrive in bounded windows held by a
+    SamplePager (evicting beyond a memory budget), the next page is prefetched
+    in the background, and only MAX_COLUMNS columns are rendered at a time so
+    very wide tables stay cheap.
+    """
+
+    BINDINGS = [
+        ("n", "next_page", "Next Page"),
+        ("p", "prev_page", "Prev Page"),
+        ("]", "next_columns", "More Columns"),
+        ("[", "prev_columns", "Prev Columns"),
+    ]
+
+    CSS = """
+    * {
+        height: auto;
+    }
+    #sample-header { padding: 1 2; text-style: bold; }
+    #sample-status { padding: 0 2 1 2; color: $text-muted; }
+    #sample-table { height: 1fr; max-height: 40; margin: 0 2; }
+    """
+
+    MAX_COLUMNS = 40
+
+    def __init__(
+        self,
+        collection,
+        table,
+        page_rows: int = DEFAULT_PAGE_ROWS,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        super().__init__()
+        self.collection = collection
+        self.table = table
+        self.pager = SamplePager(
+            partial(tabsdata_api.pull_table_sample, self.app, collection, table),
+            page_rows=page_rows,
+            memory_budget=memory_budget,
+        )
+        self.page_no = 0
+        self.column_offset = 0
+        self.frame = None
+
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            Label(
+                f"Sample of {self.collection.name}/{self.table.name}",
+                id="sample-header",
+            ),
+            Static("Loading…", id="sample-status"),
+            DataTable(id="sample-table", zebra_stripes=True),
+            Footer(),
+        )
+
+    def on_mount(self) -> None:
+        self.load_page(0)
+
+    def on_show(self) -> None:
+        self.set_focus(self.query_one("#sample-table"))
+
+    @work(thread=True, exclusive=True, group="sample-page")
+    def load_page(self, page_no: int) -> None:
+        try:
+            frame = self.pager.page(page_no)
+        except Exception as e:
+            self.app.call_from_thread(
+                self.app.notify, f"❌ Could not load sample: {e}", severity="error"
+            )
+            return
+        if get_current_worker().is_cancelled:
+            return
+        self.app.call_from_thread(self.show_frame, page_no, frame)
+
+    @work(thread=True, group="sample-prefetch")
+    def prefetch_page(self, page_no: int) -> None:
+        try:
+            self.pager.prefetch(page_no)
+        except Exception:
+            pass
+
+    def show_frame(self, page_no: int, frame) -> None:
+        if frame.height == 0 and page_no > 0:
+            self.app.notify("No more rows in this table.")
+            return
+        self.page_no = page_no
+        self.frame = frame
+        self.render_window()
+        self.prefetch_page(page_no + 1)
+
+    def render_window(self) -> None:
+        table = self.query_one("#sample-table", DataTable)
+        frame = self.frame
+        columns = frame.columns[
+            self.column_offset : self.column_offset + self.MAX_COLUMNS
+        ]
+        table.clear(columns=True)
+        table.add_columns(*columns)
+        first_row = self.page_no * self.pager.page_rows
+        for i, row in enumerate(frame.select(columns).iter_rows()):
+            table.add_row(*(str(v) for v in row), label=str(first_row + i))
+
+        last_col = self.column_offset + len(columns)
+        self.query_one("#sample-status", Static).update(
+            f"rows {first_row}–{first_row + frame.height - 1} · "
+            f"columns {self.column_offset + 1}–{last_col} of {frame.width} · "
+            f"{len(self.pager.cached_pages)} pages cached "
+            f"({self.pager.cached_bytes / 1_048_576:.1f} MiB)"
+        )
+
+    def action_next_page(self) -> None:
+        if self.pager.is_past_end(self.page_no + 1):
+            self.app.notify("Already on the last page.")
+            return
+        self.load_page(self.page_no + 1)
+
+    def action_prev_page(self) -> None:
+        if self.page_no > 0:
+            self.load_page(self.page_no - 1)
+
+    def action_next_columns(self) -> None:
+        if self.frame is None:
+            return
+        if self.column_offset + self.MAX_COLUMNS < self.frame.width:
+            self.column_offset += self.MAX_COLUMNS
+            self.render_window()
+
+    def action_prev_columns(self) -> None:
+        if self.frame is not None and self.column_offset > 0:
+            self.column_offset = max(0, self.column_offset - self.MAX_COLUMNS)
+            self.render_window()
+
+
+class TableSchemaScreen(Screen):
+    """
+    Column list for one table. Schemas are cached in the local DB per table
+    version, so reopening an unchanged table doesn't hit the server. Columns
+    are rendered through a VirtualListView so tables with thousands of columns
+    stay cheap, and the filter box narrows them by name.
+    """
+
+    BINDINGS = [
+        ("r", "refresh_schema", "Refetch"),
+        ("/", "focus_filter", "Filter"),
+    ]
+
+    CSS = """
+    * {
+        height: auto;
+    }
+    #schema-header { padding: 1 2; text-style: bold; }
+    #schema-status { padding: 0 2 1 2; color: $text-muted; }
+    #schema-filter { margin: 0 2; }
+    #schema-columns { height: 1fr; max-height: 40; margin: 0 2; }
+    """
+
+    def __init__(self, collection, table) -> None:
+        super().__init__()
+        self.collection = collection
+        self.table = table
+        self.version = tabsdata_api.table_version(table)
+        self.columns: list[dict] = []
+        self.matches: list[dict] = []
+        self.source = ""
+
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            Label(
+                f"Schema of {self.collection.name}/{self.table.name}",
+                id="schema-header",
+            ),
+            Input(placeholder="Filter columns by name", id="schema-filter"),
+            Static("Loading…", id="schema-status"),
+            Container(id="schema-list"),
+            Footer(),
+        )
+
+    async def on_mount(self) -> None:
+        await self.load_schema()
+
+    async def load_schema(self, refresh: bool = False) -> None:
+        columns = None
+        if not refresh:
+            columns = cached_schema(
+                self.app.session,
+                self.instance_name,
+                self.collection,
+                self.table,
+                self.version,
+            )
+        if columns is not None:
+            await self.show_columns(columns, cached=True)
+        else:
+            self.fetch_schema()
+
+    @property
+    def instance_name(self) -> str | None:
+        return getattr(self.app.working_instance, "name", None)
+
+    @work(thread=True, exclusive=True, group="schema-fetch")
+    def fetch_schema(self) -> None:
+        try:
+            raw = tabsdata_api.pull_table_schema(self.app, self.collection, self.table)
+            columns = normalize_schema(raw)
+        except Exception as e:
+            self.app.call_from_thread(
+                self.app.notify, f"❌ Could not load schema: {e}", severity="error"
+            )
+            return
+        if get_current_worker().is_cancelled:
+            return
+        self.app.call_from_thread(self.store_and_show, columns)
+
+    async def store_and_show(self, columns: list[dict]) -> None:
+        # DB writes stay on the UI thread, which owns the session.
+        store_schema(
+            self.app.session,
+            self.instance_name,
+            self.collection,
+            self.table,
+            self.version,
+            columns,
+        )
+        await self.show_columns(columns, cached=False)
+
+    async def show_columns(self, columns: list[dict], cached: bool) -> None:
+        self.columns = columns
+        self.source = "cached" if cached else "fetched"
+        await self.apply_filter(self.query_one("#schema-filter", Input).value)
+
+    @on(Input.Changed, "#schema-filter")
+    async def handle_filter_changed(self, event: Input.Changed) -> None:
+        await self.apply_filter(event.value)
+
+    async def apply_filter(self, text: str) -> None:
+        needle = text.strip().lower()
+        self.matches = (
+            [c for c in self.columns if needle in c["name"].lower()]
+            if needle
+            else self.columns
+        )
+        holder = self.query_one("#schema-list", Container)
+        await holder.remove_children()
+        await holder.mount(
+            VirtualListView(
+                lambda offset, limit: (
+                    self.matches[offset : offset + limit],
+                    len(self.matches),
+                ),
+                label_for=lambda c: (
+                    f"{escape(c['name'])}  [dim]{escape(c['type'])}[/dim]" if c else ""
+                ),
+                id="schema-columns",
+            )
+        )
+        version = self.version or "unversioned"
+        self.query_one("#schema-status", Static).update(
+            f"{len(self.matches)} of {len(self.columns)} columns · "
+            f"version {version} · {self.source}"
+        )
+
+    async def action_refresh_schema(self) -> None:
+        self.query_one("#schema-status", Static).update("Loading…")
+        await self.load_schema(refresh=True)
+
+    def action_focus_filter(self) -> None:
+        self.set_focus(self.query_one("#schema-filter", Input))
+
+
+class RunLogScreen(Screen):
+    """
+    Replays saved task-run logs. The chosen run is memory-mapped and indexed
+    lazily, so only the lines on screen are read and large logs open at once;
+    the rest of the index is built in the background.
+    """
+
+    CSS = """
+    * {
+        height: auto;
+    }
+    #runs-header { padding: 1 2; text-style: bold; }
+    #runs-status { padding: 0 2 1 2; color: $text-muted; }
+    #runs-list { max-height: 10; margin: 0 2; }
+    #run-lines { height: 1fr; max-height: 40; margin: 1 2; }
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.runs = list_runs()
+        self.index: LineIndex | None = None
+
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            Label("Past Task Runs", id="runs-header"),
+            Static(
+                f"{len(self.runs)} runs in {RUN_LOG_DIR}. Select one to open it.",
+                id="runs-status",
+            ),
+            VirtualListView(
+                lambda offset, limit: (
+                    self.runs[offset : offset + limit],
+                    len(self.runs),
+                ),
+                label_for=self.run_label,
+                window_size=10,
+                id="runs-list",
+            ),
+            Container(id="run-lines-holder"),
+            Footer(),
+        )
+
+    def on_show(self) -> None:
+        self.set_focus(self.query_one("#runs-list"))
+
+    @staticmethod
+    def run_label(run) -> str:
+        if run is None:
+            return ""
+        size = run["bytes"] / 1024
+        gz = " (gz)" if run["compressed"] else ""
+        return escape(f"{run['run_id']}  {size:,.0f} KiB{gz}")
+
+    @on(ListView.Selected, "#runs-list")
+    def handle_run_selected(self, event: ListView.Selected) -> None:
+        if event.item.label is not None:
+            self.open_run(event.item.label)
+
+    @work(thread=True, exclusive=True, group="run-open")
+    def open_run(self, run: dict) -> None:
+        try:
+            index = LineIndex(replay_file(run))
+        except OSError as e:
+            self.app.call_from_thread(
+                self.app.notify, f"❌ Could not open run: {e}", severity="error"
+            )
+            return
+        self.app.call_from_thread(self.show_run, run, index)
+        index.ensure()
+        self.app.call_from_thread(self.update_status, run, index)
+
+    async def show_run(self, run: dict, index: LineIndex) -> None:
+        if self.index is not None:
+            self.index.close()
+        self.index = index
+
+        def fetch(offset: int, limit: int):
+            lines = index.lines(offset, limit)
+            total = (
+                len(index) if index.complete else max(len(index), offset + limit + 1)
+            )
+            return [escape(line) for line in lines], total
+
+        holder = self.query_one("#run-lines-holder", Container)
+        await holder.remove_children()
+        await holder.mount(
+            VirtualListView(
+                fetch, label_for=self.line_label, window_size=40, id="run-lines"
+            )
+        )
+        self.update_status(run, index)
+
+    @staticmethod
+    def line_label(line) -> str:
+        # Rows past the end of a run still being indexed have no line yet.
+        return "" if line is None else line
+
+    def update_status(self, run: dict, index: LineIndex) -> None:
+        if index is not self.index:
+            return
+        if index.complete:
+            # The list only learns the real length from its next page load.
+            for view in self.query("#run-lines").results(VirtualListView):
+                view.total = len(index)
+        lines = f"{len(index):,} lines" if index.complete else "indexing…"
+        self.query_one("#runs-status", Static).update(
+            f"{run['run_id']} · {run['bytes'] / 1024:,.0f} KiB on disk · {lines}"
+        )
+
+    def on_unmount(self) -> None:
+        if self.index is not None:
+            self.index.close()
+
+
+class BulkActionModal(ModalScreen):
+    CSS = """
+    BulkActionModal {
+        width: 100%;
+        height: 100%;
+        align: center middle;
+        background: rgba(0,0,0,0.25);
+    }
+
+    #popup {
+        width: 60%;
+        height: 50%;
+        border: round $primary;
+        background: $panel;
+        padding: 1 2;
+    }
+
+    #title {
+        margin-bottom: 1;
+    }
+
+    #popup > ListView {
+        width: 100%;
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, count: int, options: list[str]) -> None:
+        super().__init__()
+        self.count = count
+        self.options = options
+
+    def compose(self) -> ComposeResult:
+        with Container(id="popup"):
+            yield ExitBar(mode="dismiss")
+            yield Static(
+                f"What would you like to do with the {self.count} marked items?",
+                id="title",
+            )
+            yield ListView(*[LabelItem(o) for o in self.options])
+
+    def on_mount(self) -> None:
+        self.set_focus(self.query_one("#popup > ListView"))
+
+    @on(ListView.Selected)
+    def _picked(self, event: ListView.Selected) -> None:
+        self.dismiss(event.item.label)
+
+
+class BulkOperationScreen(Screen):
+    """Runs a catalog operation over many items concurrently with per-item status."""
+
+    BINDINGS = [
+        ("enter", "press_close", "Done"),
+    ]
+
+    CSS = """
+    * {
+        height: auto;
+    }
+    #tasks-header { padding: 1 2; text-style: bold; }
+    #tasks-subtitle { padding: 0 2 1 2; }
+    #bulk-table { height: 1fr; max-height: 25; margin: 0 2; }
+    #task-log { padding: 1 2; border: round $accent; overflow-y: auto; height: 10; width: 80%;}
+    #task-box {align: center top;}
+    #done-row { height: 3; content-align: center middle; }
+    VerticalScroll { height: 1fr; overflow-y: auto; }
+    """
+
+    STATUS_LABELS = {
+        bulk_ops.BulkStatus.PENDING: "[dim]● pending[/]",
+        bulk_ops.BulkStatus.RUNNING: "[bold cyan]⏳ running[/]",
+        bulk_ops.BulkStatus.SUCCEEDED: "[green]✅ done[/]",
+        bulk_ops.BulkStatus.FAILED: "[red]❌ failed[/]",
+        bulk_ops.BulkStatus.CANCELLED: "[yellow]⤴ cancelled[/]",
+    }
+
+    def __init__(
+        self,
+        title: str,
+        items: list[bulk_ops.BulkItem],
+        operation: Callable,
+        concurrency: int = bulk_ops.DEFAULT_CONCURRENCY,
+    ) -> None:
+        super().__init__()
+        self.title = title
+        self.items = items
+        self.operation = operation
+        self.concurrency = concurrency
+
+    def compose(self) -> ComposeResult:
+        self.done_button = Button("Done", id="close-btn")
+        self.done_row = Horizontal(self.done_button, id="done-row")
+        self.done_row.display = False
+        yield ExitBar()
+        yield VerticalScroll(
+            Vertical(
+                Label(self.title, id="tasks-header"),
+                Static("", id="tasks-subtitle"),
+                DataTable(id="bulk-table", zebra_stripes=True, cursor_type="row"),
+                Static(""),
+                Container(
+                    RichLog(
+                        id="task-log", auto_scroll=True, max_lines=500, markup=True
+                    ),
+                    id="task-box",
+                ),
+                self.done_row,
+                Footer(),
+            )
+        )
+
+    def on_mount(self) -> None:
+        table = self.query_one("#bulk-table", DataTable)
+        table.add_column("Item", key="item")
+        table.add_column("Status", key="status")
+        table.add_column("Time", key="time")
+        table.add_column("Error", key="error")
+        for item in self.items:
+            table.add_row(
+                escape(item.key), self.STATUS_LABELS[item.status], "", "", key=item.key
+            )
+        self.update_subtitle()
+        self.run_worker(self.run_operations(), exclusive=True)
+
+    def update_item(self, item: bulk_ops.BulkItem) -> None:
+        table = self.query_one("#bulk-table", DataTable)
+        table.update_cell(item.key, "status", self.STATUS_LABELS[item.status])
+        if item.elapsed is not None:
+            table.update_cell(item.key, "time", f"{item.elapsed:.2f}s")
+        if item.error:
+            table.update_cell(item.key, "error", escape(item.error))
+        self.update_subtitle()
+
+    def update_subtitle(self) -> None:
+        counts = bulk_ops.summarize(self.items)
+        finished = len(self.items) - counts["pending"] - counts["running"]
+        self.query_one("#tasks-subtitle", Static).update(
+            f"{finished}/{len(self.items)} finished · {counts['running']} running · "
+            f"{counts['failed']} failed · concurrency {self.concurrency}"
+        )
+
+    async def run_operations(self) -> None:
+        log = self.query_one("#task-log", RichLog)
+        await bulk_ops.run_bulk(
+            self.items, self.operation, self.concurrency, on_update=self.update_item
+        )
+        self.app.catalog_cache.invalidate()
+        # Deleted or re-triggered functions may change the tables' schemas.
+        invalidate_schemas(
+            self.app.session, getattr(self.app.working_instance, "name", None)
+        )
+        failures = [i for i in self.items if i.status != bulk_ops.BulkStatus.SUCCEEDED]
+        if failures:
+            log.write(f"[red]⚠️ {len(failures)} of {len(self.items)} items failed:[/]")
+            for item in failures:
+                error = escape(item.error) if item.error else item.status.value
+                log.write(f"[bold]{escape(item.key)}[/]: {error}")
+        else:
+            log.write(f"🎉 All {len(self.items)} items complete.")
+        self.done_row.display = True
+        self.done_button.focus()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "close-btn":
+            self.app.pop_screen()
+
+    def action_press_close(self) -> None:
+        try:
+            btn = self.query_one("#close-btn", Button)
+        except Exception:
+            return
+        if btn.display:
+            btn.press()
+
+
+class ConfigManagementScreen(Screen):
+    """
+    Browse, query, diff and bulk-edit the YAML configs of every instance.
+    Backed by the app's ConfigIndex, which only re-parses files whose mtime
+    changed; bulk edits are previewed as diffs and applied concurrently.
+    """
+
+    BINDINGS = [
+        ("r", "refresh_index", "Refresh"),
+        ("space", "toggle_mark", "Mark"),
+        ("d", "diff_marked", "Diff"),
+        ("/", "focus_query", "Query"),
+        ("e", "focus_edit", "Bulk Edit"),
+        ("a", "apply_edit", "Apply Edit"),
+    ]
+
+    CSS = """
+    * {
+        height: auto;
+    }
+    #config-header { padding: 1 2; text-style: bold; }
+    #config-status { padding: 0 2 1 2; color: $text-muted; }
+    #config-query, #config-edit { margin: 0 2; }
+    #config-table { height: 1fr; max-height: 20; margin: 0 2; }
+    #config-detail { height: 1fr; min-height: 12; max-height: 30; margin: 0 2; }
+    """
+
+    COLUMNS = {
+        "mark": "",
+        "instance": "Instance",
+        "file": "File",
+        "matches": "Matches",
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.index: ConfigIndex = self.app.config_index
+        self.matches: list[Match] = []
+        self.marked: set[str] = set()
+        self.query_text = ""
+        self.pending: list[ConfigChange] = []
+
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            Label("Config Management", id="config-header"),
+            Static("Indexing instance configs…", id="config-status"),
+            Input(
+                placeholder="Query: key=glob, key, or text (Enter)", id="config-query"
+            ),
+            DataTable(id="config-table", zebra_stripes=True, cursor_type="row"),
+            Input(
+                placeholder="Bulk edit marked configs: key=value or key=[value] (Enter)",
+                id="config-edit",
+            ),
+            RichLog(id="config-detail", max_lines=2000, wrap=False, markup=True),
+            Footer(),
+        )
+
+    def on_mount(self) -> None:
+        table = self.query_one("#config-table", DataTable)
+        for key, label in self.COLUMNS.items():
+            table.add_column(label, key=key)
+
+    def on_show(self) -> None:
+        self.set_focus(self.query_one("#config-table"))
+
+    @on(ScreenResume)
+    def handle_resume(self, event: ScreenResume) -> None:
+        # Also runs on first show; after a bulk edit it picks up the rewrites.
+        self.refresh_index()
+
+    @work(thread=True, exclusive=True, group="config-index")
+    def refresh_index(self) -> None:
+        started = time.perf_counter()
+        parsed = self.index.refresh()
+        elapsed = time.perf_counter() - started
+        if get_current_worker().is_cancelled:
+            return
+        self.app.call_from_thread(self.show_matches, parsed, elapsed)
+
+    def show_matches(self, parsed: int | None = None, elapsed: float = 0.0) -> None:
+        self.matches = self.index.query(self.query_text)
+        keys = {m.entry.key for m in self.matches}
+        self.marked &= {e.key for e in self.index.all()}
+        table = self.query_one("#config-table", DataTable)
+        table.clear()
+        for match in self.matches:
+            entry = match.entry
+            table.add_row(
+                "●" if entry.key in self.marked else "",
+                entry.instance,
+                entry.rel,
+                self.describe(match),
+                key=entry.key,
+            )
+        status = (
+            f"{len(self.index.instances())} instances · "
+            f"{len(self.index.entries)} configs · {len(keys)} shown · "
+            f"{len(self.marked)} marked"
+        )
+        if parsed is not None:
+            status += f" · {parsed} parsed in {elapsed * 1000:.0f} ms"
+        self.query_one("#config-status", Static).update(status)
+
+    @staticmethod
+    def describe(match: Match) -> str:
+        if match.entry.error is not None:
+            return f"[red]unreadable: {escape(match.entry.error)}[/]"
+        shown = ", ".join(f"{k}={v}" for k, v in match.leaves[:3])
+        if len(match.leaves) > 3:
+            shown += f" (+{len(match.leaves) - 3})"
+        return escape(shown)
+
+    @on(Input.Submitted, "#config-query")
+    def handle_query(self, event: Input.Submitted) -> None:
+        self.query_text = event.value
+        self.show_matches()
+        self.set_focus(self.query_one("#config-table"))
+
+    @on(DataTable.RowHighlighted, "#config-table")
+    def handle_highlight(self, event: DataTable.RowHighlighted) -> None:
+        entry = self.index.get(event.row_key.value) if event.row_key else None
+        if entry is None:
+            return
+        log = self.query_one("#config-detail", RichLog)
+        log.clear()
+        log.write(f"[bold]{escape(str(entry.path))}[/]")
+        log.write(escape(entry.error or entry.text()))
+
+    def highlighted_key(self) -> str | None:
+        table = self.query_one("#config-table", DataTable)
+        if not table.row_count:
+            return None
+        return table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
+
+    def action_toggle_mark(self) -> None:
+        key = self.highlighted_key()
+        if key is None:
+            return
+        if key in self.marked:
+            self.marked.discard(key)
+        else:
+            self.marked.add(key)
+        table = self.query_one("#config-table", DataTable)
+        table.update_cell(key, "mark", "●" if key in self.marked else "")
+        table.action_cursor_down()
+
+    def action_diff_marked(self) -> None:
+        keys = sorted(self.marked)
+        if len(keys) == 1 and self.highlighted_key() not in (None, keys[0]):
+            keys.append(self.highlighted_key())
+        if len(keys) != 2:
+            self.app.notify(
+                "Mark two configs (or one, then highlight another) to diff.",
+                severity="warning",
+            )
+            return
+        log = self.query_one("#config-detail", RichLog)
+        log.clear()
+        diff = self.index.diff(*keys)
+        if not diff:
+            log.write("Configs are identical.")
+        for line in diff:
+            log.write(self.diff_line(line))
+
+    @staticmethod
+    def diff_line(line: str) -> Text:
+        if line.startswith("+") and not line.startswith("+++"):
+            return Text(line, style="green")
+        if line.startswith("-") and not line.startswith("---"):
+            return Text(line, style="red")
+        if line.startswith("@@"):
+            return Text(line, style="cyan")
+        return Text(line)
+
+    def action_focus_query(self) -> None:
+        self.set_focus(self.query_one("#config-query", Input))
+
+    def action_focus_edit(self) -> None:
+        self.set_focus(self.query_one("#config-edit", Input))
+
+    @on(Input.Submitted, "#config-edit")
+    def handle_edit(self, event: Input.Submitted) -> None:
+        key, sep, value = event.value.partition("=")
+        key, value = key.strip(), value.strip()
+        if not sep or not key:
+            self.app.notify("Use key=value or key=[value].", severity="warning")
+            return
+        value_type = "str"
+        if value.startswith("[") and value.endswith("]"):
+            value, value_type = value[1:-1].strip(), "list"
+        targets = [self.index.get(k) for k in sorted(self.marked)]
+        targets = [e for e in targets if e is not None]
+        if not targets:
+            self.app.notify("Mark the configs to edit with space.", severity="warning")
+            return
+        self.pending = preview_edit(targets, key, value, value_type)
+
+        log = self.query_one("#config-detail", RichLog)
+        log.clear()
+        if not self.pending:
+            log.write(f"No marked config would change: {escape(key)} already set.")
+            return
+        log.write(
+            f"[bold]Preview:[/] {len(self.pending)} of {len(targets)} configs change. "
+            "Press a to apply."
+        )
+        for change in self.pending:
+            for line in change.diff:
+                log.write(self.diff_line(line))
+        self.set_focus(self.query_one("#config-table"))
+
+    def action_apply_edit(self) -> None:
+        if not self.pending:
+            self.app.notify("Preview a bulk edit first.", severity="warning")
+            return
+        changes, self.pending = self.pending, []
+        self.app.push_screen(
+            BulkOperationScreen(
+                f"Set {changes[0].key} on {len(changes)} configs",
+                [bulk_ops.BulkItem(c.entry.key, c) for c in changes],
+                ConfigChange.apply,
+            )
+        )
+
+
+class InstanceManagementScreen(ListScreenTemplate):
+    def __init__(self):
+        super().__init__(
+            choice_dict={
+                "Bind An Instance": partial(InstanceSelectionScreen, flow_mode="bind"),
+                "Start an Instance": partial(
+                    InstanceSelectionScreen, flow_mode="start"
+                ),
+                "Stop An Instance": partial(InstanceSelectionScreen, flow_mode="stop"),
+                "Delete An Instance": partial(
+                    InstanceSelectionScreen, flow_mode="delete"
+                ),
+                "Past Task Runs": RunLogScreen,
+            },
+            header="Welcome to Tabsdata. Select an Option to get started below",
+        )
+
+
+class PortConfigScreen(Screen):
+    """
+    Screen that asks for:
+      - Instance name (for new instances)
+      - External port
+      - Internal port
+
+    Validation:
+      * Port 1–65535
+      * Port not in use by another running instance
+      * Internal port must not equal external port
+
+    Fields are checked in a background worker once typing pauses, on Enter
+    and on Submit, all against one instance snapshot per run.
+    """
+
+    CSS = """
+    * {
+        height: auto;
+    }
+    Screen {
+        layout: vertical;
+    }
+
+    #portscroll {
+        height: 1fr;
+        overflow-y: auto;
+    }
+
+    .input_container Input {
+    width: auto;
+    }
+
+Checkbox:focus > .toggle--button {
+    color: $accent;
+}
+
+
+    """
+
+    # Seconds typing must pause before the fields are checked.
+    VALIDATION_DEBOUNCE = 0.3
+
+    def __init__(self, instance) -> None:
+        super().__init__()
+        self.validation_timer = None
+        self.validation_generation = 0
+        self.submit_pending = False
+        # Who the suggested port pair is reserved for (see port_allocator).
+        self.port_owner = f"port-config:{os.getpid()}:{id(self)}"
+        if instance is None:
+            raise TypeError("PortConfigScreen requires an Instance object")
+
+        if instance.name == "_Create_Instance":
+            self.placeholder = "tabsdata"
+        else:
+            self.placeholder = instance.name
+        self.instance = instance
+
+    def compose(self) -> ComposeResult:
+        yield ExitBar()
+        yield VerticalScroll(
+            InstanceInfoPanel(),
+            Vertical(
+                Horizontal(
+                    Label(
+                        "Instance Name:",
+                        id="title-instance",
+                    ),
+                    Input(
+                        placeholder=self.placeholder,
+                        validate_on=[],
+                        disabled=True,
+                        validators=[
+                            input_validators.ValidInstanceName(self.app, self.instance)
+                        ],
+                        compact=True,
+                        id="instance-input",
+                        classes="inputs",
+                    ),
+                    Pretty("", id="instance-message"),
+                ),
+                id="instance-container",
+                classes="input_container",
+            ),
+            Vertical(
+                Horizontal(
+                    Label("External port:", id="ext-label"),
+                    Input(
+                        placeholder=str(self.instance.arg_ext or ""),
+                        restrict=r"\d*",
                         max_length=5,
                         compact=True,
-                        validate_on=["submitted"],
+                        validate_on=[],
                         validators=[
-                            input_validators.ValidExtPort(self.app, self.instance)
+                            input_validators.ValidExtPort(
+                                self.app, self.instance, port_owner=self.port_owner
+                            )
                         ],
                         id="ext-input",
                         classes="inputs",
@@ -1081,12 +2647,14 @@ Checkbox:focus > .toggle--button {
                     Label("Internal port:", id="int-label"),
                     Input(
                         placeholder=str(self.instance.arg_int or ""),
-                        validate_on=["submitted"],
+                        validate_on=[],
                         restrict=r"\d*",
                         compact=True,
                         max_length=5,
                         validators=[
-                            input_validators.ValidIntPort(self.app, self.instance)
+                            input_validators.ValidIntPort(
+                                self.app, self.instance, port_owner=self.port_owner
+                            )
                         ],
                         id="int-input",
                         classes="inputs",
@@ -1150,10 +2718,38 @@ Checkbox:focus > .toggle--button {
 
     def on_mount(self) -> None:
         self.set_visibility()
+        if self.instance.name == "_Create_Instance":
+            known = instance_ports(self.app.session.query(Instance).all())
+            self.suggest_ports(known)
 
     def on_screen_resume(self, event) -> None:
         self.set_visibility()
 
+    def on_unmount(self) -> None:
+        PORT_ALLOCATOR.release(self.port_owner)
+
+    @work(thread=True, exclusive=True, group="port-suggestion")
+    def suggest_ports(self, known: set[int]) -> None:
+        try:
+            pair = PORT_ALLOCATOR.reserve_pair(self.port_owner, known)
+        except OSError:
+            return
+        if pair is not None and not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self.prefill_ports, *pair)
+
+    def prefill_ports(self, ext_port: int, int_port: int) -> None:
+        """Offer the reserved pair as the defaults used when a port is left empty."""
+        for field_id, port in (("ext-input", ext_port), ("int-input", int_port)):
+            self.query_one(f"#{field_id}", Input).placeholder = str(port)
+        if any(
+            self.query_one(f"#{i}", Input).value for i in ("ext-input", "int-input")
+        ):
+            return
+        self.query_one("#ext-message", Pretty).update(
+            f"[Suggested free pair {ext_port}/{int_port}]"
+        )
+        self.query_one("#ext-message", Pretty).display = True
+
     def on_key(self, event):
         key_mapping = {"up": -1, "down": 1}
         if self.screen.focused not in self.input_fields:
@@ -1165,114 +2761,228 @@ Checkbox:focus > .toggle--button {
             )
             self.set_focus(self.input_fields[next_index])
 
-    def validate_input(self, input: Input, value):
-        if value == "":
-            value = input.placeholder
-        validation_result = input.validate(value)
-        return validation_result
+    def validated_fields(self) -> list[Input]:
+        fields = [i for i in self.query("Input") if len(i.validators) > 0]
+        if self.instance.name != "_Create_Instance":
+            fields = [i for i in fields if i.id != "instance-input"]
+        return fields
+
+    @on(Input.Changed, ".inputs")
+    def handle_input_changed(self, event: Input.Changed) -> None:
+        # Results of a run still going are for the old values: drop them, and
+        # wait for typing to pause before checking anything.
+        self.validation_generation += 1
+        if self.validation_timer is not None:
+            self.validation_timer.stop()
+        self.validation_timer = self.set_timer(
+            self.VALIDATION_DEBOUNCE, self.start_validation
+        )
 
-    @on(Input.Submitted, ".inputs")
-    def handle_input_submission(self, event: Input.Submitted):
-        value = event.value
-        input_widget = event.input
-        validation_result = self.validate_input(input_widget, value)
+    def start_validation(self, submitted: Input | None = None, submit=False) -> None:
+        """
+        Check every field in a worker against one instance snapshot. Results
+        of an earlier run that is still going are dropped.
+        """
+        if self.validation_timer is not None:
+            self.validation_timer.stop()
+            self.validation_timer = None
+        # A newer run replaces a pending submission, so it has to submit too.
+        submit = submit or self.submit_pending
+        self.submit_pending = submit
+        self.validation_generation += 1
+        # What gets checked is exactly what a successful run submits.
+        values = {i.id: i.value or i.placeholder for i in self.query("Input.inputs")}
+        values["https-checkbox"] = self.query_one("Checkbox.inputs").value or False
+        fields = self.validated_fields()
+        checks = {i.id: (i.validators[0], values[i.id]) for i in fields}
+        # While typing only fields with a value get a message; Enter on a
+        # field or the Submit button reports every field.
+        shown = {i.id for i in fields if i.value != ""}
+        if submitted is not None or submit:
+            shown = set(checks)
+        self.run_validation(
+            self.validation_generation,
+            checks,
+            shown,
+            None if submitted is None else submitted.id,
+            submit,
+            values,
+        )
 
-        if validation_result.is_valid == False:
-            self.app.notify(
-                f"❌ {validation_result.failure_descriptions}.",
-                severity="error",
+    @work(thread=True, exclusive=True, group="port-validation")
+    def run_validation(
+        self,
+        generation: int,
+        checks: dict[str, tuple],
+        shown: set[str],
+        submitted: str | None,
+        submit: bool,
+        values: dict[str, object],
+    ) -> None:
+        worker = get_current_worker()
+        snapshot = instance_checks.take_snapshot()
+        ext_port = checks["ext-input"][1] if "ext-input" in checks else None
+        results = {}
+        for field_id, (validator, value) in checks.items():
+            if worker.is_cancelled:
+                return
+            if field_id == "int-input":
+                result = validator.check(value, snapshot, ext_port=ext_port)
+            else:
+                result = validator.check(value, snapshot)
+            results[field_id] = result
+            self.app.call_from_thread(
+                self.show_validation, generation, field_id, result, field_id in shown
+            )
+        if not worker.is_cancelled:
+            self.app.call_from_thread(
+                self.finish_validation, generation, results, submitted, submit, values
             )
-            message = input_widget.parent.query_one("Pretty")
-            message.update(validation_result.failure_descriptions)
-            message.display = True
-        else:
-            message = input_widget.parent.query_one("Pretty")
-            message.update("[Validation Passed]")
-            message.display = True
-            key_event = Key(key="down", character=None)
-            self.on_key(key_event)
-        return
-
-    @on(Button.Pressed, "#submit-button")
-    def handle_submission_request(self, event: Button.Pressed):
-        fields = [i for i in self.query("Input") if len(i.validators) > 0]
 
-        if self.instance.name != "_Create_Instance":
-            fields = [i for i in fields if i.id != "instance-input"]
+    def show_validation(
+        self, generation: int, field_id: str, result: ValidationResult, shown: bool
+    ) -> None:
+        if generation != self.validation_generation:
+            return
+        input_widget = self.query_one(f"#{field_id}", Input)
+        message = input_widget.parent.query_one("Pretty")
+        if result.is_valid:
+            message.update("[Validation Passed]")
+        else:
+            message.update(result.failure_descriptions)
+        message.display = shown
 
-        validation_passed = True
-        new = {}
-        for i in fields:
-            i: Input
-            validation_result = self.validate_input(i, i.value)
-            if validation_result.is_valid is False:
+    def finish_validation(
+        self,
+        generation: int,
+        results: dict[str, ValidationResult],
+        submitted: str | None,
+        submit: bool,
+        values: dict[str, object],
+    ) -> None:
+        if generation != self.validation_generation:
+            return
+        self.submit_pending = False
+        failures = [r for r in results.values() if not r.is_valid]
+        if submitted is not None:
+            result = results[submitted]
+            if not result.is_valid:
                 self.app.notify(
-                    f"❌ {validation_result.failure_descriptions}.",
+                    f"❌ {result.failure_descriptions}.",
                     severity="error",
                 )
-                message = i.parent.query_one("Pretty")
-                message.update(validation_result.failure_descriptions)
-                message.display = True
-                validation_passed = False
             else:
-                message = i.parent.query_one("Pretty")
-                message.update("[Validation Passed]")
-                message.display = True
-
-        if validation_passed:
-            values = [
-                i.value if i.value != "" else i.placeholder
-                for i in self.query("Input.inputs")
-            ]
-            values.append(self.query_one("Checkbox.inputs").value or False)
-            new = {
-                "name": values[0] != self.instance.name,
-                "arg_ext": values[1] != self.instance.arg_ext,
-                "arg_int": values[2] != self.instance.arg_int,
-                "use_https": values[3] != self.instance.use_https,
-            }
-            self.instance.name = values[0]
-            self.instance.arg_ext = values[1]
-            self.instance.arg_int = values[2]
-            self.instance.use_https = values[3]
-            if self.app.flow_mode == "bind":
-                self.app.push_screen(
-                    BindAndStartInstance(current=self.instance, new=new)
+                self.on_key(Key(key="down", character=None))
+        if submit:
+            for result in failures:
+                self.app.notify(
+                    f"❌ {result.failure_descriptions}.",
+                    severity="error",
                 )
-            elif self.app.flow_mode == "start":
-                self.app.push_screen(StartInstance(current=self.instance, new=new))
+            if not failures:
+                self.submit_form(values)
+
+    @on(Input.Submitted, ".inputs")
+    def handle_input_submission(self, event: Input.Submitted):
+        self.start_validation(submitted=event.input)
 
+    @on(Button.Pressed, "#submit-button")
+    def handle_submission_request(self, event: Button.Pressed):
+        self.start_validation(submit=True)
 
-@dataclass
-class TaskSpec:
-    description: str
-    func: Callable[[str | None], Awaitable[None]]
-    background: bool = False
+    def submit_form(self, fields: dict[str, object]) -> None:
+        """Start the flow with the field values a validation run approved."""
+        values = [
+            fields[key]
+            for key in ("instance-input", "ext-input", "int-input", "https-checkbox")
+        ]
+        new = {
+            "name": values[0] != self.instance.name,
+            "arg_ext": values[1] != self.instance.arg_ext,
+            "arg_int": values[2] != self.instance.arg_int,
+            "use_https": values[3] != self.instance.use_https,
+        }
+        self.instance.name = values[0]
+        self.instance.arg_ext = values[1]
+        self.instance.arg_int = values[2]
+        self.instance.use_https = values[3]
+        if self.app.flow_mode == "bind":
+            self.app.push_screen(BindAndStartInstance(current=self.instance, new=new))
+        elif self.app.flow_mode == "start":
+            self.app.push_screen(StartInstance(current=self.instance, new=new))
 
 
 class TaskRow(Horizontal):
     def __init__(self, description: str, task_id: str) -> None:
         super().__init__(id=task_id, classes="task-row")
         self.description = description
+        self.started: float | None = None
+        self.elapsed: float | None = None
+        self.eta: float | None = None
+        self.attempt_note = ""
 
     def compose(self) -> ComposeResult:
         yield SpinnerWidget("dots", id=f"{self.id}-spinner", classes="task-spinner")
         yield Label(self.description, id=f"{self.id}-label", classes="task-label")
 
-    def set_running(self) -> None:
+    def set_running(self, eta: float | None = None) -> None:
+        self.started = time.perf_counter()
+        self.eta = eta
         self.query_one(f"#{self.id}-spinner").display = True
-        self.query_one(f"#{self.id}-label", Label).update(self.description)
+        self.tick()
+
+    def tick(self) -> None:
+        """Refresh the live elapsed time (and ETA) of a running task."""
+        if self.started is None or self.elapsed is not None:
+            return
+        text = f"{self.description}  {time.perf_counter() - self.started:.1f}s"
+        if self.eta is not None:
+            text += f" (usually ~{self.eta:.1f}s)"
+        self.query_one(f"#{self.id}-label", Label).update(text + self.attempt_note)
+
+    def set_attempt(self, attempt: int, max_attempts: int) -> None:
+        self.attempt_note = f" [attempt {attempt}/{max_attempts}]"
+        self.tick()
+
+    def took(self) -> str:
+        if self.started is None:
+            return ""
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.started
+        return f"  {self.elapsed:.1f}s{self.attempt_note}"
+
+    def set_critical(self, critical: bool) -> None:
+        self.set_class(critical, "task-critical")
+
+    def set_cancelled(self) -> None:
+        try:
+            self.query_one(f"#{self.id}-spinner").display = False
+            self.query_one(f"#{self.id}-label", Label).update(
+                f"⏹ {self.description} (cancelled){self.took()}"
+            )
+        except:
+            pass
+
+    def set_skipped(self, blocked_by: str | None = None) -> None:
+        try:
+            self.query_one(f"#{self.id}-spinner").display = False
+            reason = f" (skipped: {blocked_by} failed)" if blocked_by else ""
+            self.query_one(f"#{self.id}-label", Label).update(
+                f"⏭ {self.description}{reason}"
+            )
+        except:
+            pass
 
     def set_done(self, exit_code: Optional[int] = None) -> None:
         try:
             self.query_one(f"#{self.id}-spinner").display = False
             if exit_code == 0 or exit_code is None:
                 self.query_one(f"#{self.id}-label", Label).update(
-                    f"✅ {self.description}"
+                    f"✅ {self.description}{self.took()}"
                 )
             else:
                 self.query_one(f"#{self.id}-label", Label).update(
-                    f"❌ {self.description}"
+                    f"❌ {self.description}{self.took()}"
                 )
         except:
             pass
@@ -1281,6 +2991,8 @@ class TaskRow(Horizontal):
 class SequentialTasksScreenTemplate(Screen):
     BINDINGS = [
         ("enter", "press_close", "Done"),
+        ("h", "open_run_logs", "Past Runs"),
+        ("c", "cancel_tasks", "Cancel"),
     ]
 
     CSS = """
@@ -1291,6 +3003,8 @@ class SequentialTasksScreenTemplate(Screen):
         .task-row { height: 1; content-align: left middle; }
         .task-spinner { width: 3; }
         .task-label { padding-left: 1; }
+        .task-critical .task-label { text-style: bold; }
+        #critical-path { padding: 0 2; color: $text-muted; }
         #task-log { padding: 1 2; border: round $accent; overflow-y: auto; height: 20; width: 80%;}
         #task-box {align: center top;}
         VerticalScroll { height: 1fr; overflow-y: auto; }
@@ -1307,18 +3021,30 @@ class SequentialTasksScreenTemplate(Screen):
         "plum1",
     ]
 
+    CONCURRENCY = DEFAULT_CONCURRENCY
+
     def __init__(self, tasks: List[TaskSpec] | None = None) -> None:
         super().__init__()
         self.tasks = tasks or []
+        self.graph = TaskGraph(self.tasks)
         self.task_rows: List[TaskRow] = []
         self.log_widget: RichLog | None = None
+        self.log_buffer = LineCoalescer()
+        self._flush_timer = None
+        self.run_log: RunLog | None = None
+        self._run_task: asyncio.Task | None = None
+        self.cancel_requested = False
+        # CPU seconds of the child processes each task ran, by description.
+        self.cpu_seconds: dict[str, float] = {}
+        # Median past duration of each step, by task name.
+        self.medians: dict[str, float] = {}
+        # Last output lines of each task's current attempt, for retry patterns.
+        self.recent_output: dict[str, deque[str]] = {}
         self.task_colors = {
             task.description: random.choice(self.COLOR_PALETTE) for task in self.tasks
         }
 
-        # fail-fast state
         self.failed: bool = False
-        self._background_tasks: list[asyncio.Task] = []
 
     def compose(self) -> ComposeResult:
         for index, task in enumerate(self.tasks):
@@ -1330,6 +3056,7 @@ class SequentialTasksScreenTemplate(Screen):
             Vertical(
                 Label("Running setup tasks...", id="tasks-header"),
                 *self.task_rows,
+                Static("", id="critical-path"),
                 Static(""),
                 Container(
                     RichLog(
@@ -1347,22 +3074,71 @@ class SequentialTasksScreenTemplate(Screen):
 
     async def on_mount(self) -> None:
         self.log_widget = self.query_one("#task-log", RichLog)
+        # More lines than the widget keeps per frame would never be seen.
+        self.log_buffer.max_pending = self.log_widget.max_lines or 1000
+        try:
+            self.run_log = RunLog(type(self).__name__)
+        except OSError as e:
+            self.app.notify(f"Task output won't be saved: {e}", severity="warning")
+        session = getattr(self.app, "session", None)
+        try:
+            if session is not None:
+                self.medians = historical_medians(
+                    session, self.flow_name, self.instance_name
+                )
+        except SQLAlchemyError:
+            self.medians = {}
+        self.set_interval(0.5, self.tick_rows)
         self.log_line(None, "Starting setup tasks…")
-        asyncio.create_task(self.run_tasks())
+        self._run_task = asyncio.create_task(self.run_tasks())
+
+    @property
+    def flow_name(self) -> str:
+        return type(self).__name__
+
+    @property
+    def instance_name(self) -> str | None:
+        return getattr(getattr(self, "instance", None), "name", None)
+
+    @property
+    def step_instances(self) -> dict[str, str]:
+        """Instance of each step (by task name) that isn't `instance_name`."""
+        return {}
+
+    def tick_rows(self) -> None:
+        for row in self.task_rows:
+            row.tick()
+
+    def add_cpu(self, label: str | None, cpu: float | None) -> None:
+        if label is not None and cpu is not None:
+            self.cpu_seconds[label] = self.cpu_seconds.get(label, 0.0) + cpu
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "close-btn":
             self.app.push_screen(MainScreen())
 
-    def log_line(self, task: str | None, msg: str) -> None:
+    def log_line(self, task: str | None, msg: str, record: bool = True) -> None:
+        if record and self.run_log is not None:
+            self.run_log.write(task, msg)
         if task:
             color = self.task_colors.get(task, "white")
             line = f"[{color}][{task}]:[/] {msg}"
         else:
             line = msg
 
-        if self.log_widget:
-            self.log_widget.write(line)
+        # Lines are buffered and written once per frame by flush_log.
+        self.log_buffer.push(line)
+        if self._flush_timer is None and self.is_mounted:
+            self._flush_timer = self.set_timer(FLUSH_INTERVAL, self.flush_log)
+
+    def flush_log(self) -> None:
+        self._flush_timer = None
+        lines, elided = self.log_buffer.drain()
+        if self.log_widget is None or not (lines or elided):
+            return
+        if elided:
+            lines.insert(0, f"[dim]… {elided} lines elided[/]")
+        self.log_widget.write("\n".join(lines))
 
     async def run_logged_subprocess(
         self,
@@ -1371,80 +3147,89 @@ class SequentialTasksScreenTemplate(Screen):
     ) -> int:
         """Run a subprocess, stream its output into the log, and return exit code."""
         self.log_line(label, f"Running: {' '.join(args)}")
-
-        process = await asyncio.create_subprocess_exec(
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-        )
-
-        while True:
-            line = await process.stdout.readline()
-            if not line:
-                break
-            text = line.decode().rstrip("\n")
-            self.log_line(label, text)
-
-        code = await process.wait()
+        try:
+            code, cpu = await run_process(args, partial(self.log_output, label))
+        except asyncio.CancelledError:
+            self.log_output(label, b"")
+            self.log_line(label, "Terminated its process group")
+            raise
+        self.log_output(label, b"")
+        self.add_cpu(label, cpu)
         self.log_line(label, f"Exited with code {code}")
         return code
 
-    async def run_single_task(self, idx: int, task: TaskSpec) -> int | None:
+    def log_output(self, label: str | None, chunk: bytes) -> None:
+        """Log raw process output; an empty chunk flushes the partial line."""
+        recent = self.recent_output.get(label)
+        for text in self.log_buffer.split(label, chunk, final=not chunk):
+            if self.run_log is not None:
+                self.run_log.write(label, text)
+            if recent is not None:
+                recent.append(text)
+            self.log_line(label, escape(text), record=False)
+
+    async def run_single_task(self, task: TaskSpec) -> int | None:
         """
-        Run a single task and return its exit code.
+        Run a single task (with its retries) and return its exit code.
         Success = 0 or None.
         Failure = any other int.
         """
-        row = self.task_rows[idx]
-        row.set_running()
-        self.log_line(task.description, "Starting")
-        code: int | None = None
-
+        row = self.row_for(task)
+        row.set_running(self.medians.get(task.name))
+        code: int | None = 1
         try:
-            # allow task.func to return either None or an int
-            result = await task.func(task.description)
-            code = result if isinstance(result, int) else None
-            self.log_line(task.description, "Finished")
-        except Exception as e:
-            self.log_line(task.description, f"Error: {e!r}")
-            code = 1  # treat exception as failure
+            code = await run_task(
+                task, self.log_line, self.recent_output, on_retry=row.set_attempt
+            )
         finally:
             row.set_done(code)
-
         return code
 
-    async def abort_all_tasks(self) -> None:
-        """Fail-fast: cancel all background tasks and mark remaining rows as failed."""
-        if self.failed:
-            return  # idempotent
-
-        self.failed = True
-        self.log_line(None, "❌ Aborting remaining tasks due to failure.")
+    def row_for(self, task: TaskSpec) -> TaskRow:
+        return self.task_rows[self.tasks.index(task)]
 
-        # Cancel background tasks
-        for task in self._background_tasks:
-            if not task.done():
-                task.cancel()
-
-        # Mark any still-running rows as failed
-        for row in self.task_rows:
-            spinner = row.query_one(f"#{row.id}-spinner")
-            if getattr(spinner, "display", False):
-                # If spinner is still visible, treat it as failed
-                row.set_done(exit_code=1)
-
-        self.conclude_tasks()
+    def show_critical_path(
+        self, durations: dict[str, float] | None = None, kind: str = "estimated"
+    ) -> None:
+        """Highlight the longest dependency chain (estimated, or measured)."""
+        path, total = self.graph.critical_path(durations)
+        for task, row in zip(self.tasks, self.task_rows):
+            row.set_critical(task.name in path)
+        self.query_one("#critical-path", Static).update(
+            f"Critical path ({kind} {total:.1f}s): "
+            + " → ".join(self.graph.by_name(n).description for n in path)
+        )
 
-    async def _background_wrapper(self, idx: int, task: TaskSpec) -> None:
-        """Wrapper for background tasks so they can trigger fail-fast."""
-        try:
-            code = await self.run_single_task(idx, task)
-        except asyncio.CancelledError:
-            self.log_line(task.description, "Cancelled")
+    def record_timings(self, results) -> None:
+        session = getattr(self.app, "session", None)
+        if session is None:
             return
-
-        if code not in (0, None):
-            await self.abort_all_tasks()
+        run_id = self.run_log.run_id if self.run_log is not None else None
+        try:
+            record_results(
+                session,
+                run_id or f"{datetime.now():%Y%m%d-%H%M%S-%f}-{self.flow_name}",
+                self.flow_name,
+                self.instance_name,
+                results,
+                self.cpu_seconds,
+                self.step_instances,
+            )
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.app.notify(f"Task timings weren't saved: {e}", severity="warning")
+
+    def handle_task_update(self, result) -> None:
+        if result.status == TaskStatus.SKIPPED:
+            self.row_for(result.task).set_skipped(
+                self.graph.by_name(result.blocked_by).description
+            )
+            self.log_line(result.task.description, "Skipped")
+        elif result.status == TaskStatus.FAILED:
+            self.failed = True
+        elif result.status == TaskStatus.CANCELLED:
+            self.failed = True
+            self.row_for(result.task).set_cancelled()
 
     def action_press_close(self) -> None:
         # Only act if the button exists
@@ -1454,36 +3239,68 @@ class SequentialTasksScreenTemplate(Screen):
             return
         btn.press()
 
-    async def run_tasks(self) -> None:
-        # Start background tasks first
-        self._background_tasks = []
-        for i, t in enumerate(self.tasks):
-            if t.background:
-                self.log_line(t.description, "Scheduling background task")
-                self._background_tasks.append(
-                    asyncio.create_task(self._background_wrapper(i, t))
-                )
+    def action_open_run_logs(self) -> None:
+        self.app.push_screen(RunLogScreen())
 
-        # Run foreground tasks sequentially
-        for i, t in enumerate(self.tasks):
-            if self.failed:
-                break  # already failed; stop starting new tasks
+    @property
+    def tasks_finished(self) -> bool:
+        return self._run_task is None or self._run_task.done()
 
-            if not t.background:
-                code = await self.run_single_task(i, t)
-                if code not in (0, None):
-                    await self.abort_all_tasks()
-                    break
+    def check_action(self, action: str, parameters: tuple) -> bool | None:
+        if action == "cancel_tasks":
+            return not self.tasks_finished
+        return super().check_action(action, parameters)
 
-        # Wait for background tasks to finish / cancel
-        if self._background_tasks:
-            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+    def action_cancel_tasks(self) -> None:
+        if not self.tasks_finished and not self.cancel_requested:
+            self.log_line(None, "⏹ Cancelling running tasks…")
+            self.cancel_requested = True
+            self._run_task.cancel()
 
-        if self.failed:
-            self.log_line(None, "⚠️ Tasks aborted due to failure.")
+    def on_unmount(self) -> None:
+        # Leaving mid-run must not orphan the child processes.
+        if not self.tasks_finished:
+            self._run_task.cancel()
+        if self.run_log is not None:
+            self.run_log.close()
+
+    async def run_tasks(self) -> None:
+        """
+        Run the flow as a DAG: ready tasks start together (up to the
+        concurrency cap) and a failure only skips the tasks depending on it.
+        """
+        # Past runs give better estimates than the declared weights.
+        self.show_critical_path(self.medians)
+        try:
+            results = await self.graph.run(
+                self.run_single_task,
+                concurrency=self.CONCURRENCY,
+                on_update=self.handle_task_update,
+            )
+        except asyncio.CancelledError:
+            if not self.cancel_requested or not self.is_mounted:
+                raise
+            # Cancelled from the cancel key: children are gone, finish the screen.
+            asyncio.current_task().uncancel()
+            self.failed = True
+            self.log_line(None, "⏹ Tasks cancelled.")
         else:
+            # Tasks that never ran count as zero so they can't sit on the path.
+            self.show_critical_path(
+                {name: r.elapsed or 0.0 for name, r in results.items()}, kind="took"
+            )
+            self.record_timings(results)
+
+        if not self.failed:
             self.log_line(None, "🎉 All tasks complete.")
-            self.conclude_tasks()
+        elif not self.cancel_requested:
+            self.log_line(None, "⚠️ Some tasks failed; their dependents were skipped.")
+        # Flows wrap up (persist the instance, sync the DB) either way.
+        self.conclude_tasks()
+
+        if self.run_log is not None:
+            self.log_line(None, f"Full output saved to {self.run_log.path}")
+            self.run_log.close()
 
         # Show “Done” button either way
         footer = self.query_one(Footer)
@@ -1492,71 +3309,97 @@ class SequentialTasksScreenTemplate(Screen):
         button.focus()
 
 
-class BindAndStartInstance(SequentialTasksScreenTemplate):
-    def __init__(self, current, new) -> None:
-        self.instance = current
-        self.new = new
-        self.instance.working = True
+# flow_mode -> (verb, per-instance task, timeout, retry policy) for fleet
+# operations; timeouts match the same step in the single-instance flows.
+FLEET_OPERATIONS = {
+    "start": (
+        "Starting",
+        instance_tasks.connect_tabsdata,
+        instance_tasks.START_TIMEOUT,
+        instance_tasks.START_RETRY,
+    ),
+    "stop": (
+        "Stopping",
+        instance_tasks.stop_instance,
+        instance_tasks.STOP_TIMEOUT,
+        None,
+    ),
+    "delete": (
+        "Deleting",
+        instance_tasks.delete_instance,
+        instance_tasks.STOP_TIMEOUT,
+        None,
+    ),
+}
+
 
+class FleetOperationScreen(SequentialTasksScreenTemplate):
+    """
+    Runs one lifecycle operation across many instances. Every instance gets
+    its own independent task row and log prefix, at most CONCURRENCY run at
+    once, and the DB is synced from the filesystem once when all are done.
+    """
+
+    CONCURRENCY = int(os.environ.get("TDCONSOLE_FLEET_CONCURRENCY", "4"))
+
+    def __init__(self, flow_mode: str, instances: list[Instance]) -> None:
+        verb, operation, timeout, retry = FLEET_OPERATIONS[flow_mode]
+        self.instances = instances
+        # Single-instance flows read runner.new; fleet runs never change ports.
+        self.new = {
+            "name": False,
+            "arg_ext": False,
+            "arg_int": False,
+            "use_https": False,
+        }
         tasks = [
             TaskSpec(
-                "Preparing Instance",
-                partial(instance_tasks.prepare_instance, self, self.instance),
-            ),
-            TaskSpec(
-                "Binding Ports",
-                partial(instance_tasks.bind_ports, self, self.instance),
-            ),
-            TaskSpec(
-                "Connecting to Tabsdata instance",
-                partial(instance_tasks.connect_tabsdata, self, self.instance),
-            ),
-            TaskSpec(
-                "Checking Server Status",
-                partial(instance_tasks.run_tdserver_status, self, self.instance),
-            ),
-            TaskSpec(
-                "Logging you In",
-                partial(instance_tasks.tabsdata_login, self, self.instance),
-            ),
+                f"{verb} {instance.name}",
+                partial(operation, self, instance),
+                depends_on=[],
+                timeout=timeout,
+                retry=retry,
+            )
+            for instance in instances
         ]
-
         super().__init__(tasks)
 
-    def conclude_tasks(self, status=None):
+    @property
+    def step_instances(self) -> dict[str, str]:
+        return {
+            task.name: instance.name
+            for task, instance in zip(self.tasks, self.instances)
+        }
+
+    def refresh_instances(self) -> None:
+        sync_filesystem_instances_to_db(app=self.app)
+        self.log_line(None, f"Refreshed {len(self.instances)} instances in the DB.")
+
+    def conclude_tasks(self) -> None:
         super().conclude_tasks()
-        self.instance.working = True
-        merged_instance = self.app.session.merge(self.instance)
-        self.app.session.commit()
-        self.app.working_instance = merged_instance
+        self.refresh_instances()
 
 
-class StartInstance(SequentialTasksScreenTemplate):
+class BindAndStartInstance(SequentialTasksScreenTemplate):
     def __init__(self, current, new) -> None:
         self.instance = current
         self.new = new
         self.instance.working = True
+        super().__init__(instance_flows.bind_and_start_tasks(self, self.instance))
 
-        tasks = [
-            TaskSpec(
-                "Preparing Instance",
-                partial(instance_tasks.prepare_instance, self, self.instance),
-            ),
-            TaskSpec(
-                "Binding Ports",
-                partial(instance_tasks.bind_ports, self, self.instance),
-            ),
-            TaskSpec(
-                "Connecting to Tabsdata instance",
-                partial(instance_tasks.connect_tabsdata, self, self.instance),
-            ),
-            TaskSpec(
-                "Checking Server Status",
-                partial(instance_tasks.run_tdserver_status, self, self.instance),
-            ),
-        ]
+    def conclude_tasks(self, status=None):
+        super().conclude_tasks()
+        self.app.working_instance = instance_flows.finish_flow(
+            self.app.session, self.instance, working=True
+        )
 
-        super().__init__(tasks)
+
+class StartInstance(SequentialTasksScreenTemplate):
+    def __init__(self, current, new) -> None:
+        self.instance = current
+        self.new = new
+        self.instance.working = True
+        super().__init__(instance_flows.start_tasks(self, self.instance))
 
 
 class StopInstance(SequentialTasksScreenTemplate):
@@ -1564,29 +3407,11 @@ class StopInstance(SequentialTasksScreenTemplate):
         self.instance = current
         self.new = new
         self.instance.working = False
-
-        tasks = [
-            TaskSpec(
-                "Preparing Instance",
-                partial(instance_tasks.prepare_instance, self, self.instance),
-            ),
-            TaskSpec(
-                "Stopping Tabsdata instance",
-                partial(instance_tasks.stop_instance, self, self.instance),
-            ),
-            TaskSpec(
-                "Checking Server Status",
-                partial(instance_tasks.run_tdserver_status, self, self.instance),
-            ),
-        ]
-
-        super().__init__(tasks)
+        super().__init__(instance_flows.stop_tasks(self, self.instance))
 
     def conclude_tasks(self):
         super().conclude_tasks()
-        self.instance.working = False
-        self.app.session.merge(self.instance)
-        self.app.session.commit()
+        instance_flows.finish_flow(self.app.session, self.instance, working=False)
 
 
 class DeleteInstance(SequentialTasksScreenTemplate):
@@ -1594,29 +3419,11 @@ class DeleteInstance(SequentialTasksScreenTemplate):
         self.instance = current
         self.new = new
         self.instance.working = False
-
-        tasks = [
-            TaskSpec(
-                "Preparing Instance",
-                partial(instance_tasks.prepare_instance, self, self.instance),
-            ),
-            TaskSpec(
-                "Deleting Tabsdata instance",
-                partial(instance_tasks.delete_instance, self, self.instance),
-            ),
-            TaskSpec(
-                "Checking Server Status",
-                partial(instance_tasks.run_tdserver_status, self, self.instance),
-            ),
-        ]
-
-        super().__init__(tasks)
+        super().__init__(instance_flows.delete_tasks(self, self.instance))
 
     def conclude_tasks(self):
         super().conclude_tasks()
-        self.instance.working = False
-        self.app.session.merge(self.instance)
-        self.app.session.commit()
+        instance_flows.finish_flow(self.app.session, self.instance, working=False)
 
 
 class PyOnlyDirectoryTree(DirectoryTree):
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from tdconsole.core.catalog_cache import CatalogCache, NameSet
+from tdconsole.core.stub_server import StubTabsdataServer
+
+
+def test_taken_lists_once_while_fresh():
+    calls = []
+    names = NameSet(lambda: calls.append(1) or ["a"], ttl=60)
+    assert names.taken("a")
+    assert not names.taken("b")
+    assert len(calls) == 1
+
+
+def test_taken_relists_a_stale_set():
+    listing = ["a"]
+    names = NameSet(lambda: list(listing), ttl=60)
+    names.refresh()
+    listing.append("b")
+    assert "b" not in names
+    names.mark_stale()
+    assert names.taken("b")
+
+
+def test_edits_during_a_refresh_are_replayed_on_its_result():
+    listing_started, release = threading.Event(), threading.Event()
+
+    def slow_lister():
+        listing_started.set()
+        release.wait(5)
+        return ["old", "doomed"]
+
+    names = NameSet(slow_lister, ttl=60)
+    refresh = threading.Thread(target=names.refresh)
+    refresh.start()
+    listing_started.wait(5)
+    names.add("new")
+    names.discard("doomed")
+    release.set()
+    refresh.join(5)
+    assert "new" in names and "old" in names
+    assert "doomed" not in names
+
+
+def test_catalog_cache_shares_collection_names_with_listings():
+    stub = StubTabsdataServer(collections=3)
+    cache = CatalogCache(stub)
+    first = cache.list("collections")[0].name
+    assert cache.collection_names.taken(first)
+    assert stub.calls == {"list_collections": 1}
+    cache.invalidate("collections")
+    assert cache.collection_names.stale
+    assert first in cache.collection_names
+
+
+def test_validator_fallback_reuses_its_name_set():
+    pytest.importorskip("tabsdata")
+    from types import SimpleNamespace
+
+    from tdconsole.core.input_validators import ValidCollectionName
+
+    stub = StubTabsdataServer(collections=3)
+    validator = ValidCollectionName(SimpleNamespace(), stub)
+    for _ in range(5):
+        validator.validate("free_name")
+    assert stub.calls["list_collections"] == 1
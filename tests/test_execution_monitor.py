@@ -0,0 +1,57 @@
+from tdconsole.core.execution_monitor import (
+    AdaptiveBackoff,
+    ExecutionMonitor,
+    MonitorRecord,
+    MonitorStore,
+)
+
+
+def record(id, status, triggered_on, ended_on=None):
+    return MonitorRecord.from_server(
+        "executions",
+        {
+            "id": id,
+            "name": f"f{id}",
+            "status": status,
+            "triggered_on": triggered_on,
+            "ended_on": ended_on,
+        },
+    )
+
+
+def test_unknown_status_with_an_end_is_terminal():
+    assert not record(1, "Stalled", 100, ended_on=200).active
+    assert not record(2, "Unexpected", 100, ended_on=200).active
+    assert record(3, "Scheduled", 100).active
+    assert not record(4, "Failed", 100).active
+
+
+def test_finished_record_with_unknown_status_does_not_pin_the_cursor():
+    store = MonitorStore()
+    store.merge([record(1, "Stalled", 100, ended_on=150), record(2, "Done", 300)])
+    assert store.active() == []
+    assert store.cursor("executions") == 300
+
+
+def test_running_record_pins_the_cursor():
+    store = MonitorStore()
+    store.merge([record(1, "Running", 100), record(2, "Done", 300)])
+    assert store.cursor("executions") == 100
+
+
+class Server:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def list_executions(self, filter=None):
+        return self.rows
+
+
+def test_poller_backs_off_once_everything_has_ended():
+    server = Server([{"id": 1, "status": "Error", "triggered_on": 1, "ended_on": 2}])
+    monitor = ExecutionMonitor(
+        server, kinds=["executions"], backoff=AdaptiveBackoff(1, 8, 2)
+    )
+    intervals = [monitor.poll()[1] for _ in range(4)]
+    # The first poll sees a change; after that the instance is idle.
+    assert intervals == [1, 2, 4, 8]
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from tdconsole.core.instance_flows import bind_and_start_tasks, start_tasks
+from tdconsole.core.task_graph import TaskGraph
+
+
+def max_overlap(graph: TaskGraph) -> dict[str, set[str]]:
+    """Run the graph with dummy steps; which steps ran alongside which."""
+    running: set[str] = set()
+    overlaps: dict[str, set[str]] = {}
+
+    async def run_one(task):
+        running.add(task.name)
+        for name in running:
+            overlaps.setdefault(name, set()).update(running - {name})
+        await asyncio.sleep(0.01)
+        running.discard(task.name)
+        return 0
+
+    asyncio.run(graph.run(run_one, concurrency=4))
+    return overlaps
+
+
+@pytest.mark.parametrize("build", [bind_and_start_tasks, start_tasks])
+def test_status_check_runs_alongside_the_readiness_wait(build):
+    graph = TaskGraph(build(None, None))
+    assert graph.deps["ready"] == ("start",)
+    assert graph.deps["status"] == ("start",)
+    assert "ready" in max_overlap(graph)["status"]
+
+
+def test_login_waits_for_the_server():
+    graph = TaskGraph(bind_and_start_tasks(None, None))
+    assert graph.deps["login"] == ("ready",)
+    assert graph.critical_path()[0] == ["prepare", "bind", "start", "ready", "login"]
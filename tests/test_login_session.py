@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from tdconsole.core import login_session
+from tdconsole.core.login_session import (
+    forget_login,
+    record_login,
+    reusable_login,
+    token_expiry,
+)
+
+NOW = 1_800_000_000
+
+
+def jwt(**claims) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=")
+    return f"e30.{payload.decode()}.sig"
+
+
+def instance(name="dev", port=2457):
+    return SimpleNamespace(name=name, arg_ext=port, use_https=False, public_ip=None)
+
+
+@pytest.fixture
+def files(tmp_path):
+    return tmp_path / "connection.json", tmp_path / "session.json"
+
+
+def save_login(files, exp=NOW + 3600, url="http://127.0.0.1:2457", name="dev"):
+    connection, session = files
+    connection.write_text(json.dumps({"url": url, "access_token": jwt(exp=exp)}))
+    record_login(instance(name), connection, session)
+
+
+def test_expiry_is_the_token_that_expires_first():
+    connection = {
+        "url": "http://127.0.0.1:2457",
+        "refresh_token": jwt(exp=NOW + 86400),
+        "access_token": jwt(exp=NOW + 600),
+    }
+    assert token_expiry(connection) == NOW + 600
+
+
+def test_expiry_in_milliseconds_and_iso():
+    assert token_expiry({"t": jwt(exp=(NOW + 5) * 1000)}) == NOW + 5
+    iso = datetime.fromtimestamp(NOW + 5, timezone.utc).isoformat()
+    assert token_expiry({"t": jwt(exp=iso.replace("+00:00", "Z"))}) == NOW + 5
+
+
+def test_no_readable_expiry():
+    assert token_expiry({"t": "not-a-jwt", "u": jwt(sub="x")}) is None
+
+
+def test_fresh_login_is_reused(files):
+    save_login(files)
+    assert reusable_login(instance(), *files, now=NOW)[0]
+
+
+def test_expiring_token_is_not_reused(files):
+    save_login(files, exp=NOW + login_session.EXPIRY_MARGIN)
+    assert reusable_login(instance(), *files, now=NOW) == (
+        False,
+        "saved session has expired",
+    )
+
+
+def test_login_for_another_instance_on_the_same_port_is_not_reused(files):
+    save_login(files, name="old")
+    reusable, reason = reusable_login(instance("new"), *files, now=NOW)
+    assert not reusable
+    assert "old" in reason
+
+
+def test_rewritten_connection_is_not_reused(files):
+    save_login(files)
+    connection, _ = files
+    connection.write_text(
+        json.dumps({"url": "http://127.0.0.1:2457", "token": jwt(exp=NOW + 7200)})
+    )
+    assert not reusable_login(instance(), *files, now=NOW)[0]
+
+
+def test_login_to_another_port_is_not_reused(files):
+    save_login(files, url="http://127.0.0.1:9999")
+    assert not reusable_login(instance(), *files, now=NOW)[0]
+
+
+def test_forget_login_only_for_its_instance(files):
+    save_login(files)
+    _, session = files
+    forget_login(instance("other"), session)
+    assert session.exists()
+    forget_login(instance("dev"), session)
+    assert not session.exists()
+    forget_login(None, session)
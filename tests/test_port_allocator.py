@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tdconsole.core import port_allocator
+from tdconsole.core.port_allocator import (
+    HIGHEST_PORT,
+    LOWEST_PORT,
+    PortAllocator,
+    bitmap,
+    first_free_pair,
+    instance_ports,
+)
+
+
+def test_bitmap_sets_one_bit_per_port():
+    assert bitmap([0, 3, 3]) == 0b1001
+
+
+def test_first_free_pair_skips_taken_ports():
+    assert first_free_pair(bitmap([]), 2457) == 2457
+    assert first_free_pair(bitmap([2458]), 2457) == 2459
+    assert first_free_pair(bitmap([2457, 2460]), 2457) == 2458
+
+
+def test_first_free_pair_wraps_round():
+    taken = bitmap(range(3000, HIGHEST_PORT + 1))
+    assert first_free_pair(taken, 3000) == LOWEST_PORT
+
+
+def test_first_free_pair_never_runs_past_the_last_port():
+    taken = bitmap(range(LOWEST_PORT, HIGHEST_PORT))
+    assert first_free_pair(taken, LOWEST_PORT) is None
+
+
+def test_instance_ports_reads_every_address():
+    inst = SimpleNamespace(
+        arg_ext=2457, arg_int="2458", cfg_ext="127.0.0.1:3000", cfg_int=None
+    )
+    assert instance_ports([inst]) == {2457, 2458, 3000}
+
+
+@pytest.fixture
+def allocator(tmp_path, monkeypatch):
+    monkeypatch.setattr(port_allocator, "listening_ports", set)
+    return PortAllocator(tmp_path / "reservations.json")
+
+
+def test_reservations_keep_flows_apart(allocator):
+    assert allocator.reserve_pair("a", known={2457}) == (2458, 2459)
+    assert allocator.reserve_pair("b", known={2457}) == (2460, 2461)
+    assert allocator.reserved_by_others("a") == {2460: "b", 2461: "b"}
+
+
+def test_reserving_again_gives_up_the_old_pair(allocator):
+    allocator.reserve_pair("a", start=3000)
+    assert allocator.reserve_pair("a", start=4000) == (4000, 4001)
+    assert set(allocator.reserved_by_others()) == {4000, 4001}
+
+
+def test_release_frees_the_pair(allocator):
+    allocator.reserve_pair("a")
+    allocator.release("a")
+    assert allocator.reserved_by_others() == {}
+    assert allocator.reserve_pair("b") == (2457, 2458)
+
+
+def test_expired_reservations_lapse(tmp_path, monkeypatch):
+    monkeypatch.setattr(port_allocator, "listening_ports", set)
+    allocator = PortAllocator(tmp_path / "reservations.json", ttl=-1)
+    allocator.reserve_pair("a")
+    assert allocator.reserved_by_others() == {}
@@ -0,0 +1,46 @@
+from tdconsole.core import run_logs
+from tdconsole.core.run_logs import LineIndex, RunLog, list_runs, prune_runs
+
+
+def make_runs(log_dir, cache_dir, run_ids):
+    log_dir.mkdir(exist_ok=True)
+    cache_dir.mkdir(exist_ok=True)
+    for run_id in run_ids:
+        (log_dir / f"{run_id}.log").write_text("line\n")
+        (cache_dir / f"{run_id}.log").write_text("line\n")
+
+
+def test_prune_gzips_old_runs_and_drops_their_replay_copies(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_logs, "MAX_RUNS", 2)
+    monkeypatch.setattr(run_logs, "KEEP_PLAIN_RUNS", 1)
+    logs, cache = tmp_path / "runs", tmp_path / "cache"
+    make_runs(logs, cache, ["r1", "r2", "r3"])
+    (cache / "gone.log").write_text("orphan\n")
+
+    prune_runs(logs, cache)
+
+    assert sorted(p.name for p in logs.iterdir()) == ["r2.log.gz", "r3.log"]
+    assert sorted(p.name for p in cache.iterdir()) == ["r2.log", "r3.log"]
+
+
+def test_opening_a_run_log_does_not_prune(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_logs, "MAX_RUNS", 1)
+    monkeypatch.setattr(run_logs, "KEEP_PLAIN_RUNS", 0)
+    logs = tmp_path / "runs"
+    make_runs(logs, tmp_path / "cache", ["r1", "r2"])
+
+    log = RunLog("flow", log_dir=logs)
+    log.close()
+
+    assert len(list_runs(logs)) == 3
+    assert not any(p.suffix == ".gz" for p in logs.iterdir())
+
+
+def test_line_index_reads_pages_lazily(tmp_path):
+    path = tmp_path / "run.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    index = LineIndex(path)
+    assert index.lines(10, 2) == ["line 10", "line 11"]
+    assert not index.complete
+    assert index.ensure() == 1000
+    index.close()
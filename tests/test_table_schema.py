@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from tdconsole.core.db import _drop_stale_caches
+from tdconsole.core.models import Base
+from tdconsole.core.table_schema import (
+    cached_schema,
+    invalidate_schemas,
+    store_schema,
+)
+
+COLUMNS = [{"name": "id", "type": "Int64"}]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_schema_without_a_version_is_cached(session):
+    store_schema(session, "dev", "sales", "orders", None, COLUMNS)
+    assert cached_schema(session, "dev", "sales", "orders", None) == COLUMNS
+
+
+def test_schema_without_an_instance_is_cached(session):
+    store_schema(session, None, "sales", "orders", None, COLUMNS)
+    assert cached_schema(session, None, "sales", "orders") == COLUMNS
+
+
+def test_other_version_is_a_miss(session):
+    store_schema(session, "dev", "sales", "orders", "1", COLUMNS)
+    assert cached_schema(session, "dev", "sales", "orders", "1") == COLUMNS
+    assert cached_schema(session, "dev", "sales", "orders", "2") is None
+
+
+def test_invalidate_one_collection(session):
+    store_schema(session, "dev", "sales", "orders", None, COLUMNS)
+    store_schema(session, "dev", "hr", "staff", None, COLUMNS)
+    store_schema(session, "prod", "sales", "orders", None, COLUMNS)
+    assert invalidate_schemas(session, "dev", "sales") == 1
+    assert cached_schema(session, "dev", "sales", "orders") is None
+    assert cached_schema(session, "dev", "hr", "staff") == COLUMNS
+    assert cached_schema(session, "prod", "sales", "orders") == COLUMNS
+
+
+def test_invalidate_instance(session):
+    store_schema(session, "dev", "sales", "orders", None, COLUMNS)
+    store_schema(session, "dev", "hr", "staff", None, COLUMNS)
+    assert invalidate_schemas(session, "dev") == 2
+
+
+def test_cache_with_old_primary_key_is_recreated():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE table_schemas (instance_name VARCHAR, "
+                "collection_name VARCHAR, table_name VARCHAR, table_version VARCHAR, "
+                "columns TEXT, fetched_at DATETIME, PRIMARY KEY (instance_name, "
+                "collection_name, table_name, table_version))"
+            )
+        )
+    _drop_stale_caches(engine)
+    Base.metadata.create_all(engine)
+    key = inspect(engine).get_pk_constraint("table_schemas")["constrained_columns"]
+    assert key == ["instance_name", "collection_name", "table_name"]
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tabsdata")
+
+from tdconsole.core import tabsdata_api  # noqa: E402
+from tdconsole.core.api_metrics import InstrumentedServer  # noqa: E402
+
+
+def make_app():
+    notes = []
+    app = SimpleNamespace(
+        working_instance=None,
+        notify=lambda message, **kwargs: notes.append(message),
+    )
+    return app, notes
+
+
+def test_stub_server_needs_no_instance(monkeypatch):
+    monkeypatch.setenv("TDCONSOLE_STUB_SERVER", "collections=2")
+    app, notes = make_app()
+    server = tabsdata_api.initialize_tabsdata_server_connection(app)
+    assert isinstance(server, InstrumentedServer)
+    assert len(server.list_collections()) == 2
+    assert notes == []
+
+
+def test_bad_stub_spec_is_reported(monkeypatch):
+    monkeypatch.setenv("TDCONSOLE_STUB_SERVER", "collections")
+    app, notes = make_app()
+    assert tabsdata_api.initialize_tabsdata_server_connection(app) is None
+    assert "TDCONSOLE_STUB_SERVER" in notes[0]
+
+
+def test_no_stub_and_no_instance_is_no_server(monkeypatch):
+    monkeypatch.delenv("TDCONSOLE_STUB_SERVER", raising=False)
+    app, notes = make_app()
+    assert tabsdata_api.initialize_tabsdata_server_connection(app) is None
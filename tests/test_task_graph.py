@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from tdconsole.core.task_graph import RetryPolicy, TaskGraph, TaskSpec, TaskStatus
+
+
+def step(name, depends_on=None, **kwargs):
+    return TaskSpec(name, None, depends_on=depends_on, **kwargs)
+
+
+def run(graph, codes, concurrency=4):
+    started = []
+
+    async def run_one(task):
+        started.append(task.name)
+        await asyncio.sleep(0)
+        code = codes.get(task.name, 0)
+        if isinstance(code, Exception):
+            raise code
+        return code
+
+    results = asyncio.run(graph.run(run_one, concurrency=concurrency))
+    return {name: r.status for name, r in results.items()}, started
+
+
+def test_plain_list_runs_in_order():
+    graph = TaskGraph([step("a"), step("b"), step("c")])
+    assert graph.deps == {"a": (), "b": ("a",), "c": ("b",)}
+
+
+def test_background_task_has_no_implicit_dependency():
+    graph = TaskGraph([step("a"), step("bg", background=True), step("b")])
+    assert graph.deps == {"a": (), "bg": (), "b": ("a",)}
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        TaskGraph([step("a", ["x"])])
+    with pytest.raises(ValueError, match="cycle"):
+        TaskGraph([step("a", ["b"]), step("b", ["a"])])
+
+
+def test_failure_skips_only_its_dependents():
+    graph = TaskGraph(
+        [step("a", []), step("b", ["a"]), step("c", ["b"]), step("d", [])]
+    )
+    statuses, started = run(graph, {"a": 2})
+    assert statuses == {
+        "a": TaskStatus.FAILED,
+        "b": TaskStatus.SKIPPED,
+        "c": TaskStatus.SKIPPED,
+        "d": TaskStatus.SUCCEEDED,
+    }
+    assert sorted(started) == ["a", "d"]
+
+
+def test_exception_is_a_failure():
+    graph = TaskGraph([step("a"), step("b")])
+    statuses, _ = run(graph, {"a": RuntimeError("boom")})
+    assert statuses == {"a": TaskStatus.FAILED, "b": TaskStatus.SKIPPED}
+
+
+def test_independent_tasks_start_together():
+    graph = TaskGraph([step("a", []), step("b", []), step("c", ["a", "b"])])
+    _, started = run(graph, {})
+    assert started[:2] == ["a", "b"] and started[2] == "c"
+
+
+def test_critical_path_follows_the_longest_chain():
+    graph = TaskGraph(
+        [step("a", [], weight=1), step("b", ["a"], weight=5), step("c", ["a"])]
+    )
+    assert graph.critical_path() == (["a", "b"], 6.0)
+    assert graph.critical_path({"c": 10}) == (["a", "c"], 11.0)
+
+
+def test_retry_policy_classifies_failures():
+    any_failure = RetryPolicy(max_attempts=2)
+    assert any_failure.should_retry(1, 1)
+    assert not any_failure.should_retry(2, 1)
+    assert not any_failure.should_retry(1, 0)
+
+    selective = RetryPolicy(retry_codes=frozenset({124}), retry_output=("refused",))
+    assert selective.should_retry(1, 124)
+    assert selective.should_retry(1, 1, ["connection refused"])
+    assert not selective.should_retry(1, 1, ["bad password"])
+
+
+def test_retry_delay_backs_off_to_its_cap():
+    policy = RetryPolicy(initial_delay=1, factor=3, max_delay=5)
+    assert [policy.delay(n) for n in (1, 2, 3)] == [1, 3, 5]
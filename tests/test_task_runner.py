@@ -0,0 +1,81 @@
+import asyncio
+
+from tdconsole.core.task_graph import TIMEOUT_EXIT_CODE, RetryPolicy, TaskSpec
+from tdconsole.core.task_runner import run_attempt, run_task
+
+
+def run(spec: TaskSpec) -> tuple[int | None, list[str]]:
+    lines = []
+    code = asyncio.run(run_attempt(spec, lambda task, msg: lines.append(msg)))
+    return code, lines
+
+
+def test_step_finishes_with_its_code():
+    async def step(label):
+        return 3
+
+    assert run(TaskSpec("step", step))[0] == 3
+
+
+def test_deadline_is_a_timeout():
+    async def step(label):
+        await asyncio.sleep(10)
+
+    code, lines = run(TaskSpec("step", step, timeout=0.05))
+    assert code == 124
+    assert lines[-1] == "Timed out after 0.05s"
+
+
+def test_timeout_raised_by_step_is_a_failure_without_deadline():
+    async def step(label):
+        raise TimeoutError("read timed out")
+
+    code, lines = run(TaskSpec("step", step, timeout=None))
+    assert code == 1
+    assert "read timed out" in lines[-1]
+
+
+def test_timeout_raised_by_step_is_a_failure_before_deadline():
+    async def step(label):
+        raise asyncio.TimeoutError("socket")
+
+    assert run(TaskSpec("step", step, timeout=30))[0] == 1
+
+
+def retried(spec: TaskSpec) -> int:
+    attempts = []
+    func = spec.func
+
+    async def step(label):
+        attempts.append(label)
+        return await func(label)
+
+    spec = TaskSpec(spec.description, step, timeout=spec.timeout, retry=spec.retry)
+    asyncio.run(run_task(spec, lambda task, msg: None, {}))
+    return len(attempts)
+
+
+def test_deadline_timeout_is_retried_by_exit_code():
+    async def step(label):
+        await asyncio.sleep(10)
+
+    policy = RetryPolicy(
+        max_attempts=2,
+        initial_delay=0,
+        retry_codes=frozenset({TIMEOUT_EXIT_CODE}),
+        retry_output=(r"never",),
+    )
+    assert retried(TaskSpec("step", step, timeout=0.05, retry=policy)) == 2
+
+
+def test_timeout_raised_by_step_is_not_retried_as_a_timeout():
+    async def step(label):
+        raise TimeoutError("read timed out")
+
+    policy = RetryPolicy(
+        max_attempts=3,
+        initial_delay=0,
+        retry_codes=frozenset({TIMEOUT_EXIT_CODE}),
+        retry_output=(r"never",),
+    )
+    assert retried(TaskSpec("step", step, timeout=30, retry=policy)) == 1
@@ -0,0 +1,79 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from tdconsole.core.models import Base, TaskRun
+from tdconsole.core.task_graph import TaskResult, TaskSpec, TaskStatus
+from tdconsole.core.task_runner import run_process
+from tdconsole.core.task_timing import historical_medians, record_results
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_runs(session, step, instance, seconds, start=datetime(2026, 1, 1)):
+    for offset, wall in enumerate(seconds):
+        session.add(
+            TaskRun(
+                run_id=f"{step}-{instance}-{offset}",
+                flow="Flow",
+                step=step,
+                instance_name=instance,
+                status=TaskStatus.SUCCEEDED.value,
+                started_at=start + timedelta(minutes=offset),
+                wall_seconds=wall,
+            )
+        )
+    session.commit()
+
+
+def test_medians_use_the_latest_runs_on_this_instance(session):
+    # Oldest first: only the last three count with limit=3.
+    add_runs(session, "start", "a", [100, 100, 1, 2, 3])
+    add_runs(session, "start", "b", [50, 50, 50])
+    assert historical_medians(session, "Flow", "a", limit=3) == {"start": 2}
+
+
+def test_medians_fall_back_to_the_latest_runs_anywhere(session):
+    add_runs(session, "start", "a", [100, 5])
+    add_runs(session, "start", "b", [7], start=datetime(2026, 2, 1))
+    assert historical_medians(session, "Flow", "c", limit=2) == {"start": 6}
+
+
+def test_fleet_steps_record_their_own_instance(session):
+    results = {}
+    for name in ("a", "b"):
+        task = TaskSpec(f"Starting {name}", None)
+        results[task.name] = TaskResult(
+            task,
+            status=TaskStatus.SUCCEEDED,
+            code=0,
+            started_at=datetime(2026, 1, 1),
+            elapsed=1.0,
+        )
+    rows = record_results(
+        session,
+        "run",
+        "FleetOperationScreen",
+        None,
+        results,
+        step_instances={"Starting a": "a", "Starting b": "b"},
+    )
+    assert [row.instance_name for row in rows] == ["a", "b"]
+
+
+def test_cpu_of_a_quiet_child_is_sampled():
+    # Prints nothing until it exits, like tdserver start.
+    busy = "import time\nend = time.process_time() + 0.5\nwhile time.process_time() < end: pass"
+    code, cpu = asyncio.run(run_process([sys.executable, "-c", busy], lambda c: None))
+    assert code == 0
+    assert cpu is not None and cpu >= 0.2
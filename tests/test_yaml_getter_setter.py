@@ -0,0 +1,66 @@
+import yaml
+
+from tdconsole.core import yaml_getter_setter
+from tdconsole.core.yaml_getter_setter import ConfigTransaction
+
+
+def write(path, data):
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def test_edits_are_written_together_in_key_order(tmp_path):
+    config = tmp_path / "config.yaml"
+    write(config, {"addresses": ["127.0.0.1:1"], "name": "dev"})
+    with ConfigTransaction(config) as tx:
+        tx.set("addresses", "127.0.0.1:2457", "list")
+        tx.append("extra", "x")
+    assert tx.result.ok
+    assert list(yaml.safe_load(config.read_text()).items()) == [
+        ("addresses", ["127.0.0.1:2457"]),
+        ("name", "dev"),
+        ("extra", ["x"]),
+    ]
+
+
+def test_one_bad_edit_writes_nothing(tmp_path):
+    config = tmp_path / "config.yaml"
+    write(config, {"name": "dev"})
+    before = config.read_text()
+    result = (
+        ConfigTransaction(config)
+        .set("addresses", "127.0.0.1:2457", "list")
+        .append("name", "x")
+        .commit()
+    )
+    assert not result.ok and result.changed == {}
+    assert str(result.errors[0]) == "name: cannot append to a str"
+    assert config.read_text() == before
+
+
+def test_unchanged_config_is_not_rewritten(tmp_path, monkeypatch):
+    config = tmp_path / "config.yaml"
+    write(config, {"name": "dev"})
+    monkeypatch.setattr(yaml_getter_setter, "atomic_dump", None)
+    assert ConfigTransaction(config).set("name", "dev").commit().ok
+
+
+def test_failed_write_leaves_the_old_file(tmp_path, monkeypatch):
+    config = tmp_path / "config.yaml"
+    write(config, {"name": "dev"})
+    before = config.read_text()
+
+    def broken_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(yaml_getter_setter.os, "fsync", broken_fsync)
+    result = ConfigTransaction(config).set("name", "prod").commit()
+    assert not result.ok
+    assert config.read_text() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+
+
+def test_invalid_yaml_is_reported(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("name: [unclosed")
+    result = ConfigTransaction(config).set("name", "dev").commit()
+    assert "invalid YAML" in str(result.errors[0])